@@ -2,17 +2,53 @@
 
 import sys
 import os
+import gc
+import csv
 import json
-import struct
+import mmap
+import wave
+import time
+import queue
+import random
+import signal
+import sqlite3
+import re
+import shutil
+import hashlib
+import weakref
+import argparse
+import threading
+import traceback
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import numpy as np
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QGridLayout, QPushButton, QFrame,
-                             QMenuBar, QAction, QFileDialog, QSizePolicy, QMenu, QMessageBox, QLabel)
-from PyQt5.QtCore import Qt, QUrl, QTimer
-from PyQt5.QtGui import QPainter, QColor, QIcon, QFont
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QAudioProbe, QAudioBuffer, QAudioFormat
+                             QMenuBar, QAction, QActionGroup, QFileDialog, QSizePolicy, QMenu, QMessageBox,
+                             QLabel, QSlider, QDialog, QFormLayout, QDoubleSpinBox, QComboBox,
+                             QDialogButtonBox, QDateEdit, QLineEdit, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QTabBar, QShortcut)
+from PyQt5.QtCore import (Qt, QTimer, QRect, QEvent, QObject, QThread, QIODevice, QByteArray,
+                          QCoreApplication, QEventLoop, QMetaObject, QDate, QDateTime, QLineF, QPointF,
+                          QFileSystemWatcher, pyqtSignal, pyqtSlot)
+from PyQt5.QtGui import QPainter, QColor, QIcon, QFont, QImage, QPixmap, QPolygonF, QKeySequence
+from PyQt5.QtMultimedia import (QAudio, QAudioBuffer, QAudioFormat, QAudioDecoder, QAudioOutput,
+                                QAudioDeviceInfo)
 
 # --- Custom VU Meter Bar Class ---
 class VUMeterBar(QWidget):
+    """Yayın tipi, bölümlü LED VU metre çubuğu.
+
+    Yanık ve sönük bölümler önceden iki pixmap'e çizilir (yalnızca boyut ya da
+    tema değişince yenilenir); her karede sadece değişen satırlar bu
+    pixmap'lerden kopyalanır.
+    """
+    SEGMENT_HEIGHT = 4
+    SEGMENT_GAP = 1
+    YELLOW_FROM = 0.6
+    RED_FROM = 0.85
+
     def __init__(self, bar_color=QColor("#00ff8d"), parent=None):
         super().__init__(parent)
         self._level = 0.0
@@ -22,51 +58,4135 @@ class VUMeterBar(QWidget):
         self._peak_hold_timer.timeout.connect(self._decay_peak_hold)
         
         self.bar_color = bar_color
+        self._lit = None
+        self._unlit = None
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
         self.setFixedSize(25, 480) 
-        self.setStyleSheet("background-color: black; border: none; border-radius: 3px;")
+
+    def set_bar_color(self, bar_color):
+        self.bar_color = bar_color
+        self._lit = None
+        self.update()
+
+    def _segment_count(self):
+        return max(1, self.height() // (self.SEGMENT_HEIGHT + self.SEGMENT_GAP))
+
+    def _level_y(self, level):
+        """Seviyenin yanık bölümlerinin başladığı y (bölüm sınırına oturtulmuş)"""
+        segments = int(round(level * self._segment_count()))
+        return self.height() - segments * (self.SEGMENT_HEIGHT + self.SEGMENT_GAP)
+
+    def _repaint_rows(self, y0, y1):
+        if y0 != y1:
+            top = min(y0, y1)
+            self.update(0, top, self.width(), abs(y1 - y0) + self.SEGMENT_HEIGHT)
 
     def set_level(self, level):
         level = max(0.0, min(1.0, level))
         if self._level != level:
+            old_y = self._level_y(self._level)
+            old_peak_y = self._level_y(self._peak_hold_level)
             self._level = level
-            self.update()
 
             if level > self._peak_hold_level:
                 self._peak_hold_level = level
                 self._peak_hold_timer.start(500)
             elif not self._peak_hold_timer.isActive():
                  self._peak_hold_level = level
-                 self.update()
                  self._peak_hold_timer.stop()
+
+            self._repaint_rows(old_y, self._level_y(level))
+            self._repaint_rows(old_peak_y, self._level_y(self._peak_hold_level))
                  
     def _decay_peak_hold(self):
+        old_peak_y = self._level_y(self._peak_hold_level)
         self._peak_hold_level = max(0.0, self._peak_hold_level * 0.8)
         if self._peak_hold_level > 0.01:
             self._peak_hold_timer.start(50)
         else:
-            self._peak_hold_level = 0.0
-        self.update()
+            self._peak_hold_level = 0.0
+        self._repaint_rows(old_peak_y, self._level_y(self._peak_hold_level))
+
+    def _build_pixmaps(self):
+        width, height = self.width(), self.height()
+        pitch = self.SEGMENT_HEIGHT + self.SEGMENT_GAP
+        green = QColor(self.bar_color)
+        yellow = QColor("#f0d000")
+        red = QColor("#ff3030")
+
+        self._lit = QPixmap(width, height)
+        self._unlit = QPixmap(width, height)
+        self._lit.fill(Qt.black)
+        self._unlit.fill(Qt.black)
+        lit_painter = QPainter(self._lit)
+        unlit_painter = QPainter(self._unlit)
+        segments = self._segment_count()
+        for i in range(segments):
+            fraction = (i + 1) / float(segments)
+            color = red if fraction > self.RED_FROM else yellow if fraction > self.YELLOW_FROM else green
+            y = height - (i + 1) * pitch
+            lit_painter.fillRect(0, y, width, self.SEGMENT_HEIGHT, color)
+            unlit_painter.fillRect(0, y, width, self.SEGMENT_HEIGHT, color.darker(400))
+        lit_painter.end()
+        unlit_painter.end()
+
+    def resizeEvent(self, event):
+        self._lit = None
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.PaletteChange, QEvent.StyleChange):
+            self._lit = None
+            self.update()
+        super().changeEvent(event)
+
+    def paintEvent(self, event):
+        if self._lit is None:
+            self._build_pixmaps()
+
+        painter = QPainter(self)
+        dirty = event.rect()
+        width, height = self.width(), self.height()
+        level_y = self._level_y(self._level)
+
+        # Seviyenin üstü sönük, altı yanık pixmap'ten kopyalanır
+        unlit_rect = dirty.intersected(QRect(0, 0, width, level_y))
+        if not unlit_rect.isEmpty():
+            painter.drawPixmap(unlit_rect, self._unlit, unlit_rect)
+        lit_rect = dirty.intersected(QRect(0, level_y, width, height - level_y))
+        if not lit_rect.isEmpty():
+            painter.drawPixmap(lit_rect, self._lit, lit_rect)
+
+        if self._peak_hold_level > 0.0:
+            peak_rect = dirty.intersected(QRect(0, self._level_y(self._peak_hold_level),
+                                                width, self.SEGMENT_HEIGHT))
+            if not peak_rect.isEmpty():
+                painter.drawPixmap(peak_rect, self._lit, peak_rect)
+
+
+class MultiChannelMeter(QWidget):
+    """Akıştaki her kanal için bir VUMeterBar gösteren kutu"""
+
+    def __init__(self, channels=2, parent=None):
+        super().__init__(parent)
+        self.setFixedSize(60, 480)
+        self.setObjectName("vuMeter")
+        self.setAttribute(Qt.WA_StyledBackground)
+        self._layout = QHBoxLayout(self)
+        self._layout.setContentsMargins(5, 5, 5, 5)
+        self.bars = []
+        self.set_channel_count(channels)
+
+    def set_channel_count(self, channels):
+        channels = max(1, channels)
+        if channels == len(self.bars):
+            return
+        for bar in self.bars:
+            self._layout.removeWidget(bar)
+            bar.deleteLater()
+        # Çubuklar kutunun genişliğine sığacak şekilde daraltılır
+        spacing = 5 if channels <= 2 else 2
+        width = max(3, min(25, (50 - spacing * (channels - 1)) // channels))
+        self._layout.setSpacing(spacing)
+        self.bars = []
+        for _ in range(channels):
+            bar = VUMeterBar()
+            bar.setFixedWidth(width)
+            self._layout.addWidget(bar)
+            self.bars.append(bar)
+
+    def set_levels(self, levels):
+        if len(levels) != len(self.bars):
+            self.set_channel_count(len(levels))
+        for bar, level in zip(self.bars, levels):
+            bar.set_level(float(level))
+
+    def reset(self, channels=None):
+        if channels is not None:
+            self.set_channel_count(channels)
+        for bar in self.bars:
+            bar.set_level(0.0)
+
+
+class GainReductionMeter(QWidget):
+    """Ana bus sınırlayıcısının kazanç azaltmasını yukarıdan aşağı dolan çubukla gösterir"""
+    RANGE_DB = 12.0
+    RELEASE_DB = 0.75
+    COLOR = QColor("#ff8c00")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFixedSize(16, 480)
+        self.setObjectName("gainReductionMeter")
+        self.setAttribute(Qt.WA_StyledBackground)
+        self._reduction = 0.0
+
+    def set_reduction(self, reduction_db):
+        # Azalma anında, bırakma ise her güncellemede RELEASE_DB ile gösterilir
+        reduction_db = max(0.0, reduction_db, self._reduction - self.RELEASE_DB)
+        if self._bar_height(reduction_db) != self._bar_height(self._reduction):
+            self.update()
+        self._reduction = reduction_db
+
+    def reset(self):
+        if self._reduction:
+            self._reduction = 0.0
+            self.update()
+
+    def _bar_height(self, reduction_db):
+        return int((self.height() - 10) * min(1.0, reduction_db / self.RANGE_DB))
+
+    def paintEvent(self, event):
+        height = self._bar_height(self._reduction)
+        if height:
+            painter = QPainter(self)
+            painter.fillRect(5, 5, self.width() - 10, height, self.COLOR)
+# --- VU Meter Sınıfı Sonu ---
+
+# --- Çalan buton göstergesi ---
+# Tüm çalan butonlar tek bir zamanlayıcıyla güncellenir; son saniyelerde uyarı yanıp söner
+CART_PROGRESS_INTERVAL_MS = 40
+CART_WARNING_SECONDS = 5
+CART_FLASH_HZ = 2
+
+
+def format_clock(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class CartProgressOverlay(QWidget):
+    """Butonun üstünde geçen/kalan süreyi ve ilerleme dolgusunu çizen saydam katman.
+
+    `set_progress` yalnızca görünen bir şey (saniye, dolgu pikseli, uyarı) değişince
+    yeniden çizim ister; böylece her tıkta sadece değişen butonlar boyanır.
+    """
+    FILL = QColor(0, 0, 0, 55)
+    WARNING = QColor(255, 0, 0, 120)
+    TEXT = QColor("#000000")
+
+    def __init__(self, button):
+        super().__init__(button)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setGeometry(button.rect())
+        self._state = None
+        self.hide()
+
+    def set_progress(self, elapsed, remaining, fraction, warning):
+        """Süreler saniye; döngüde `remaining` None olur ve geri sayım gösterilmez"""
+        state = (int(elapsed), None if remaining is None else int(np.ceil(remaining)),
+                 int(self.width() * fraction), warning)
+        if state != self._state:
+            self._state = state
+            self.show()
+            self.update()
+
+    def clear(self):
+        if self._state is not None:
+            self._state = None
+            self.hide()
+
+    def paintEvent(self, event):
+        if self._state is None:
+            return
+        elapsed, remaining, fill, warning = self._state
+        painter = QPainter(self)
+        painter.fillRect(0, 0, fill, self.height(), self.WARNING if warning else self.FILL)
+        font = painter.font()
+        font.setPointSize(7)
+        painter.setFont(font)
+        painter.setPen(self.TEXT)
+        text_rect = self.rect().adjusted(4, 0, -4, -2)
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignBottom, format_clock(elapsed))
+        if remaining is not None:
+            painter.drawText(text_rect, Qt.AlignRight | Qt.AlignBottom, "-" + format_clock(remaining))
+# --- Çalan Buton Göstergesi Sonu ---
+
+# --- Spektrum Analizörü ---
+class SpectrumAnalyzer:
+    """Örtüşen, pencerelenmiş bloklardan log-frekans bantlarında spektrum hesaplar.
+
+    Ses tarafı yalnızca `push` ile halka tampona kopyalar; FFT, ekran hızında
+    çağrılan `compute` içinde yapılır. Tüm ara diziler bir kez ayrılır.
+    """
+
+    def __init__(self, sample_rate, fft_size=2048, overlap=0.5, bands=96, history=256, max_frames=8):
+        self.sample_rate = sample_rate
+        self.fft_size = fft_size
+        self.hop = max(1, int(fft_size * (1.0 - overlap)))
+        self.max_frames = max_frames
+        self._ring = np.zeros(fft_size * (max_frames + 2), dtype=np.float32)
+        self._write = 0
+        self._new = 0
+        self._window = np.hanning(fft_size).astype(np.float32)
+        self._offsets = np.arange(fft_size)
+        self._steps = np.arange(max_frames)[::-1] * self.hop
+        self._index = np.empty((max_frames, fft_size), dtype=np.intp)
+        self._frames = np.empty((max_frames, fft_size), dtype=np.float32)
+        self._norm = 4.0 / fft_size
+
+        # FFT kutularını 20 Hz - Nyquist arası logaritmik bantlara grupla
+        bins = fft_size // 2 + 1
+        edges = np.geomspace(20.0, sample_rate / 2.0, bands + 1) * fft_size / sample_rate
+        self._band_starts = np.unique(np.clip(edges[:-1].astype(np.intp), 1, bins - 1))
+        self.bands = len(self._band_starts)
+        self.spectrum_db = np.full(self.bands, -120.0, dtype=np.float32)
+        self._frame_db = np.empty(self.bands, dtype=np.float32)
+        self.spectrogram = np.zeros((self.bands, history), dtype=np.uint8)
+        self.column = 0
+
+    def push(self, mono):
+        """Yeni örnekleri halka tampona kopyala"""
+        n = len(mono)
+        size = len(self._ring)
+        if n >= size:
+            mono = mono[-size:]
+            n = size
+        first = min(n, size - self._write)
+        self._ring[self._write:self._write + first] = mono[:first]
+        self._ring[:n - first] = mono[first:]
+        self._write = (self._write + n) % size
+        self._new += n
+
+    def compute(self, decay_db=3.0):
+        """Son bloklardan spektrumu güncelle; yeni veri yoksa False döner"""
+        frames = min(self.max_frames, self._new // self.hop)
+        if frames <= 0:
+            return False
+        self._new = 0
+        index = self._index[:frames]
+        np.add((self._write - self.fft_size - self._steps[-frames:])[:, None], self._offsets, out=index)
+        np.remainder(index, len(self._ring), out=index)
+        block = self._frames[:frames]
+        np.take(self._ring, index, out=block)
+        block *= self._window
+
+        magnitude = np.abs(np.fft.rfft(block, axis=1)).max(axis=0)
+        np.maximum.reduceat(magnitude, self._band_starts, out=self._frame_db)
+        self._frame_db *= self._norm
+        np.maximum(self._frame_db, 1e-6, out=self._frame_db)
+        np.log10(self._frame_db, out=self._frame_db)
+        self._frame_db *= 20.0
+        np.maximum(self._frame_db, self.spectrum_db - decay_db, out=self.spectrum_db)
+
+        # Spektrogramın bir sonraki sütununa yaz (alçak frekanslar altta)
+        self.column = (self.column + 1) % self.spectrogram.shape[1]
+        level = np.clip((self._frame_db + 100.0) * 2.55, 0, 255)
+        self.spectrogram[::-1, self.column] = level
+        return True
+
+
+class SpectrumWindow(QWidget):
+    """İsteğe bağlı spektrum/spektrogram penceresi; tıklayınca görünüm değişir"""
+    closed = pyqtSignal()
+
+    def __init__(self, sample_rate, fps=30, parent=None):
+        super().__init__(parent, Qt.Window)
+        self.analyzer = SpectrumAnalyzer(sample_rate)
+        self.show_spectrogram = False
+        self.resize(480, 240)
+
+        self._bar_color = QColor("#5fa686")
+        self._image = QImage(self.analyzer.spectrogram.data, self.analyzer.spectrogram.shape[1],
+                             self.analyzer.bands, self.analyzer.spectrogram.strides[0],
+                             QImage.Format_Indexed8)
+        self._image.setColorTable([QColor(0, int(v * 0.65), v).rgb() if v < 128 else
+                                   QColor(v, 255 - v // 2, 64).rgb() for v in range(256)])
+
+        # Çizim hızı ses geri çağrılarından bağımsız olarak sınırlanır
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, 1000 // fps))
+        self._timer.timeout.connect(self._refresh)
+
+    def push(self, mono):
+        if self.isVisible():
+            self.analyzer.push(mono)
+
+    def showEvent(self, event):
+        self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def closeEvent(self, event):
+        self.closed.emit()
+        super().closeEvent(event)
+
+    def mousePressEvent(self, event):
+        self.show_spectrogram = not self.show_spectrogram
+        self.update()
+
+    def _refresh(self):
+        if self.analyzer.compute():
+            self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        rect = self.rect()
+        painter.fillRect(rect, Qt.black)
+        analyzer = self.analyzer
+
+        if self.show_spectrogram:
+            # Halka tamponu en eski sütundan başlayarak iki parçada çiz
+            history = analyzer.spectrogram.shape[1]
+            split = analyzer.column + 1
+            older = history - split
+            left_width = rect.width() * older // history
+            painter.drawImage(QRect(0, 0, left_width, rect.height()), self._image,
+                              QRect(split, 0, older, analyzer.bands))
+            painter.drawImage(QRect(left_width, 0, rect.width() - left_width, rect.height()), self._image,
+                              QRect(0, 0, split, analyzer.bands))
+        else:
+            heights = np.clip((analyzer.spectrum_db + 100.0) / 100.0, 0.0, 1.0) * rect.height()
+            bar_width = rect.width() / float(analyzer.bands)
+            for i, h in enumerate(heights.astype(int)):
+                painter.fillRect(int(i * bar_width), rect.height() - h,
+                                 max(1, int(bar_width) - 1), h, self._bar_color)
+# --- Spektrum Analizörü Sonu ---
+
+# --- Ses motoru: içe aktarma önbelleği, karıştırıcı ve çıkış ---
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'jinglebox')
+PCM_CACHE_DIR = os.path.join(CACHE_DIR, 'pcm')
+CONFIG_DIR = os.path.join(os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config'), 'jinglebox')
+SETTINGS_PATH = os.path.join(CONFIG_DIR, 'settings.json')
+DATA_DIR = os.path.join(os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share'), 'jinglebox')
+SESSION_PALETTE_PATH = os.path.join(DATA_DIR, 'session.json')
+# Eski sürümlerin tek palet kaydı; yalnızca açık palet listesi yoksa okunur
+LAST_PALETTE_PATH = os.path.join(DATA_DIR, 'last_palette')
+OPEN_PALETTES_PATH = os.path.join(DATA_DIR, 'open_palettes.json')
+DEFAULT_GAIN = 0.25
+# Tetiklemede ilk okunacak kısım; ilk çalış diskten sayfa beklemesin diye önceden belleğe alınır
+PREFETCH_SECONDS = 1.0
+# Ses aygıtı hatayla durursa yeniden açmadan önce beklenecek süre
+AUDIO_REOPEN_MS = 1000
+OUTPUT_BUFFER_FRAMES = 2048
+
+# Kullanıcı ayarları settings.json dosyasından bu değerlerin üzerine yazılır
+DEFAULT_SETTINGS = {
+    "silence_threshold_db": -60.0,
+    "autosave_interval_ms": 30000,
+    "prefetch_interval_ms": 300000,
+    "stall_threshold_ms": 150,
+    "soak_rate": 5.0,
+    "soak_hours": 8.0,
+    "journal_compact_entries": 50,
+    "show_clock": "internal",
+    "mtc_source": "/dev/snd/midiC1D0",
+    "spectrum_fps": 30,
+    "theme": "default",
+    "search_roots": ["~/Music"],
+    "relink_index_max_age": 3600,
+    "watch_poll_interval_ms": 2000,
+    "buses": {"Main": 0.0, "FX": 0.0, "Beds": 0.0},
+    "aircheck": False,
+    "aircheck_dir": None,
+    "aircheck_format": "wav",
+    "aircheck_rotate_minutes": 60,
+    "limiter": True,
+    "limiter_ceiling_db": -1.0,
+    "cue_device": None,
+    "max_voices": 16,
+    "voice_stealing": "oldest",
+}
+
+
+def load_settings():
+    settings = dict(DEFAULT_SETTINGS)
+    try:
+        with open(SETTINGS_PATH, 'r') as f:
+            settings.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+    return settings
+
+
+def save_setting(key, value):
+    """Tek bir ayarı settings.json'a yaz; kullanıcının diğer ayarlarına dokunmaz"""
+    try:
+        with open(SETTINGS_PATH, 'r') as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        stored = {}
+    stored[key] = value
+    os.makedirs(CONFIG_DIR, exist_ok=True)
+    write_file_atomic(SETTINGS_PATH, json.dumps(stored, indent=4))
+
+
+def audio_format_spec(fmt):
+    """QAudioFormat'ı süreçler arasında taşınabilen (hız, kanal, tür, bit) demetine çevir"""
+    kind = {QAudioFormat.Float: 'f', QAudioFormat.UnSignedInt: 'u'}.get(fmt.sampleType(), 's')
+    return (fmt.sampleRate(), fmt.channelCount(), kind, fmt.sampleSize())
+
+
+def spec_key(spec):
+    return f"{spec[0]}Hz-{spec[1]}ch-{spec[2]}{spec[3]}"
+
+
+def spec_dtype(spec):
+    kind, bits = spec[2], spec[3]
+    if kind == 'f':
+        return np.dtype('<f4') if bits == 32 else np.dtype('<f8')
+    return np.dtype(f"<{'i' if kind == 's' else 'u'}{bits // 8}")
+
+
+def spec_scale(spec):
+    """Tamsayı örnekleri [-1, 1] aralığına getiren (ölçek, ofset) çifti"""
+    kind, bits = spec[2], spec[3]
+    if kind == 'f':
+        return 1.0, 0.0
+    if kind == 'u':
+        half = float(1 << (bits - 1))
+        return 1.0 / half, half
+    return 1.0 / float(1 << (bits - 1)), 0.0
+
+
+def pcm_to_float(raw, spec):
+    """Serpiştirilmiş ham PCM baytlarını (kare, kanal) biçiminde float32 diziye çevir"""
+    samples = np.frombuffer(raw, dtype=spec_dtype(spec))
+    samples = samples[:len(samples) - len(samples) % spec[1]]
+    scale, offset = spec_scale(spec)
+    out = samples.astype(np.float32)
+    if offset:
+        out -= offset
+    if scale != 1.0:
+        out *= scale
+    return out.reshape(-1, spec[1])
+
+
+def float_to_pcm(samples, spec):
+    """[-1, 1] aralığındaki float örnekleri hedef örnek biçimine çevir"""
+    dtype = spec_dtype(spec)
+    if spec[2] == 'f':
+        return samples.astype(dtype, copy=False)
+    scale, offset = spec_scale(spec)
+    limit = float(1 << (spec[3] - 1))
+    # float32, 2**31 - 1'i 2**31'e yuvarlar; tam ölçekli tepe negatife taşmasın diye
+    # 16 bitten geniş biçimler float64'te ölçeklenip kırpılır
+    work = np.float64 if spec[3] > 16 else np.float32
+    scaled = samples.astype(work) * (1.0 / scale)
+    np.clip(scaled, -limit, limit - 1, out=scaled)
+    if offset:
+        scaled += offset
+    return scaled.astype(dtype)
+
+
+# Yeniden örnekleme çekirdeği: kesimde her yanda sıfır geçişi sayısı, Kaiser
+# penceresi beta'sı, geçiş bandı payı ve en fazla faz sayısı
+RESAMPLE_ZERO_CROSSINGS = 32
+RESAMPLE_KAISER_BETA = 9.0
+RESAMPLE_ROLLOFF = 0.94
+RESAMPLE_MAX_PHASES = 1024
+RESAMPLE_BLOCK = 32768
+
+
+def resample_audio(samples, src_rate, dst_rate):
+    """Pencereli sinc çokfazlı süzgeçle (kare, kanal) diziyi yeniden örnekle.
+
+    Kesim frekansı iki hızın küçük Nyquist'inin biraz altındadır; böylece
+    aşağı örneklemede hedef Nyquist'in üstündeki içerik katlanmaz."""
+    g = int(np.gcd(int(src_rate), int(dst_rate)))
+    up, down = int(dst_rate) // g, int(src_rate) // g
+    frames = int(round(len(samples) * up / float(down)))
+    cutoff = RESAMPLE_ROLLOFF * min(1.0, up / float(down))
+    half = int(np.ceil(RESAMPLE_ZERO_CROSSINGS / cutoff))
+    # Olağan hız çiftlerinde fazlar kesindir; garip oranlarda fazlar nicemlenir
+    phases = min(up, RESAMPLE_MAX_PHASES)
+    t = (np.arange(-half + 1, half + 1)[None, :]
+         - np.arange(phases)[:, None] / float(phases))
+    window = np.i0(RESAMPLE_KAISER_BETA * np.sqrt(np.clip(1.0 - (t / half) ** 2, 0.0, None)))
+    kernel = np.sinc(cutoff * t) * window
+    # Her faz DC kazancını 1'de tutar
+    kernel = (kernel / kernel.sum(axis=1, keepdims=True)).astype(np.float32)
+    padded = np.concatenate([np.zeros((half, samples.shape[1]), dtype=np.float32),
+                             samples.astype(np.float32, copy=False),
+                             np.zeros((half + 1, samples.shape[1]), dtype=np.float32)])
+    position = np.arange(frames, dtype=np.int64) * down
+    base = position // up + 1
+    phase = (position % up) * phases // up
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * half, axis=0)
+    out = np.empty((frames, samples.shape[1]), dtype=np.float32)
+    # Bloklar halinde: her çıkış karesi kendi penceresiyle kendi fazının çarpımı
+    for start in range(0, frames, RESAMPLE_BLOCK):
+        end = min(start + RESAMPLE_BLOCK, frames)
+        taps = kernel[phase[start:end]][:, :, None]
+        out[start:end] = np.matmul(windows[base[start:end]], taps)[..., 0]
+    return out
+
+
+def conform_audio(samples, src_rate, spec):
+    """Kanal sayısını ve örnekleme hızını hedefe uydur (içe aktarmada bir kez çalışır)"""
+    channels = spec[1]
+    if samples.shape[1] != channels:
+        if samples.shape[1] == 1:
+            samples = np.repeat(samples, channels, axis=1)
+        elif channels == 1:
+            samples = samples.mean(axis=1, keepdims=True)
+        else:
+            mapped = np.zeros((len(samples), channels), dtype=np.float32)
+            common = min(channels, samples.shape[1])
+            mapped[:, :common] = samples[:, :common]
+            samples = mapped
+    if src_rate != spec[0] and len(samples):
+        samples = resample_audio(samples, src_rate, spec[0])
+    return np.ascontiguousarray(samples, dtype=np.float32)
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _decode_wav(source):
+    with wave.open(source, 'rb') as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        rate = wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+    if width == 3:
+        # 24 bit örnekleri 32 bit'e genişlet
+        b = np.frombuffer(raw, dtype=np.uint8)
+        b = b[:len(b) - len(b) % 3].reshape(-1, 3)
+        raw = ((b[:, 0].astype(np.int32) << 8) | (b[:, 1].astype(np.int32) << 16)
+               | (b[:, 2].astype(np.int32) << 24)).tobytes()
+        width = 4
+    src_spec = (rate, channels, 'u' if width == 1 else 's', width * 8)
+    return pcm_to_float(raw, src_spec), rate
+
+
+def _decode_with_qt(source, spec):
+    """Sıkıştırılmış dosyaları QAudioDecoder ile çöz (işçi süreçte çağrılır)"""
+    # QAudioDecoder olay döngüsü ister; işçi süreçte kurulan uygulama nesnesi döngü
+    # bitene kadar tutulur
+    app = QCoreApplication.instance() or QCoreApplication([])
+    target = QAudioFormat()
+    target.setCodec("audio/pcm")
+    target.setByteOrder(QAudioFormat.LittleEndian)
+    target.setSampleRate(spec[0])
+    target.setChannelCount(spec[1])
+    target.setSampleType(QAudioFormat.Float)
+    target.setSampleSize(32)
+
+    decoder = QAudioDecoder()
+    decoder.setAudioFormat(target)
+    decoder.setSourceFilename(source)
+    chunks = []
+    errors = []
+    loop = QEventLoop()
+
+    def on_buffer():
+        buf = decoder.read()
+        chunks.append((audio_format_spec(buf.format()), buf.constData().asstring(buf.byteCount())))
+
+    def on_error(*_):
+        errors.append(decoder.errorString())
+        loop.quit()
+
+    decoder.bufferReady.connect(on_buffer)
+    decoder.finished.connect(loop.quit)
+    decoder.error.connect(on_error)
+    decoder.start()
+    loop.exec_()
+    del app
+    if errors:
+        raise RuntimeError(errors[0])
+    if not chunks:
+        raise RuntimeError(f"no audio decoded from {source}")
+
+    # Arka uç istenen biçimi uygulamadıysa parçaları kendimiz dönüştür
+    src_rate = chunks[0][0][0]
+    parts = [conform_audio(pcm_to_float(data, chunk_spec), chunk_spec[0], (src_rate,) + spec[1:])
+             for chunk_spec, data in chunks]
+    return np.concatenate(parts), src_rate
+
+
+def detect_silence(samples, threshold_db):
+    """İlk duyulabilir kareyi ve son duyulabilir karenin bir sonrasını bul"""
+    if not len(samples):
+        return 0, 0
+    threshold = 10.0 ** (threshold_db / 20.0)
+    audible = np.flatnonzero(np.abs(samples).max(axis=1) > threshold)
+    if not len(audible):
+        return 0, len(samples)
+    return int(audible[0]), int(audible[-1]) + 1
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+# Tepe piramidi: taban seviyede blok başına 256 kare, her üst seviye 4 kat kaba
+PEAK_BASE_BLOCK = 256
+PEAK_FACTOR = 4
+PEAK_BUILD_CHUNK = PEAK_BASE_BLOCK * 4096
+
+
+def peaks_path(meta):
+    return os.path.splitext(meta["pcm"])[0] + ".peaks"
+
+
+def peak_levels(frames):
+    """Piramidin seviyeleri: (blok boyu, blok sayısı, dosyadaki ilk satır), inceden kabaya.
+
+    Düzen yalnızca kare sayısından çıktığı için yan dosyada başlık yoktur.
+    """
+    levels, offset, block = [], 0, PEAK_BASE_BLOCK
+    while True:
+        count = -(-frames // block)
+        levels.append((block, count, offset))
+        offset += count
+        if count <= 1:
+            return levels
+        block *= PEAK_FACTOR
+
+
+def build_peak_pyramid(samples, path, scale=1.0, offset=0):
+    """(kare, kanal) örneklerden min/maks piramidini float32 olarak `path`'e yaz.
+
+    `samples` bellek eşlemeli tamsayı PCM de olabilir; parça parça okunur.
+    """
+    frames = len(samples)
+    if frames == 0:
+        return
+    levels = peak_levels(frames)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    peaks = np.memmap(tmp_path, dtype=np.float32, mode='w+', shape=(levels[-1][2] + levels[-1][1], 2))
+    for first in range(0, frames, PEAK_BUILD_CHUNK):
+        chunk = samples[first:first + PEAK_BUILD_CHUNK].astype(np.float32)
+        if offset:
+            chunk -= offset
+        chunk *= scale
+        # Kanallar sütun sütun birleştirilir; axis=1 indirgemesi iki kanalda çok yavaş
+        low, high = chunk[:, 0].copy(), chunk[:, 0].copy()
+        for channel in range(1, chunk.shape[1]):
+            np.minimum(low, chunk[:, channel], out=low)
+            np.maximum(high, chunk[:, channel], out=high)
+        starts = np.arange(0, len(chunk), PEAK_BASE_BLOCK)
+        row = first // PEAK_BASE_BLOCK
+        peaks[row:row + len(starts), 0] = np.minimum.reduceat(low, starts)
+        peaks[row:row + len(starts), 1] = np.maximum.reduceat(high, starts)
+    for (_, _, below), (_, count, row) in zip(levels, levels[1:]):
+        finer = peaks[below:row]
+        starts = np.arange(0, len(finer), PEAK_FACTOR)
+        peaks[row:row + count, 0] = np.minimum.reduceat(finer[:, 0], starts)
+        peaks[row:row + count, 1] = np.maximum.reduceat(finer[:, 1], starts)
+    peaks.flush()
+    del peaks
+    os.replace(tmp_path, path)
+
+
+class PeakPyramid:
+    """Yan dosyadaki tepe piramidine bellek eşlemeli erişim"""
+
+    def __init__(self, path, frames):
+        self.levels = peak_levels(frames)
+        self.data = np.memmap(path, dtype=np.float32, mode='r').reshape(-1, 2)
+
+    def columns(self, start, frames_per_column, width):
+        """`start` karesinden başlayan `width` sütunun (min, maks) değerleri.
+
+        Sütun başına en az PEAK_BASE_BLOCK kare düşmelidir; her sütun en fazla
+        birkaç blok okur, bu yüzden süre yakınlaştırmadan bağımsızdır.
+        """
+        block, count, offset = self.levels[0]
+        for level in self.levels:
+            if level[0] > frames_per_column:
+                break
+            block, count, offset = level
+        edges = (start + np.arange(width + 1) * frames_per_column) // block
+        edges = np.clip(edges.astype(np.int64), 0, count)
+        first, last = edges[:-1], edges[1:]
+        visible = first < count
+        first, last = first[visible], last[visible]
+        if not len(first):
+            return np.zeros(0, np.float32), np.zeros(0, np.float32)
+        stop = max(int(last[-1]), int(first[-1]) + 1)
+        segment = self.data[offset + first[0]:offset + stop]
+        starts = first - first[0]
+        return (np.minimum.reduceat(segment[:, 0], starts),
+                np.maximum.reduceat(segment[:, 1], starts))
+
+
+def transcode_to_cache(source, cache_dir, spec, threshold_db=DEFAULT_SETTINGS["silence_threshold_db"]):
+    """Bir dosyayı cihazın yerel biçimine bir kez dönüştürüp içerik adresli önbelleğe yaz.
+
+    İşlem havuzunda çalışır; Qt nesnelerine değil, yalnızca dosyalara dokunur.
+    """
+    digest = hash_file(source)
+    base = os.path.join(cache_dir, f"{digest}.{spec_key(spec)}")
+    meta_path = base + ".json"
+    if os.path.exists(meta_path) and os.path.exists(base + ".pcm"):
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        if meta.get("silence", {}).get("threshold_db") != threshold_db:
+            # Eşik değişti: yalnızca sessizlik analizini önbellekteki PCM üzerinde yenile
+            clip = PCMClip(meta)
+            start, end = detect_silence(clip.data.astype(np.float32) * clip.scale
+                                        - clip.offset * clip.scale, threshold_db)
+            meta["silence"] = {"threshold_db": threshold_db, "start": start, "end": end}
+            _write_meta(meta_path, meta)
+        if not os.path.exists(peaks_path(meta)):
+            # Tepe dosyası olmadan önbelleğe girmiş kayıt
+            clip = PCMClip(meta)
+            build_peak_pyramid(clip.data, peaks_path(meta), clip.scale, clip.offset)
+        return meta
+
+    if source.lower().endswith('.wav'):
+        try:
+            samples, rate = _decode_wav(source)
+        except (wave.Error, EOFError):
+            samples, rate = _decode_with_qt(source, spec)
+    else:
+        samples, rate = _decode_with_qt(source, spec)
+    samples = conform_audio(samples, rate, spec)
+    start, end = detect_silence(samples, threshold_db)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{base}.pcm.{os.getpid()}.tmp"
+    float_to_pcm(samples, spec).tofile(tmp_path)
+    os.replace(tmp_path, base + ".pcm")
+    build_peak_pyramid(samples, base + ".peaks")
+
+    meta = {
+        "source": source,
+        "digest": digest,
+        "spec": list(spec),
+        "frames": len(samples),
+        "duration": len(samples) / float(spec[0]),
+        "pcm": base + ".pcm",
+        "silence": {"threshold_db": threshold_db, "start": start, "end": end},
+    }
+    _write_meta(meta_path, meta)
+    return meta
+
+
+def remove_cache_entry(meta_path):
+    """Önbellek kaydının analiz, PCM ve tepe dosyalarını sil.
+
+    POSIX'te bellek eşlemesi açık kalan PCM silinse de çalan ses okumayı sürdürür.
+    """
+    base = meta_path[:-len(".json")]
+    for suffix in (".json", ".pcm", ".peaks"):
+        try:
+            os.remove(base + suffix)
+        except OSError:
+            pass
+
+
+def write_file_atomic(path, text):
+    """Dosyayı geçici bir kopyaya yazıp yeniden adlandır; çökme yarım dosya bırakmaz"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# Palet kayıtlarında saklanan buton seçenekleri ve varsayılanları
+PALETTE_ENTRY_DEFAULTS = {
+    "skip_silence": True,
+    "loop": "off",
+    "gain_db": 0.0,
+    "pan": 0.0,
+    "bus": "Main",
+    "retrigger": "restart",
+    # Dalga biçimi düzenleyicide konan başlangıç/bitiş işaretleri (saniye)
+    "start": None,
+    "end": None,
+    # İçe aktarılan dosyanın boyutu ve içerik özeti; palet başka makinede ya da
+    # yeni bağlama noktasında açılınca dosyayı yeniden bulmak için
+    "size": None,
+    "digest": None,
+}
+
+# Bus faderlerinin aralığı (dB); en alt konum tamamen kısar
+BUS_FADER_MIN_DB = -60
+BUS_FADER_MAX_DB = 6
+
+# Döngü kipleri: kapalı, tüm dosya, sıfır geçişine oturtulmuş işaretler
+LOOP_MODES = ("off", "file", "markers")
+# Çalan butona yeniden basılınca: baştan başlat, durdur, üstüne yeni ses ekle ya da yok say.
+# "overlap" dışındaki kipler basılınca önceki sesleri keser; üst üste çalanlara dokunmaz
+RETRIGGER_MODES = ("restart", "toggle", "overlap", "ignore")
+# Döngü işaretleri için sıfır geçişi aranacak pencere (ms)
+LOOP_SEARCH_MS = 20
+
+
+def parse_palette_entry(entry):
+    """Palet kaydını (düz yol ya da sözlük) varsayılanlarla tamamlanmış sözlüğe çevir"""
+    if isinstance(entry, str):
+        entry = {"file_path": entry}
+    options = dict(PALETTE_ENTRY_DEFAULTS)
+    options.update((key, entry[key]) for key in PALETTE_ENTRY_DEFAULTS if key in entry)
+    options["file_path"] = entry["file_path"]
+    return options
+
+
+def format_palette_entry(options):
+    """Buton seçeneklerini palet kaydına çevir.
+
+    Varsayılan ayarlı butonlar eski sürümlerle uyumlu olsun diye düz yol olarak yazılır.
+    """
+    changed = {key: options[key] for key, default in PALETTE_ENTRY_DEFAULTS.items()
+               if options.get(key, default) != default}
+    if not changed:
+        return options["file_path"]
+    return dict(file_path=options["file_path"], **changed)
+
+
+class PaletteJournal:
+    """Palet değişikliklerini önce günlüğe yazar, arka planda palet dosyasına sıkıştırır.
+
+    Günlük, paletin yanında "<palet>.journal" adıyla tutulur. Her satır bir
+    buton konumunu ve yeni palet kaydını (silindiyse null) içerir. Sıkıştırma
+    sırasında günlük "<palet>.journal.old" adına çevrilir ve palet başarıyla
+    yazılınca silinir; böylece hangi anda çökülürse çökülsün palet ve
+    günlükler birlikte son durumu verir.
+    """
+
+    def __init__(self, palette_path):
+        self.palette_path = palette_path
+        self.journal_path = palette_path + ".journal"
+        self.pending = 0
+        self._file = None
+        self._compactor = None
+
+    def load(self):
+        """Palet dosyasını okuyup üzerine bekleyen günlükleri uygula"""
+        data = {}
+        if os.path.exists(self.palette_path):
+            with open(self.palette_path, 'r') as f:
+                data = json.load(f)
+        for path in (self.journal_path + ".old", self.journal_path):
+            try:
+                with open(path, 'r') as f:
+                    lines = f.readlines()
+            except OSError:
+                continue
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Çökme anında yarım kalmış son satır
+                    continue
+                if record.get("entry") is None:
+                    data.pop(record["pos"], None)
+                else:
+                    data[record["pos"]] = record["entry"]
+                self.pending += 1
+        return data
+
+    def record(self, pos_str, entry):
+        self.record_many([(pos_str, entry)])
+
+    def record_many(self, records):
+        """(konum, kayıt) çiftlerini tek yazma ve tek fsync ile günlüğe ekle"""
+        if not records:
+            return
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.journal_path) or '.', exist_ok=True)
+            self._file = open(self.journal_path, 'a')
+        self._file.write("".join(json.dumps({"pos": pos_str, "entry": entry}) + "\n"
+                                 for pos_str, entry in records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.pending += len(records)
+
+    def compact(self, palette_data):
+        """Verilen anlık görüntüyü arka planda palet dosyasına yaz ve günlüğü boşalt"""
+        self.wait()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        old_path = self.journal_path + ".old"
+        if os.path.exists(self.journal_path):
+            if os.path.exists(old_path):
+                # Önceki sıkıştırma yarım kaldı; kayıtları eski günlüğün sonuna ekle
+                with open(old_path, 'a') as dst, open(self.journal_path, 'r') as src:
+                    dst.write(src.read())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, old_path)
+        self.pending = 0
+        text = json.dumps(palette_data, indent=4)
+        self._compactor = threading.Thread(target=self._write, args=(text, old_path), daemon=True)
+        self._compactor.start()
+
+    def _write(self, text, old_path):
+        try:
+            os.makedirs(os.path.dirname(self.palette_path) or '.', exist_ok=True)
+            write_file_atomic(self.palette_path, text)
+            if os.path.exists(old_path):
+                os.remove(old_path)
+        except OSError as e:
+            print(f"{self.palette_path}: {e}")
+
+    def wait(self):
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def close(self, palette_data):
+        if self.pending or not os.path.exists(self.palette_path):
+            self.compact(palette_data)
+        self.wait()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class OpenPalette:
+    """Açık bir palet: değişiklik günlüğü ve butonlarının durumu.
+
+    Butonlar bütün paletlerce paylaşılır; palet değişince yalnızca gösterilen durum değişir.
+    """
+
+    def __init__(self, journal, states):
+        self.journal = journal
+        self.states = states
+
+    @property
+    def file_path(self):
+        return self.journal.palette_path
+
+    @property
+    def title(self):
+        return os.path.splitext(os.path.basename(self.file_path))[0]
+
+
+class PCMClip:
+    """Önbellekteki, cihaz biçimindeki PCM verisine bellek eşlemeli erişim"""
+    __slots__ = ('meta', 'spec', 'data', 'frames', 'scale', 'offset', '__weakref__')
+
+    def __init__(self, meta):
+        self.meta = meta
+        self.spec = tuple(meta["spec"])
+        raw = np.memmap(meta["pcm"], dtype=spec_dtype(self.spec), mode='r')
+        self.data = raw[:len(raw) - len(raw) % self.spec[1]].reshape(-1, self.spec[1])
+        self.frames = len(self.data)
+        self.scale, self.offset = spec_scale(self.spec)
+
+    @property
+    def duration(self):
+        return self.frames / float(self.spec[0])
+
+    def audible_range(self):
+        """Baştaki ve sondaki sessizlik atlanınca çalınacak (başlangıç, bitiş) kareleri"""
+        silence = self.meta.get("silence")
+        if not silence or silence["end"] <= silence["start"]:
+            return 0, self.frames
+        return silence["start"], min(silence["end"], self.frames)
+
+    def prefetch(self):
+        """Dosyanın başından duyulur başlangıcın bir saniye sonrasına kadar her sayfaya dokun"""
+        end = self.audible_range()[0] + int(self.spec[0] * PREFETCH_SECONDS)
+        step = max(1, mmap.PAGESIZE // self.data.strides[0])
+        # Sayfa başına bir kare okumak yeter; sonuç kullanılmaz
+        self.data[:end:step].sum()
+
+    def zero_crossing(self, frame, window):
+        """`frame`'e en yakın, negatiften pozitife geçilen kare; bulunamazsa `frame`"""
+        lo = max(frame - window, 0)
+        hi = min(frame + window, self.frames - 1)
+        if hi <= lo:
+            return frame
+        mono = self.data[lo:hi + 1].astype(np.float32).sum(axis=1)
+        if self.offset:
+            mono -= self.offset * self.spec[1]
+        rising = np.flatnonzero((mono[:-1] < 0) & (mono[1:] >= 0)) + lo + 1
+        if not len(rising):
+            return frame
+        return int(rising[np.argmin(np.abs(rising - frame))])
+
+    def loop_points(self, start, end):
+        """Döngü başını ve sonunu aynı yönlü sıfır geçişlerine oturt; ekleme yeri tıklamaz"""
+        window = self.spec[0] * LOOP_SEARCH_MS // 1000
+        loop_start = self.zero_crossing(start, window)
+        loop_end = self.zero_crossing(end, window)
+        if loop_end <= loop_start:
+            return start, end
+        return loop_start, loop_end
+
+
+class ClipCache:
+    """İçerik adresli PCM önbelleğinin bellekteki yüzü: her içerik için tek bir PCMClip.
+
+    Anahtar, içerik özetinden türeyen PCM yoludur; aynı dosyayı ya da aynı içeriği
+    kullanan bütün paletler aynı bellek eşlemesini paylaşır. Hiçbir buton ya da
+    çalan ses tutmayan klipler kendiliğinden bırakılır.
+    """
+
+    def __init__(self):
+        self._clips = weakref.WeakValueDictionary()
+
+    def get(self, meta):
+        clip = self._clips.get(meta["pcm"])
+        if clip is None or clip.meta.get("silence") != meta.get("silence"):
+            clip = PCMClip(meta)
+            clip.prefetch()
+            self._clips[meta["pcm"]] = clip
+        return clip
+
+    def clips(self):
+        return list(self._clips.values())
+
+    def __len__(self):
+        return len(self._clips)
+
+
+def entry_play_range(clip, options):
+    """Buton seçeneklerine göre çalınacak (başlangıç, bitiş) kare aralığı"""
+    if options["loop"] == "file":
+        return 0, clip.frames
+    start, end = clip.audible_range() if options["skip_silence"] else (0, clip.frames)
+    rate = clip.spec[0]
+    if options["start"] is not None:
+        start = min(int(options["start"] * rate), clip.frames)
+    if options["end"] is not None:
+        end = min(int(options["end"] * rate), clip.frames)
+    if end <= start:
+        end = clip.frames
+    if options["loop"] == "markers":
+        return clip.loop_points(start, end)
+    return start, end
+
+
+def entry_loop_range(clip, options):
+    """entry_play_range'e döngü başını ekler: (başlangıç, bitiş, döngü başı ya da None)"""
+    start, end = entry_play_range(clip, options)
+    return start, end, (start if options["loop"] != "off" else None)
+
+
+def cue_gain(cue, options):
+    """İşaret listesindeki bir sesin doğrusal kazancı; canlı gösteri ve mixdown aynısını kullanır"""
+    return DEFAULT_GAIN * 10.0 ** ((cue["gain_db"] + options["gain_db"]) / 20.0)
+
+
+def trigger_entry(engine, tag, clip, options, layered, playing=None):
+    """Bir butona basışı, palet kaydının yeniden tetikleme kipine göre karıştırıcıda uygula.
+
+    `layered`, "overlap" kipinde başlatılıp diğer basışlarda kesilmeyen etiketlerdir
+    ve yerinde güncellenir. `playing` verilmezse karıştırıcıya sorulur. Yapılan iş
+    ("ignored", "stopped", "released" ya da "started") ve kesilen seslerin
+    etiketleri döner.
+    """
+    mode = options["retrigger"]
+    if playing is None:
+        playing = engine.is_playing(tag)
+    if playing and mode == "ignore":
+        return "ignored", []
+    if playing and mode == "toggle":
+        layered.discard(tag)
+        return "stopped", engine.stop(tag)
+    if playing and mode == "restart" and options["loop"] != "off":
+        # Çalan döngüye tekrar basılınca kesmeden, turun sonunda bitir
+        engine.release(tag)
+        return "released", []
+    start, end, loop_start = entry_loop_range(clip, options)
+    if mode == "overlap":
+        # Çalanlar kesilmez; ses sınırı aşılırsa karıştırıcı yer açar
+        layered.add(tag)
+        stopped = []
+    else:
+        # Tek oynatıcı gibi önceki tek seferlik seslerin yerine geçer; başka butonlardaki
+        # döngüler (yataklar) yalnızca kendi butonlarıyla durur
+        layered.discard(tag)
+        stopped = engine.stop(keep=layered, keep_beds=True)
+    engine.play(clip, DEFAULT_GAIN * 10.0 ** (options["gain_db"] / 20.0), tag=tag,
+                start=start, end=end, loop_start=loop_start, pan=options["pan"], bus=options["bus"])
+    return "started", stopped
+
+
+class ImportPipeline(QObject):
+    """Atanan dosyaları işlem havuzunda cihaz biçimine dönüştürür"""
+    clipReady = pyqtSignal(str, object)
+    clipFailed = pyqtSignal(str, str)
+    # Havuzun yardımcı iş parçacığından ana iş parçacığına
+    _finished = pyqtSignal(str, object, object)
+
+    def __init__(self, spec, cache_dir=PCM_CACHE_DIR,
+                 threshold_db=DEFAULT_SETTINGS["silence_threshold_db"], parent=None):
+        super().__init__(parent)
+        self.spec = spec
+        self.cache_dir = cache_dir
+        self.threshold_db = threshold_db
+        self._executor = None
+        self._pending = {}
+        self._stale = {}
+        self._restart = set()
+        self._finished.connect(self._on_finished)
+        self._index_path = os.path.join(cache_dir, f"index.{spec_key(spec)}.json")
+        self._index = {}
+        try:
+            with open(self._index_path, 'r') as f:
+                self._index = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def _pool(self):
+        if self._executor is None:
+            # Qt'li bir süreci çatallamak güvenli değil, bu yüzden "spawn"
+            self._executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def submit(self, file_path):
+        if file_path in self._pending:
+            return
+        meta = self._cached_meta(file_path)
+        if meta is not None:
+            self.clipReady.emit(file_path, meta)
+            return
+        try:
+            # Dönüştürme sürerken dosya değişirse eski boyut/zaman kaydedilsin
+            st = os.stat(file_path)
+            stat = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            stat = None
+        future = self._pool().submit(transcode_to_cache, file_path, self.cache_dir, self.spec,
+                                     self.threshold_db)
+        self._pending[file_path] = future
+        future.add_done_callback(lambda fut, path=file_path: self._finished.emit(path, fut, stat))
+
+    def invalidate(self, file_path):
+        """Kaynağı değişen dosyanın önbellek kaydını düşürüp yeniden içe aktar.
+
+        Eski PCM, tepe ve analiz dosyaları yeni sonuç gelince silinir; o ana kadar
+        buton eski klibi çalmaya devam eder.
+        """
+        entry = self._index.pop(file_path, None)
+        if entry and file_path not in self._stale:
+            self._stale[file_path] = entry["meta"]
+        if file_path in self._pending:
+            # Süren dönüştürme eski içeriği okumuş olabilir; bitince yeniden başlatılır
+            self._restart.add(file_path)
+            return
+        self.submit(file_path)
+
+    def _cached_meta(self, file_path):
+        """Dosya değişmediyse içeriği yeniden özetlemeden önbellekteki kaydı döndür"""
+        entry = self._index.get(file_path)
+        if not entry:
+            return None
+        try:
+            st = os.stat(file_path)
+            if [st.st_size, st.st_mtime_ns] != entry["stat"]:
+                return None
+            with open(entry["meta"], 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError, KeyError):
+            return None
+        if meta.get("silence", {}).get("threshold_db") != self.threshold_db:
+            return None
+        return meta if os.path.exists(meta["pcm"]) else None
+
+    def known_source(self, file_path):
+        """Daha önce içe aktarılmış bir dosyanın (boyut, içerik özeti) bilgisi"""
+        entry = self._index.get(file_path)
+        if not entry:
+            return None, None
+        try:
+            with open(entry["meta"], 'r') as f:
+                digest = json.load(f)["digest"]
+        except (OSError, ValueError, KeyError):
+            digest = None
+        return entry["stat"][0], digest
+
+    def _on_finished(self, file_path, future, stat):
+        self._pending.pop(file_path, None)
+        if file_path in self._restart:
+            self._restart.discard(file_path)
+            self.submit(file_path)
+            return
+        try:
+            meta = future.result()
+        except Exception as e:
+            self.clipFailed.emit(file_path, str(e))
+            return
+        meta_path = meta["pcm"][:-len(".pcm")] + ".json"
+        stale = self._stale.pop(file_path, None)
+        try:
+            if stat is not None:
+                self._index[file_path] = {"stat": stat, "meta": meta_path}
+            tmp_path = self._index_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, self._index_path)
+        except OSError:
+            pass
+        # Aynı içerik başka bir yoldan da kullanılıyorsa kayıt silinmez
+        if stale and stale != meta_path and all(entry["meta"] != stale
+                                                for entry in self._index.values()):
+            remove_cache_entry(stale)
+        self.clipReady.emit(file_path, meta)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def pan_gains(pan, channels):
+    """Pan değerini (-1 sol, +1 sağ) kanal kazançlarına çevir; ortada iki kanal da tam seviyede"""
+    gains = np.ones(channels, dtype=np.float32)
+    if channels >= 2 and pan:
+        angle = (min(max(pan, -1.0), 1.0) + 1.0) * np.pi / 4
+        gains[0] = min(1.0, np.sqrt(2.0) * np.cos(angle))
+        gains[1] = min(1.0, np.sqrt(2.0) * np.sin(angle))
+    return gains
+
+
+def bus_fader_gain(level_db):
+    """Fader seviyesini (dB) doğrusal kazanca çevir; en alt konum sessizdir"""
+    if level_db <= BUS_FADER_MIN_DB:
+        return 0.0
+    return 10.0 ** (level_db / 20.0)
+
+
+class Voice:
+    """Karıştırıcıda çalan tek bir ses.
+
+    `delay`, sesin bir sonraki çıkış bloğunun kaçıncı karesinde başlayacağını
+    belirtir; böylece başlangıçlar blok sınırına değil, örneğe denk getirilir.
+    `at_frame` verilirse gecikme, çıkış akışındaki mutlak kare numarasından
+    hesaplanır ve ses ilk duyulduğunda `on_start(gerçek_kare)` çağrılır.
+    `loop_start` verilirse ses `end`'e gelince aynı blok içinde bu kareye sarılır;
+    None yapılınca o anki tur bitince ses susar. `length` verilirse ses, döngüde
+    olsa bile toplam o kadar kare çaldıktan sonra (fade_out ile) biter.
+    Kazanç ve pan çalmaya başlarken kanal başına tek bir vektöre indirgenir;
+    bus faderi ise her blokta okunur.
+    """
+    __slots__ = ('clip', 'pos', 'end', 'gain', 'tag', 'delay', 'first', 'fade_in', 'fade_out',
+                 'at_frame', 'on_start', 'loop_start', 'bus', 'bus_level', 'gains', 'queued', 'stolen',
+                 'left', 'wrapped', 'bed')
+
+    def __init__(self, clip, gain=1.0, tag=None, start=0, end=None, delay=0, fade_in=0, fade_out=0,
+                 at_frame=None, on_start=None, loop_start=None, pan=0.0, bus=None, length=None):
+        self.clip = clip
+        self.pos = start
+        self.first = start
+        self.end = clip.frames if end is None else min(end, clip.frames)
+        self.gain = gain
+        self.gains = clip.scale * gain * pan_gains(pan, clip.spec[1])
+        self.bus = bus
+        self.bus_level = 1.0
+        self.queued = None
+        self.tag = tag
+        self.delay = delay
+        self.fade_in = fade_in
+        self.fade_out = fade_out
+        self.at_frame = at_frame
+        self.on_start = on_start
+        self.loop_start = loop_start if loop_start is not None and loop_start < self.end else None
+        # Döngü olarak başlatılan ses; bırakılıp son turunu çalarken de yatak sayılır
+        self.bed = self.loop_start is not None
+        self.stolen = False
+        self.left = length
+        # Son sarmada dönülen kare; konum göstergesi önceki turu buradan hesaplar
+        self.wrapped = None
+
+    def frames_left(self):
+        """Sesin bitmesine kalan kare; sınırsız döngüde None"""
+        to_go = self.end - self.pos if self.loop_start is None else None
+        if self.left is not None and (to_go is None or self.left < to_go):
+            to_go = self.left
+        return to_go
+
+    def envelope(self, n):
+        """Sonraki `n` kare için fade kazancı; fade yoksa None"""
+        env = None
+        if self.fade_in and self.pos - self.first < self.fade_in:
+            env = np.arange(self.pos - self.first, self.pos - self.first + n, dtype=np.float32)
+            env *= 1.0 / self.fade_in
+            np.minimum(env, 1.0, out=env)
+        to_go = self.frames_left() if self.fade_out else None
+        if to_go is not None and to_go - n < self.fade_out:
+            tail = np.arange(to_go, to_go - n, -1, dtype=np.float32)
+            tail *= 1.0 / self.fade_out
+            np.minimum(tail, 1.0, out=tail)
+            env = tail if env is None else env * tail
+        return env
+
+
+# Ana bus sınırlayıcısı: ileriye bakış süresi ve dB cinsinden doğrusal bırakma hızı
+LIMITER_LOOKAHEAD_MS = 1.5
+LIMITER_RELEASE_DB_PER_S = 40.0
+LIMITER_CEILINGS_DB = (-0.1, -0.5, -1.0, -2.0, -3.0)
+# Gerçek tepe kestirimi: 8x aşırı örnekleme, fazı başına 16 katsayı. BS.1770'in 4x/12
+# katsayılı filtresi 20 kHz civarında 1 dB'den fazla eksik okur; bu ayar 0.1 dB'nin altında
+TRUE_PEAK_OVERSAMPLE = 8
+TRUE_PEAK_TAPS = 16
+
+
+def true_peak_filters(oversample=TRUE_PEAK_OVERSAMPLE, taps=TRUE_PEAK_TAPS):
+    """İki örnek arasındaki `oversample - 1` ara nokta için pencereli sinc filtreleri, (katsayı, faz).
+
+    Pencere, ara noktanın solundaki örnekten `taps // 2 - 1` önce başlar.
+    """
+    half = taps // 2
+    x = (np.arange(taps) - (half - 1))[:, None] - np.arange(1, oversample)[None, :] / float(oversample)
+    h = np.sinc(x) * 0.5 * (1.0 + np.cos(np.pi * x / (half + 0.5)))
+    return (h / h.sum(axis=0)).astype(np.float32)
+
+
+class TruePeakLimiter:
+    """Ana bus için ileriye bakan, gerçek tepe kestirimli tuğla duvar sınırlayıcı.
+
+    Gereken zayıflatma (dB) önce `lookahead` kare boyunca tutulur, dB cinsinden
+    doğrusal bırakılır, sonra yine `lookahead` karelik kayan ortalamayla
+    yumuşatılır; böylece kazanç, tepe gecikme hattından çıktığında tam gereken
+    değere inmiş olur. Her adım blok başına vektöreldir ve ara diziler önceden
+    ayrılır. Çıkış girişten sabit `latency` kare geride kalır; kapalıyken de
+    aynı gecikme korunur, açıp kapamak akışta atlama yapmaz.
+    """
+
+    def __init__(self, sample_rate, channels, ceiling_db=-1.0, enabled=True):
+        self.channels = channels
+        self.ceiling_db = ceiling_db
+        self.enabled = enabled
+        self.lookahead = max(2, int(sample_rate * LIMITER_LOOKAHEAD_MS / 1000.0))
+        self._filters = true_peak_filters()
+        self._taps = len(self._filters)
+        # Tepe kestirimi filtrenin sağ kanadı kadar geride kalır
+        self.latency = self.lookahead - 1 + self._taps // 2
+        self._release = LIMITER_RELEASE_DB_PER_S / float(sample_rate)
+        self._release_state = 0.0
+        self._reduction = 0.0
+        self._capacity = 0
+        self._allocate(OUTPUT_BUFFER_FRAMES)
+
+    def _allocate(self, frames):
+        """Ara dizileri `frames` karelik bloklar için (yeniden) ayır; geçmiş korunur"""
+        delay, hold = self.latency, self.lookahead - 1
+        old = (self._signal[:delay], self._atten[:hold], self._box[:hold]) if self._capacity else None
+        phases = self._filters.shape[1]
+        self._signal = np.zeros((delay + frames, self.channels), dtype=np.float32)
+        self._interp = np.empty((frames, self.channels, phases), dtype=np.float32)
+        self._abs = np.empty((frames, self.channels), dtype=np.float32)
+        self._peak = np.empty(frames, dtype=np.float32)
+        self._sample_peak = np.empty(frames, dtype=np.float32)
+        self._atten = np.zeros(hold + frames)
+        self._held = np.empty(frames)
+        self._slope = np.arange(frames) * self._release
+        self._work = np.empty(frames)
+        self._box = np.zeros(hold + frames)
+        self._sums = np.zeros(hold + frames + 1)
+        self._gain = np.empty(frames, dtype=np.float32)
+        if old is not None:
+            self._signal[:delay], self._atten[:hold], self._box[:hold] = old
+        self._capacity = frames
+
+    def take_reduction(self):
+        """Son okumadan beri en büyük kazanç azaltması (dB, pozitif)"""
+        reduction, self._reduction = self._reduction, 0.0
+        return reduction
+
+    def process(self, block):
+        """(kare, kanal) float32 bloğu yerinde sınırla ve `latency` kare geciktir"""
+        frames = len(block)
+        if frames > self._capacity:
+            self._allocate(frames)
+        delay = self.latency
+        signal = self._signal
+        signal[delay:delay + frames] = block
+        if self.enabled:
+            np.multiply(signal[:frames], self._gains(frames)[:, None], out=block)
+        else:
+            block[:] = signal[:frames]
+            self._atten.fill(0.0)
+            self._box.fill(0.0)
+            self._release_state = 0.0
+        signal[:delay] = signal[frames:frames + delay]
+        return block
+
+    def _gains(self, frames):
+        delay, hold, taps = self.latency, self.lookahead - 1, self._taps
+        sliding = np.lib.stride_tricks.sliding_window_view
+
+        # Gerçek tepe: her örnek ve ardındaki ara noktalar, kanalların en büyüğü
+        windows = sliding(self._signal[delay - taps + 1:delay + frames], taps, axis=0)
+        interp = np.matmul(windows, self._filters, out=self._interp[:frames])
+        np.abs(interp, out=interp)
+        peak = np.max(interp, axis=(1, 2), out=self._peak[:frames])
+        centre = delay - taps // 2
+        np.abs(self._signal[centre:centre + frames], out=self._abs[:frames])
+        np.maximum(peak, np.max(self._abs[:frames], axis=1, out=self._sample_peak[:frames]), out=peak)
+        np.maximum(peak, 1e-9, out=peak)
+
+        # Tavanı aşan kısım (dB), ileriye bakış boyunca tutulur
+        atten = self._atten
+        excess = atten[hold:hold + frames]
+        np.log10(peak, out=excess)
+        excess *= 20.0
+        excess -= self.ceiling_db
+        np.maximum(excess, 0.0, out=excess)
+        held = np.max(sliding(atten[:hold + frames], hold + 1), axis=1, out=self._held[:frames])
+        atten[:hold] = atten[frames:frames + hold]
+
+        # Doğrusal bırakma: y[t] = max(x[t], y[t-1] - r), eğimi çıkarılmış birikimli maksimumla
+        slope = self._slope[:frames]
+        box = self._box
+        released = box[hold:hold + frames]
+        np.add(held, slope, out=released)
+        np.maximum.accumulate(released, out=released)
+        released -= slope
+        carried = np.subtract(self._release_state - self._release, slope, out=self._work[:frames])
+        np.maximum(released, carried, out=released)
+        self._release_state = released[-1]
+
+        # Kayan ortalama: tepe çıkışa vardığında pencerenin tamamı onu kapsar
+        sums = self._sums
+        np.cumsum(box[:hold + frames], out=sums[1:hold + frames + 1])
+        smooth = np.subtract(sums[hold + 1:hold + frames + 1], sums[:frames], out=self._work[:frames])
+        smooth *= 1.0 / (hold + 1)
+        box[:hold] = box[frames:frames + hold]
+        reduction = smooth.max()
+        if reduction > self._reduction:
+            self._reduction = reduction
+        smooth *= -0.05
+        np.power(10.0, smooth, out=smooth)
+        gain = self._gain[:frames]
+        gain[:] = smooth
+        return gain
+
+
+# Ses sınırı aşılınca yer açmak için kesilecek sesin seçimi ve kesme fade'i
+STEAL_POLICIES = ("oldest", "quietest")
+STEAL_FADE_MS = 10
+
+
+class MixEngine:
+    """Çalan sesleri float32 olarak toplayan, Qt'den bağımsız karıştırıcı.
+
+    `max_voices` sıfırdan büyükse yeni ses eklenirken kesilmemiş ses sayısı bu
+    sınırda tutulur; `steal_policy`ye göre en eski ya da o an en sessiz ses kısa
+    bir fade ile kesilir. Döngüdeki sesler (yataklar) ancak başka aday yoksa seçilir.
+    """
+
+    def __init__(self, sample_rate, channels):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._lock = threading.Lock()
+        self._voices = []
+        self._finished = []
+        self._bus_levels = {}
+        # Hemen çalınan seslerin tetiklemeden karışıma girişine kadar geçen süreler (s)
+        self._start_delays = []
+        # Son çıkışın kopyalandığı halka tampon (yayın kaydı açıksa)
+        self.recorder = None
+        # Ana bus işlem zinciri; karışımdan sonra, kırpma ve kayıttan önce uygulanır
+        self.master_chain = ()
+        self.max_voices = 0
+        self.steal_policy = STEAL_POLICIES[0]
+        self.voices_stolen = 0
+        self._steal_fade = max(1, sample_rate * STEAL_FADE_MS // 1000)
+        self._mix = np.zeros((OUTPUT_BUFFER_FRAMES, channels), dtype=np.float32)
+        # Çıkış akışındaki konum ve bu konumun üretildiği an
+        self.frames_rendered = 0
+        self.output_latency = OUTPUT_BUFFER_FRAMES
+        self._anchor = (time.perf_counter(), 0)
+
+    def frame_at(self, perf_time):
+        """perf_counter zamanında hoparlörden çıkacak akış karesini tahmin et"""
+        anchor_time, anchor_frame = self._anchor
+        return (anchor_frame - self.output_latency - self.master_latency
+                + (perf_time - anchor_time) * self.sample_rate)
+
+    @property
+    def master_latency(self):
+        """Ana bus zincirinin sabit gecikmesi (kare)"""
+        return sum(processor.latency for processor in self.master_chain)
+
+    def play(self, clip, gain=1.0, tag=None, start=0, end=None, delay=0, fade_in=0, fade_out=0,
+             at_frame=None, on_start=None, loop_start=None, pan=0.0, bus=None, length=None):
+        voice = Voice(clip, gain, tag, start, end, delay, fade_in, fade_out, at_frame, on_start,
+                      loop_start, pan, bus, length)
+        voice.bus_level = self._bus_levels.get(bus, 1.0)
+        if not delay and at_frame is None:
+            voice.queued = time.perf_counter()
+        with self._lock:
+            if self.max_voices > 0:
+                self._make_room(self.max_voices - 1)
+            self._voices.append(voice)
+        return voice
+
+    def _make_room(self, limit):
+        # Kilit tutulurken çağrılır
+        playing = [v for v in self._voices if not v.stolen]
+        while len(playing) > limit:
+            candidates = [v for v in playing if v.loop_start is None] or playing
+            if self.steal_policy == "quietest":
+                victim = min(candidates, key=self._loudness)
+            else:
+                victim = candidates[0]
+            playing.remove(victim)
+            victim.stolen = True
+            victim.loop_start = None
+            if victim.pos == victim.first:
+                # Henüz duyulmamış ses hiç başlamadan biter
+                victim.end = victim.pos
+            else:
+                victim.end = min(victim.end, victim.pos + self._steal_fade)
+                victim.fade_out = self._steal_fade
+            self.voices_stolen += 1
+
+    def _loudness(self, voice):
+        """Sesin o anki konumundan bir blokluk tepe seviyesi (kazanç, pan ve bus dahil)"""
+        clip = voice.clip
+        window = clip.data[voice.pos:voice.pos + OUTPUT_BUFFER_FRAMES]
+        if not len(window):
+            return 0.0
+        peak = np.abs(window.astype(np.float32) - clip.offset).max(axis=0)
+        return float((peak * np.abs(voice.gains)).max()) * self._bus_levels.get(voice.bus, 1.0)
+
+    def stop(self, tag=None, keep=(), keep_beds=False):
+        """Etiketi eşleşen sesleri (etiket verilmezse `keep`tekiler dışında hepsini) durdur.
+
+        `keep_beds` verilirse döngü olarak başlatılmış sesler (yataklar) de kesilmez.
+        Durdurulan seslerin etiketleri, tekrarsız olarak döner.
+        """
+        with self._lock:
+            if tag is None:
+                alive = [v for v in self._voices if v.tag in keep or (keep_beds and v.bed)]
+            else:
+                alive = [v for v in self._voices if v.tag != tag]
+            stopped = [v.tag for v in self._voices if v not in alive]
+            self._voices = alive
+        return list(dict.fromkeys(stopped))
+
+    def set_bus_level(self, bus, level):
+        """Bus faderini doğrusal kazanç olarak ayarla; çalan sesler bir blok içinde yumuşakça geçer"""
+        # Sözlük kopyalanıp tek atamayla değiştirildiği için kilit gerekmez
+        self._bus_levels = dict(self._bus_levels, **{bus: level})
+
+    def release(self, tag):
+        """Etiketi eşleşen döngüleri kesmeden, içinde bulundukları turun sonunda bitir"""
+        with self._lock:
+            for voice in self._voices:
+                if voice.tag == tag:
+                    voice.loop_start = None
+
+    def is_active(self):
+        return bool(self._voices)
+
+    def is_playing(self, tag):
+        """Etiketi eşleşen, kesilmemiş bir ses var mı"""
+        return any(v.tag == tag and not v.stolen for v in self._voices)
+
+    def playing_positions(self, perf_time):
+        """Her etiketin en son başlayan sesi için `perf_time` anında duyulan konum.
+
+        {etiket: (geçen, kalan, toplam)} kare olarak döner; döngüdeki seste kalan None
+        olur ve geçen süre o turun içindeki konumdur. Henüz çıkışa ulaşmamış,
+        tamponda bekleyen kareler düşülür.
+        """
+        lag = max(0.0, self.frames_rendered - self.frame_at(perf_time))
+        positions = {}
+        for voice in self._voices:
+            if voice.stolen or voice.tag is None:
+                continue
+            heard = voice.pos - lag
+            if voice.wrapped is not None and heard < voice.wrapped:
+                # Tampondaki kareler önceki turdan; duyulan konum o tura sarılır
+                heard = voice.wrapped + (heard - voice.wrapped) % (voice.end - voice.wrapped)
+                unheard = lag
+            else:
+                heard = min(max(voice.first, heard), voice.end)
+                unheard = voice.pos - heard
+            remaining = voice.frames_left()
+            if remaining is not None:
+                remaining += unheard
+            positions[voice.tag] = (heard - voice.first, remaining, voice.end - voice.first)
+        return positions
+
+    def pop_finished(self):
+        with self._lock:
+            finished, self._finished = self._finished, []
+        return finished
+
+    def pop_start_delays(self):
+        with self._lock:
+            delays, self._start_delays = self._start_delays, []
+        return delays
+
+    def render(self, frames):
+        """Sonraki `frames` kareyi karıştır; dönen dizi bir sonraki çağrıya kadar geçerlidir"""
+        if len(self._mix) < frames:
+            self._mix = np.zeros((frames, self.channels), dtype=np.float32)
+        out = self._mix[:frames]
+        out.fill(0.0)
+        block_start = self.frames_rendered
+        block_time = time.perf_counter()
+        self._anchor = (block_time, block_start)
+        bus_levels = self._bus_levels
+        with self._lock:
+            alive = []
+            for voice in self._voices:
+                if voice.at_frame is not None:
+                    voice.delay = max(0, int(round(voice.at_frame)) - block_start)
+                    voice.at_frame = None if voice.on_start is None else voice.at_frame
+                skip = min(voice.delay, frames)
+                voice.delay -= skip
+                if voice.on_start is not None and skip < frames and voice.pos < voice.end:
+                    voice.on_start(block_start + skip, voice.at_frame)
+                    voice.on_start = voice.at_frame = None
+                if voice.queued is not None:
+                    self._start_delays.append(block_time - voice.queued)
+                    voice.queued = None
+                while skip < frames and voice.pos < voice.end:
+                    n = min(frames - skip, voice.end - voice.pos)
+                    if voice.left is not None:
+                        n = min(n, voice.left)
+                    clip = voice.clip
+                    segment = clip.data[voice.pos:voice.pos + n].astype(np.float32)
+                    if clip.offset:
+                        segment -= clip.offset
+                    env = voice.envelope(n)
+                    level = bus_levels.get(voice.bus, 1.0)
+                    if level != voice.bus_level:
+                        # Fader değişimi blok boyunca rampalanır, tıklama olmaz
+                        ramp = np.linspace(voice.bus_level, level, n + 1, dtype=np.float32)[1:]
+                        env = ramp if env is None else env * ramp
+                        voice.bus_level = level
+                        segment *= voice.gains
+                    else:
+                        segment *= voice.gains * level
+                    if env is not None:
+                        segment *= env[:, None]
+                    out[skip:skip + n] += segment
+                    voice.pos += n
+                    skip += n
+                    if voice.left is not None:
+                        voice.left -= n
+                        if voice.left <= 0:
+                            # İstenen uzunluk doldu: döngü de olsa burada biter
+                            voice.loop_start = None
+                            voice.end = voice.pos
+                    if voice.pos >= voice.end and voice.loop_start is not None:
+                        # Dosya yeniden açılmadan, aynı eşlemden başa sarılır
+                        voice.pos = voice.wrapped = voice.loop_start
+                        voice.fade_in = 0
+                if voice.pos < voice.end:
+                    alive.append(voice)
+                else:
+                    self._finished.append(voice.tag)
+            self._voices = alive
+        self.frames_rendered += frames
+        for processor in self.master_chain:
+            processor.process(out)
+        np.clip(out, -1.0, 1.0, out=out)
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.write(out)
+        return out
+
+
+def output_device_format(device_info=None):
+    """Varsayılan çıkış cihazının yerel biçimini (desteklenen en yakın PCM) seç"""
+    if device_info is None:
+        device_info = QAudioDeviceInfo.defaultOutputDevice()
+    fmt = device_info.preferredFormat()
+    fmt.setCodec("audio/pcm")
+    fmt.setByteOrder(QAudioFormat.LittleEndian)
+    if fmt.sampleType() not in (QAudioFormat.Float, QAudioFormat.SignedInt, QAudioFormat.UnSignedInt) \
+            or fmt.sampleSize() not in (8, 16, 32):
+        fmt.setSampleType(QAudioFormat.SignedInt)
+        fmt.setSampleSize(16)
+    if fmt.sampleRate() <= 0:
+        fmt.setSampleRate(48000)
+    if fmt.channelCount() <= 0:
+        fmt.setChannelCount(2)
+    if not device_info.isFormatSupported(fmt):
+        fmt = device_info.nearestFormat(fmt)
+    return device_info, fmt
+
+
+class _EngineIODevice(QIODevice):
+    """QAudioOutput'un çektiği veriyi doğrudan karıştırıcıdan üreten aygıt"""
+
+    def __init__(self, engine, spec, on_block):
+        super().__init__()
+        self._engine = engine
+        self._spec = spec
+        self._frame_bytes = spec[1] * spec[3] // 8
+        self._on_block = on_block
+
+    def isSequential(self):
+        return True
+
+    def bytesAvailable(self):
+        return OUTPUT_BUFFER_FRAMES * self._frame_bytes + super().bytesAvailable()
+
+    def readData(self, maxlen):
+        frames = maxlen // self._frame_bytes
+        if frames <= 0:
+            return b''
+        data = float_to_pcm(self._engine.render(frames), self._spec).tobytes()
+        self._on_block(data)
+        return data
+
+    def writeData(self, data):
+        return -1
+
+
+class AudioOutput(QObject):
+    """Karıştırıcıyı ses kartına bağlar; GUI donsa bile çalsın diye kendi iş parçacığında çalışır.
+
+    Aygıt başlangıçta açılır ve boştayken de karıştırıcının ürettiği sessizlikle
+    beslenir; böylece ilk tetikleme de sonrakiler kadar hızlıdır. Aygıt ilk bloğu
+    çektiğinde `readyChanged(True)` yayınlanır; hatayla durursa yeniden açılır.
+    """
+    blockRendered = pyqtSignal(object)
+    voicesFinished = pyqtSignal(list)
+    readyChanged = pyqtSignal(bool)
+
+    def __init__(self, engine, device_info, fmt):
+        super().__init__()
+        self.engine = engine
+        self.device_info = device_info
+        self.format = fmt
+        self.spec = audio_format_spec(fmt)
+        self._output = None
+        self._device = None
+        self._primed = False
+        self._closing = False
+        self.underruns = 0
+        self._thread = QThread()
+        self.moveToThread(self._thread)
+        self._thread.started.connect(self._open)
+
+    def start(self):
+        self._thread.start()
+
+    @pyqtSlot()
+    def _open(self):
+        if self._closing:
+            return
+        self._device = _EngineIODevice(self.engine, self.spec, self._on_block)
+        self._device.open(QIODevice.ReadOnly)
+        self._output = QAudioOutput(self.device_info, self.format)
+        self._output.setBufferSize(OUTPUT_BUFFER_FRAMES * self.spec[1] * self.spec[3] // 8)
+        self._output.stateChanged.connect(self._on_state_changed)
+        self._output.start(self._device)
+        self.engine.output_latency = self._output.bufferSize() // (self.spec[1] * self.spec[3] // 8)
+
+    def _on_state_changed(self, state):
+        if self._output is None:
+            return
+        if state == QAudio.IdleState and self._output.error() == QAudio.UnderrunError:
+            self.underruns += 1
+        if state != QAudio.StoppedState or self._output.error() == QAudio.NoError:
+            return
+        # Aygıt çıkarıldı ya da ses sunucusu yeniden başladı: kısa süre sonra yeniden aç
+        self._output.stop()
+        self._output = None
+        if self._primed:
+            self._primed = False
+            self.readyChanged.emit(False)
+        QTimer.singleShot(AUDIO_REOPEN_MS, self._open)
+
+    def _on_block(self, data):
+        if not self._primed:
+            self._primed = True
+            self.readyChanged.emit(True)
+        self.blockRendered.emit(QAudioBuffer(QByteArray(data), self.format))
+        finished = self.engine.pop_finished()
+        if finished:
+            self.voicesFinished.emit(finished)
+
+    @pyqtSlot()
+    def _close(self):
+        self._closing = True
+        if self._output is not None:
+            self._output.stop()
+            self._output = None
+
+    def close(self):
+        if self._thread.isRunning():
+            QMetaObject.invokeMethod(self, "_close", Qt.BlockingQueuedConnection)
+            self._thread.quit()
+            self._thread.wait()
+
+
+# Ön dinleme çıkışı: aygıt adı, ses kartı olmadan gerçek zamanlı boş çıkış ya da WAV dosyası
+CUE_NULL_DEVICE = "null"
+CUE_FILE_PREFIX = "file:"
+
+
+def cue_output_device(name, program_device, fmt):
+    """Ön dinleme aygıtı: adı verilen ya da programdan farklı ilk çıkış.
+
+    Önbellekteki PCM olduğu gibi çalınsın diye aygıt program biçimini
+    desteklemelidir; uygun aygıt yoksa None.
+    """
+    if name == CUE_NULL_DEVICE:
+        return None
+    for device in QAudioDeviceInfo.availableDevices(QAudio.AudioOutput):
+        if name and device.deviceName() != name:
+            continue
+        if not name and device.deviceName() == program_device.deviceName():
+            continue
+        if device.isFormatSupported(fmt):
+            return device
+    return None
+
+
+class PacedOutput(QObject):
+    """Karıştırıcıyı ses kartı yerine duvar saatine göre çeken çıkış.
+
+    İkinci ses kartı olmadığında ve testlerde ön dinleme için kullanılır: bloklar
+    atılır ya da `path` verilmişse WAV dosyasına yazılır. AudioOutput gibi kendi
+    iş parçacığında çalışır ve aynı bitiş/hazır sinyallerini yayınlar.
+    """
+    voicesFinished = pyqtSignal(list)
+    readyChanged = pyqtSignal(bool)
+
+    def __init__(self, engine, fmt, path=None):
+        super().__init__()
+        self.engine = engine
+        self.format = fmt
+        self.spec = audio_format_spec(fmt)
+        self.path = path
+        self._sink = None
+        self._timer = None
+        self._started = None
+        self._frames = 0
+        self._thread = QThread()
+        self.moveToThread(self._thread)
+        self._thread.started.connect(self._open)
+
+    def start(self):
+        self._thread.start()
+
+    @pyqtSlot()
+    def _open(self):
+        if self.path is not None:
+            self._sink = _WavSink(self.path, self.spec[0], self.spec[1], 16)
+        self._started = time.perf_counter()
+        self._timer = QTimer()
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._pull)
+        self._timer.start(max(1, OUTPUT_BUFFER_FRAMES * 500 // self.spec[0]))
+        self.engine.output_latency = 0
+        self.readyChanged.emit(True)
+
+    def _pull(self):
+        # Zamanlayıcı gecikse de geçen süre kadar kare üretilir; hız gerçek zamanda kalır
+        due = int((time.perf_counter() - self._started) * self.spec[0]) - self._frames
+        while due > 0:
+            frames = min(due, OUTPUT_BUFFER_FRAMES)
+            block = self.engine.render(frames)
+            if self._sink is not None:
+                self._sink.write(block)
+            self._frames += frames
+            due -= frames
+        finished = self.engine.pop_finished()
+        if finished:
+            self.voicesFinished.emit(finished)
+
+    @pyqtSlot()
+    def _close(self):
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def close(self):
+        if self._thread.isRunning():
+            QMetaObject.invokeMethod(self, "_close", Qt.BlockingQueuedConnection)
+            self._thread.quit()
+            self._thread.wait()
+
+
+def benchmark_trigger_latency(file_path, triggers=20):
+    """Tetiklemeden sesin çıkış akışına girmesine kadar geçen süreyi ölç.
+
+    İlk tetikleme ayrı raporlanır; ısınma doğru çalışıyorsa sonrakilerden farkı olmamalıdır.
+    """
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    device_info, fmt = output_device_format()
+    engine = MixEngine(fmt.sampleRate(), fmt.channelCount())
+    output = AudioOutput(engine, device_info, fmt)
+    ready = threading.Event()
+    output.readyChanged.connect(lambda primed: primed and ready.set(), Qt.DirectConnection)
+    opened = time.perf_counter()
+    output.start()
+    if not ready.wait(5.0):
+        print("output device did not start")
+        output.close()
+        return 1
+    print(f"output device ready in {(time.perf_counter() - opened) * 1000:.1f} ms, "
+          f"buffer {engine.output_latency * 1000.0 / engine.sample_rate:.1f} ms")
+
+    clip = PCMClip(transcode_to_cache(file_path, PCM_CACHE_DIR, output.spec,
+                                      load_settings()["silence_threshold_db"]))
+    clip.prefetch()
+    start, end = clip.audible_range()
+    latencies = []
+    try:
+        for _ in range(triggers):
+            heard = threading.Event()
+            triggered = time.perf_counter()
+            engine.play(clip, DEFAULT_GAIN, tag=heard, start=start, end=end,
+                        on_start=lambda frame, wanted, heard=heard: heard.set())
+            if heard.wait(1.0):
+                latencies.append((time.perf_counter() - triggered) * 1000.0)
+            engine.stop(heard)
+            # Tetiklemeler blok sınırlarına farklı yerlerde denk gelsin
+            time.sleep(0.1 + (len(latencies) % 7) * 0.013)
+            app.processEvents()
+    finally:
+        output.close()
+
+    if not latencies:
+        print("no trigger reached the output")
+        return 1
+    steady = sorted(latencies[1:]) or latencies
+    print(f"first trigger {latencies[0]:.2f} ms, later triggers median {steady[len(steady) // 2]:.2f} ms, "
+          f"max {steady[-1]:.2f} ms ({len(latencies)} triggers)")
+    return 0
+# --- Ses Motoru Sonu ---
+
+
+# --- Çevrimdışı miks (başsız mod) ---
+RENDER_BLOCK_FRAMES = 65536
+
+
+def parse_cue_time(value):
+    """Saniye sayısını ya da "ss:dd:nn.nnn" biçimindeki zamanı saniyeye çevir"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    seconds = 0.0
+    for part in str(value).split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def load_cue_list(cue_path):
+    """Zamanlı işaret listesini oku.
+
+    Dosya bir JSON listesidir; her öğe {"button": "satır,sütun", "at": zaman}
+    içerir, isteğe bağlı olarak "gain_db", "fade_in", "fade_out" (saniye) ve
+    "length" (saniye, kartı erken kesmek için) verilebilir.
+    """
+    with open(cue_path, 'r') as f:
+        cues = json.load(f)
+    parsed = []
+    for cue in cues:
+        button = cue["button"]
+        if not isinstance(button, str):
+            button = f"{button[0]},{button[1]}"
+        parsed.append({
+            "button": button,
+            "at": parse_cue_time(cue["at"]),
+            "gain_db": float(cue.get("gain_db", 0.0)),
+            "fade_in": float(cue.get("fade_in", 0.0)),
+            "fade_out": float(cue.get("fade_out", 0.0)),
+            "length": float(cue["length"]) if cue.get("length") is not None else None,
+        })
+    parsed.sort(key=lambda c: c["at"])
+    return parsed
+
+
+class _WavSink:
+    """Float blokları tamsayı PCM WAV dosyasına yazar"""
+
+    def __init__(self, path, sample_rate, channels, bits):
+        self.spec = (sample_rate, channels, 's', bits)
+        self.bits = bits
+        self._wav = wave.open(path, 'wb')
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(bits // 8)
+        self._wav.setframerate(sample_rate)
+
+    def write(self, block):
+        if self.bits == 24:
+            # 24 bit doğrudan nicemlenir: float64'te ölçekle, kırp, küçük uçlu ilk üç baytı al
+            scaled = np.clip(np.asarray(block, dtype=np.float64) * 8388607.0, -8388608.0, 8388607.0)
+            pcm = scaled.astype('<i4').view(np.uint8).reshape(-1, 4)[:, :3]
+        else:
+            pcm = float_to_pcm(block, self.spec)
+        self._wav.writeframes(pcm.tobytes())
+
+    def close(self):
+        self._wav.close()
+
+
+def load_clips(files, spec, threshold_db):
+    """Dosyaları işlem havuzunda `spec` biçimine dönüştürüp {yol: PCMClip} döndür"""
+    clips = {}
+    with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = {path: pool.submit(transcode_to_cache, path, PCM_CACHE_DIR, spec, threshold_db)
+                   for path in files}
+        for path, future in futures.items():
+            clips[path] = PCMClip(future.result())
+    return clips
+
+
+def render_mixdown(palette_path, cue_path, output_path, sample_rate=48000, channels=2, bits=16):
+    """Palet ve işaret listesini canlı çalmadaki karıştırıcıyla gerçek zamandan hızlı işle"""
+    palette = {pos: parse_palette_entry(entry)
+               for pos, entry in PaletteJournal(palette_path).load().items()}
+    cues = load_cue_list(cue_path)
+    spec = (sample_rate, channels, 'f', 32)
+    settings = load_settings()
+    threshold_db = settings["silence_threshold_db"]
+    if output_path.lower().endswith('.flac') and shutil.which("flac") is None:
+        # Kodlayıcı yoksa boşuna işlemeden önce dur
+        print("flac encoder not found; install the 'flac' package or render to .wav")
+        return 1
+
+    files = sorted({palette[c["button"]]["file_path"] for c in cues if c["button"] in palette})
+    clips = load_clips(files, spec, threshold_db)
+
+    # İşaretleri kare cinsinden zamanla
+    scheduled = []
+    total = 0
+    for cue in cues:
+        options = palette.get(cue["button"])
+        if options is None:
+            print(f"{cue['button']}: no sound assigned, cue skipped")
+            continue
+        clip = clips[options["file_path"]]
+        start, end, loop_start = entry_loop_range(clip, options)
+        length = int(cue["length"] * sample_rate) if cue["length"] is not None else None
+        if length is None and loop_start is not None:
+            print(f"{cue['button']}: looping cue without a length plays one pass")
+            loop_start = None
+        at = int(round(cue["at"] * sample_rate))
+        scheduled.append((at, clip, start, end, loop_start, length, cue, options))
+        span = end - start
+        if length is not None:
+            span = length if loop_start is not None else min(span, length)
+        total = max(total, at + span)
+
+    engine = MixEngine(sample_rate, channels)
+    for bus, level_db in settings["buses"].items():
+        engine.set_bus_level(bus, bus_fader_gain(level_db))
+    # Canlı çıkıştaki sınırlayıcı aynı ayarlarla; sabit gecikmesi çıktının başından kırpılır
+    engine.master_chain = (TruePeakLimiter(sample_rate, channels, settings["limiter_ceiling_db"],
+                                           settings["limiter"]),)
+    latency = engine.master_latency
+    sink = _WavSink(output_path if not output_path.lower().endswith('.flac') else output_path + '.wav',
+                    sample_rate, channels, bits)
+    started = time.perf_counter()
+    try:
+        index = 0
+        for block_start in range(0, total + latency, RENDER_BLOCK_FRAMES):
+            frames = min(RENDER_BLOCK_FRAMES, total + latency - block_start)
+            while index < len(scheduled) and scheduled[index][0] < block_start + frames:
+                at, clip, start, end, loop_start, length, cue, options = scheduled[index]
+                engine.play(clip, cue_gain(cue, options), tag=cue["button"],
+                            start=start, end=end, delay=at - block_start,
+                            fade_in=int(cue["fade_in"] * sample_rate),
+                            fade_out=int(cue["fade_out"] * sample_rate),
+                            loop_start=loop_start, length=length,
+                            pan=options["pan"], bus=options["bus"])
+                index += 1
+            out = engine.render(frames)
+            skip = max(0, latency - block_start)
+            if skip < frames:
+                sink.write(out[skip:])
+    finally:
+        sink.close()
+
+    if output_path.lower().endswith('.flac'):
+        # FLAC kodlaması için "flac" komut satırı aracı kullanılır
+        try:
+            subprocess.run(["flac", "--silent", "--force", "-o", output_path, output_path + '.wav'],
+                           check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            # İşlenen miks kaybolmasın; WAV olarak bırakılır
+            print(f"{output_path}: FLAC encoding failed ({e}); mix kept as {output_path}.wav")
+            return 1
+        os.remove(output_path + '.wav')
+
+    elapsed = time.perf_counter() - started
+    duration = total / float(sample_rate)
+    print(f"{output_path}: {duration:.1f} s rendered in {elapsed:.2f} s "
+          f"({duration / max(elapsed, 1e-9):.0f}x real time)")
+    return 0
+# --- Çevrimdışı Miks Sonu ---
+
+
+# --- Yayın kaydı (air-check) ---
+AIRCHECK_DIR = os.path.join(DATA_DIR, "aircheck")
+# Disk takılsa bile bu kadar saniyelik çıkış bellekte bekleyebilir
+AIRCHECK_BUFFER_SECONDS = 30
+AIRCHECK_POLL_SECONDS = 0.25
+
+
+class RingBuffer:
+    """Tek yazarlı, tek okuyuculu kilitsiz halka tampon.
+
+    Yazar yalnızca `_written`, okuyucu yalnızca `_read` sayacını ilerletir; sayaçlar
+    başa sarmadığı için doluluk ikisinin farkıdır ve kilide gerek kalmaz.
+    """
+
+    def __init__(self, frames, channels):
+        self._data = np.zeros((frames, channels), dtype=np.float32)
+        self._size = frames
+        self._written = 0
+        self._read = 0
+        self.dropped = 0
+
+    def write(self, block):
+        """Bloğu kopyala; yer yoksa beklemeden atar ve False döner"""
+        n = len(block)
+        if self._size - (self._written - self._read) < n:
+            self.dropped += n
+            return False
+        index = self._written % self._size
+        first = min(n, self._size - index)
+        self._data[index:index + first] = block[:first]
+        self._data[:n - first] = block[first:]
+        self._written += n
+        return True
+
+    def read(self):
+        """Birikmiş tüm kareleri kopya olarak al"""
+        n = self._written - self._read
+        index = self._read % self._size
+        first = min(n, self._size - index)
+        block = np.concatenate((self._data[index:index + first], self._data[:n - first]))
+        self._read += n
+        return block
+
+
+class AirCheckRecorder(QObject):
+    """Karıştırıcının son çıkışını dönen WAV/FLAC dosyalarına kaydeder.
+
+    Ses iş parçacığı yalnızca halka tampona kopyalar; dosyaya yazma ve FLAC
+    kodlaması yazıcı iş parçacığında yapılır. Disk yetişemezse kayıttan
+    kare düşer, çalma hiçbir zaman beklemez.
+    """
+    fileFinished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, engine, directory=AIRCHECK_DIR, file_format="wav", rotate_minutes=60, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.directory = directory
+        self.file_format = file_format
+        self.rotate_frames = int(rotate_minutes * 60 * engine.sample_rate)
+        self._ring = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._encoders = []
+
+    @property
+    def dropped_frames(self):
+        return self._ring.dropped if self._ring is not None else 0
+
+    def start(self):
+        self.stop()
+        os.makedirs(self.directory, exist_ok=True)
+        self._ring = RingBuffer(AIRCHECK_BUFFER_SECONDS * self.engine.sample_rate, self.engine.channels)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.engine.recorder = self._ring
+
+    def stop(self):
+        self.engine.recorder = None
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _open_sink(self):
+        stem = os.path.join(self.directory, time.strftime("aircheck-%Y%m%d-%H%M%S"))
+        path, suffix = stem + ".wav", 1
+        while os.path.exists(path) or os.path.exists(os.path.splitext(path)[0] + ".flac"):
+            path = f"{stem}-{suffix}.wav"
+            suffix += 1
+        return path, _WavSink(path, self.engine.sample_rate, self.engine.channels, 16)
+
+    def _finish(self, path, sink):
+        sink.close()
+        if self.file_format == "flac":
+            # Kodlayıcı beklenmez; yazıcı döngüsü bittiğini sonra yoklar
+            flac_path = os.path.splitext(path)[0] + ".flac"
+            try:
+                process = subprocess.Popen(["flac", "--silent", "--force", "-o", flac_path, path])
+            except OSError as e:
+                self.failed.emit(str(e))
+                self.fileFinished.emit(path)
+                return
+            self._encoders.append((process, path, flac_path))
+        else:
+            self.fileFinished.emit(path)
+
+    def _reap_encoders(self, wait=False):
+        running = []
+        for process, path, flac_path in self._encoders:
+            if wait:
+                process.wait()
+            if process.poll() is None:
+                running.append((process, path, flac_path))
+            elif process.returncode == 0:
+                os.remove(path)
+                self.fileFinished.emit(flac_path)
+            else:
+                self.fileFinished.emit(path)
+        self._encoders = running
+
+    def _run(self):
+        path, sink, frames = None, None, 0
+        try:
+            while True:
+                stopping = self._stop.wait(AIRCHECK_POLL_SECONDS)
+                block = self._ring.read()
+                while len(block):
+                    if sink is None:
+                        path, sink = self._open_sink()
+                        frames = 0
+                    take = min(len(block), self.rotate_frames - frames)
+                    sink.write(block[:take])
+                    frames += take
+                    block = block[take:]
+                    if frames >= self.rotate_frames:
+                        self._finish(path, sink)
+                        sink = None
+                self._reap_encoders()
+                if stopping:
+                    break
+        except (OSError, wave.Error) as e:
+            # Kayıt durur; ses iş parçacığı tampon dolunca kopyalamayı bırakır
+            self.failed.emit(str(e))
+        finally:
+            if sink is not None:
+                try:
+                    self._finish(path, sink)
+                except (OSError, wave.Error) as e:
+                    self.failed.emit(str(e))
+            self._reap_encoders(wait=True)
+# --- Yayın Kaydı Sonu ---
+
+
+# --- Yayın akışı günlüğü (as-run) ---
+ASRUN_PATH = os.path.join(DATA_DIR, "asrun.sqlite3")
+# Geçmiş penceresinde gösterilecek en fazla satır (dışa aktarmada sınır yok)
+ASRUN_VIEW_LIMIT = 1000
+ASRUN_COLUMNS = ("started", "duration", "file_path", "button", "source", "stopped_early")
+
+
+class AsRunLog(QObject):
+    """Her tetiklemeyi SQLite'a ekleyen, yalnızca eklemeli yayın akışı günlüğü.
+
+    Kayıtlar kuyruğa atılır; yazıcı iş parçacığı biriken her şeyi tek bir
+    işlemde yazar. WAL kipinde okuma yazmayı beklemez; başlangıç zamanı ve
+    dosya yolu dizinli olduğu için yıllarca kayıtta da sorgular hızlı kalır.
+    """
+    failed = pyqtSignal(str)
+
+    def __init__(self, path=ASRUN_PATH, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self._queue = queue.Queue()
+        self._reader = None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def record(self, started, duration, file_path, button, source, stopped_early):
+        """`started` Unix zamanı, `duration` saniye"""
+        self._queue.put((started, duration, file_path, button, source, int(stopped_early)))
+
+    def flush(self):
+        """Kuyruktaki kayıtlar yazılana kadar bekle"""
+        self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _run(self):
+        try:
+            db = self._connect()
+            db.execute("CREATE TABLE IF NOT EXISTS plays (id INTEGER PRIMARY KEY, started REAL NOT NULL, "
+                       "duration REAL, file_path TEXT, button TEXT, source TEXT, stopped_early INTEGER)")
+            db.execute("CREATE INDEX IF NOT EXISTS plays_started ON plays (started)")
+            db.execute("CREATE INDEX IF NOT EXISTS plays_file ON plays (file_path, started)")
+            db.commit()
+        except sqlite3.Error as e:
+            self.failed.emit(str(e))
+            db = None
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [row for row in batch if row is not None]
+            running = len(rows) == len(batch)
+            try:
+                if db is not None and rows:
+                    with db:
+                        db.executemany("INSERT INTO plays (started, duration, file_path, button, source, "
+                                       "stopped_early) VALUES (?, ?, ?, ?, ?, ?)", rows)
+            except sqlite3.Error as e:
+                self.failed.emit(str(e))
+            for _ in batch:
+                self._queue.task_done()
+        if db is not None:
+            db.close()
+
+    def _select(self, since=None, until=None, file_filter=None, limit=None):
+        if self._reader is None:
+            self._reader = self._connect()
+        where, args = [], []
+        if since is not None:
+            where.append("started >= ?")
+            args.append(since)
+        if until is not None:
+            where.append("started < ?")
+            args.append(until)
+        if file_filter:
+            where.append("instr(lower(file_path), lower(?)) > 0")
+            args.append(file_filter)
+        sql = f"SELECT {', '.join(ASRUN_COLUMNS)} FROM plays"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY started DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self._reader.execute(sql, args)
+
+    def query(self, since=None, until=None, file_filter=None, limit=ASRUN_VIEW_LIMIT):
+        """Tarih aralığına ve dosya adına göre süzülmüş kayıtlar, en yenisi önce"""
+        self.flush()
+        return self._select(since, until, file_filter, limit).fetchall()
+
+    def export(self, path, since=None, until=None, file_filter=None):
+        """Süzülen kayıtları CSV olarak yaz; satırlar bellekte toplanmadan akıtılır"""
+        self.flush()
+        count = 0
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(ASRUN_COLUMNS)
+            for row in self._select(since, until, file_filter):
+                started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row[0]))
+                writer.writerow((started, f"{row[1]:.3f}") + row[2:])
+                count += 1
+        return count
+
+
+class AsRunHistoryWindow(QWidget):
+    """Yayın akışı günlüğünü tarih aralığı ve dosya adıyla süzerek gösterir"""
+
+    def __init__(self, log, parent=None):
+        super().__init__(parent, Qt.Window)
+        self.log = log
+        self.labels = {}
+        self.resize(760, 420)
+        self.since = QDateEdit(QDate.currentDate().addDays(-7))
+        self.until = QDateEdit(QDate.currentDate())
+        for edit in (self.since, self.until):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("yyyy-MM-dd")
+        self.file_filter = QLineEdit()
+        self.file_filter.returnPressed.connect(self.refresh)
+        self.refresh_button = QPushButton()
+        self.refresh_button.clicked.connect(self.refresh)
+        self.export_button = QPushButton()
+        self.export_button.clicked.connect(self.export)
+        self.table = QTableWidget(0, len(ASRUN_COLUMNS))
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+
+        filters = QHBoxLayout()
+        filters.addWidget(self.since)
+        filters.addWidget(self.until)
+        filters.addWidget(self.file_filter, 1)
+        filters.addWidget(self.refresh_button)
+        filters.addWidget(self.export_button)
+        layout = QVBoxLayout(self)
+        layout.addLayout(filters)
+        layout.addWidget(self.table)
+
+    def set_labels(self, lang):
+        self.labels = lang
+        self.setWindowTitle(lang['menu_asrun'])
+        self.file_filter.setPlaceholderText(lang['asrun_file_filter'])
+        self.refresh_button.setText(lang['asrun_refresh'])
+        self.export_button.setText(lang['asrun_export'])
+        self.table.setHorizontalHeaderLabels([lang['asrun_' + column] for column in ASRUN_COLUMNS])
+
+    def _range(self):
+        # Bitiş günü de dahil edilir
+        since = QDateTime(self.since.date()).toSecsSinceEpoch()
+        until = QDateTime(self.until.date().addDays(1)).toSecsSinceEpoch()
+        return since, until, self.file_filter.text().strip()
+
+    def refresh(self):
+        rows = self.log.query(*self._range())
+        self.table.setRowCount(len(rows))
+        for i, (started, duration, file_path, button, source, stopped_early) in enumerate(rows):
+            cells = (time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started)),
+                     f"{int(duration // 60)}:{duration % 60:04.1f}",
+                     file_path, button, source, "\u2713" if stopped_early else "")
+            for column, text in enumerate(cells):
+                self.table.setItem(i, column, QTableWidgetItem(text))
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(self, self.labels['asrun_export'], "asrun.csv",
+                                              "CSV (*.csv);;Tüm Dosyalar (*)")
+        if path:
+            try:
+                count = self.log.export(path, *self._range())
+            except OSError as e:
+                print(f"{self.labels['message_asrun_failed']}: {e}")
+                return
+            print(f"{self.labels['message_asrun_exported']}: {path} ({count})")
+# --- Yayın Akışı Günlüğü Sonu ---
+
+
+# --- Olay döngüsü bekçisi ---
+STALL_LOG_PATH = os.path.join(DATA_DIR, "stalls.jsonl")
+STALL_LOG_MAX_BYTES = 1 << 20
+STALL_HEARTBEAT_MS = 20
+# Uzun bir takılmada alınacak en fazla yığın örneği
+STALL_MAX_SAMPLES = 5
+
+
+class StallWatchdog(QObject):
+    """Ana iş parçacığının olay döngüsü takılmalarını yakalar.
+
+    Ana iş parçacığındaki zamanlayıcı kalp atışı zamanını yazar; bekçi iş
+    parçacığı atış eşikten uzun gecikince ana iş parçacığının Python yığınını
+    örnekler. Takılma bitince süresi ve yığınlar STALL_LOG_PATH'e eklenir ve
+    `stalled(kayıt)` yayınlanır.
+    """
+    stalled = pyqtSignal(object)
+
+    def __init__(self, threshold_ms=DEFAULT_SETTINGS["stall_threshold_ms"], log_path=STALL_LOG_PATH,
+                 parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000.0
+        self.log_path = log_path
+        self.count = 0
+        self.worst_ms = 0.0
+        self._main_thread = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._timer = QTimer(self)
+        self._timer.setInterval(STALL_HEARTBEAT_MS)
+        self._timer.timeout.connect(self._heartbeat)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._beat = time.perf_counter()
+        self._timer.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _heartbeat(self):
+        self._beat = time.perf_counter()
+
+    def _sample(self):
+        frame = sys._current_frames().get(self._main_thread)
+        if frame is None:
+            return {"where": "", "stack": ""}
+        stack = traceback.extract_stack(frame)
+        where = f"{stack[-1].name} ({os.path.basename(stack[-1].filename)}:{stack[-1].lineno})"
+        return {"where": where, "stack": "".join(stack.format())}
+
+    def _run(self):
+        stall_beat, samples, next_sample = None, [], 0.0
+        while not self._stop.wait(STALL_HEARTBEAT_MS / 2000.0):
+            beat = self._beat
+            now = time.perf_counter()
+            if stall_beat is not None and beat != stall_beat:
+                # Döngü yeniden döndü: takılma bitti
+                self._report(stall_beat, beat, samples)
+                stall_beat, samples = None, []
+            late = now - beat
+            if late < self.threshold + STALL_HEARTBEAT_MS / 1000.0:
+                continue
+            if stall_beat is None:
+                stall_beat, next_sample = beat, now
+            if now >= next_sample and len(samples) < STALL_MAX_SAMPLES:
+                sample = self._sample()
+                if not samples or samples[-1]["stack"] != sample["stack"]:
+                    samples.append(dict(sample, after_ms=round(late * 1000.0, 1)))
+                next_sample = now + self.threshold
+
+    def _report(self, stalled_beat, resumed_beat, samples):
+        duration_ms = (resumed_beat - stalled_beat) * 1000.0 - STALL_HEARTBEAT_MS
+        self.count += 1
+        self.worst_ms = max(self.worst_ms, duration_ms)
+        record = {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "duration_ms": round(duration_ms, 1),
+                  "samples": samples}
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > STALL_LOG_MAX_BYTES:
+                os.replace(self.log_path, self.log_path + ".1")
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            pass
+        self.stalled.emit(record)
+# --- Olay Döngüsü Bekçisi Sonu ---
+
+
+# --- Stres ve dayanıklılık testi ---
+SOAK_DIR = os.path.join(DATA_DIR, "soak")
+SOAK_SAMPLE_SECONDS = 10
+SOAK_COLUMNS = ("elapsed_h", "triggers", "rss_mb", "fds", "qobjects", "latency_median_ms",
+                "latency_max_ms", "underruns")
+# Isınma sonrası bu eğimleri (saat başına) aşan büyüme sızıntı sayılır
+SOAK_LEAK_LIMITS = {"rss_mb": 8.0, "fds": 2.0, "qobjects": 100.0}
+# Daha kısa bir kararlı dönemin eğimi gürültüden ibarettir
+SOAK_LEAK_MIN_HOURS = 0.5
+# Son üçte birdeki gecikme ilk üçte birin bu katını ve bu kadar ms fazlasını aşarsa gerileme
+SOAK_LATENCY_RATIO = 1.5
+SOAK_LATENCY_SLACK_MS = 2.0
+
+
+def process_stats():
+    """(RSS MB, açık dosya tanıtıcısı) — Linux'ta /proc'tan; okunamayanlar None"""
+    rss_mb = fds = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss_mb = int(f.read().split()[1]) * mmap.PAGESIZE / (1024.0 * 1024.0)
+        fds = len(os.listdir("/proc/self/fd"))
+    except (OSError, ValueError, IndexError):
+        pass
+    return rss_mb, fds
+
+
+def analyze_soak(samples):
+    """Örneklerden sızıntı, gecikme gerilemesi ve boşalma bulgularını çıkar"""
+    problems = []
+    # İlk onda bir ısınma sayılır: önbellekler ve havuzlar o sırada dolar
+    steady = samples[max(1, len(samples) // 10):]
+    if len(steady) >= 3:
+        hours = np.array([row["elapsed_h"] for row in steady])
+        for column, limit in SOAK_LEAK_LIMITS.items():
+            values = [row[column] for row in steady]
+            if None in values or hours[-1] - hours[0] < SOAK_LEAK_MIN_HOURS:
+                continue
+            slope = np.polyfit(hours, np.array(values, dtype=float), 1)[0]
+            if slope > limit:
+                problems.append(f"{column} grows {slope:.1f}/h ({values[0]:.0f} -> {values[-1]:.0f})")
+        medians = [row["latency_median_ms"] for row in steady if row["latency_median_ms"] is not None]
+        third = len(medians) // 3
+        if third >= 3:
+            early = float(np.median(medians[:third]))
+            late = float(np.median(medians[-third:]))
+            if late > early * SOAK_LATENCY_RATIO and late - early > SOAK_LATENCY_SLACK_MS:
+                problems.append(f"trigger latency regressed {early:.1f} -> {late:.1f} ms")
+    if samples and samples[-1]["underruns"]:
+        problems.append(f"{samples[-1]['underruns']} audio underruns")
+    return problems
+
+
+class SoakTest(QObject):
+    """Rastgele tetiklemeleri saatlerce sürdürüp kaynak kullanımını ve gecikmeyi izler.
+
+    `trigger()` ortalama `rate` Hz'lik Poisson aralıklarla çağrılır; her
+    SOAK_SAMPLE_SECONDS'ta bir satır CSV'ye yazılır ve `sampled` yayınlanır.
+    Süre dolunca ya da durdurulunca `finished(rapor)` yayınlanır.
+    """
+    sampled = pyqtSignal(object)
+    finished = pyqtSignal(object)
+
+    def __init__(self, trigger, engine, output, rate=5.0, hours=1.0, parent=None):
+        super().__init__(parent)
+        self.trigger = trigger
+        self.engine = engine
+        self.output = output
+        self.rate = rate
+        self.duration = hours * 3600.0
+        self.samples = []
+        self.csv_path = None
+        self.triggers = 0
+        self._started = None
+        self._trigger_timer = QTimer(self)
+        self._trigger_timer.setSingleShot(True)
+        self._trigger_timer.timeout.connect(self._fire)
+        self._sample_timer = QTimer(self)
+        self._sample_timer.setInterval(SOAK_SAMPLE_SECONDS * 1000)
+        self._sample_timer.timeout.connect(self._sample)
+
+    def is_running(self):
+        return self._started is not None
+
+    def start(self):
+        os.makedirs(SOAK_DIR, exist_ok=True)
+        self.csv_path = os.path.join(SOAK_DIR, time.strftime("soak-%Y%m%d-%H%M%S.csv"))
+        with open(self.csv_path, 'w', newline='') as f:
+            csv.writer(f).writerow(SOAK_COLUMNS)
+        self.samples = []
+        self.triggers = 0
+        self._base_underruns = self.output.underruns
+        self.engine.pop_start_delays()
+        self._started = time.perf_counter()
+        self._sample()
+        self._sample_timer.start()
+        self._schedule()
+
+    def stop(self):
+        if self._started is None:
+            return
+        self._trigger_timer.stop()
+        self._sample_timer.stop()
+        self._sample()
+        self._started = None
+        self.finished.emit({"problems": analyze_soak(self.samples), "samples": len(self.samples),
+                            "triggers": self.triggers, "csv": self.csv_path})
+
+    def _schedule(self):
+        self._trigger_timer.start(int(random.expovariate(self.rate) * 1000))
+
+    def _fire(self):
+        self.trigger()
+        self.triggers += 1
+        if time.perf_counter() - self._started >= self.duration:
+            self.stop()
+        else:
+            self._schedule()
+
+    def _sample(self):
+        rss_mb, fds = process_stats()
+        delays = sorted(self.engine.pop_start_delays())
+        row = {
+            "elapsed_h": (time.perf_counter() - self._started) / 3600.0,
+            "triggers": self.triggers,
+            "rss_mb": rss_mb,
+            "fds": fds,
+            "qobjects": sum(1 for obj in gc.get_objects() if isinstance(obj, QObject)),
+            "latency_median_ms": delays[len(delays) // 2] * 1000.0 if delays else None,
+            "latency_max_ms": delays[-1] * 1000.0 if delays else None,
+            "underruns": self.output.underruns - self._base_underruns,
+        }
+        self.samples.append(row)
+        try:
+            with open(self.csv_path, 'a', newline='') as f:
+                csv.writer(f).writerow(["" if row[c] is None else round(row[c], 4) for c in SOAK_COLUMNS])
+        except OSError:
+            pass
+        self.sampled.emit(row)
+
+
+def run_soak_headless(palette_path, rate=5.0, hours=1.0):
+    """Arayüzsüz dayanıklılık testi: paletteki sesler varsayılan çıkış cihazında rastgele tetiklenir"""
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    # Sesler arayüzdeki gibi buton başına etiketlenir; aynı dosyayı çalan iki buton ayrı kalır
+    palette = [(pos, parse_palette_entry(entry))
+               for pos, entry in PaletteJournal(palette_path).load().items()]
+    if not palette:
+        print(f"{palette_path}: no sounds assigned")
+        return 1
+    device_info, fmt = output_device_format()
+    settings = load_settings()
+    engine = MixEngine(fmt.sampleRate(), fmt.channelCount())
+    engine.max_voices = settings["max_voices"]
+    engine.steal_policy = settings["voice_stealing"]
+    output = AudioOutput(engine, device_info, fmt)
+    output.start()
+    clips = load_clips(sorted({options["file_path"] for _, options in palette}), output.spec,
+                       settings["silence_threshold_db"])
+    layered = set()
+
+    def trigger():
+        # play_sound ile aynı karar: butonun yeniden tetikleme kipi ve döngüsü uygulanır
+        pos, options = random.choice(palette)
+        trigger_entry(engine, pos, clips[options["file_path"]], options, layered)
+
+    soak = SoakTest(trigger, engine, output, rate, hours)
+    soak.sampled.connect(lambda row: print(
+        f"{row['elapsed_h'] * 60:6.1f} min  {row['triggers']} triggers  RSS {row['rss_mb'] or 0:.1f} MB  "
+        f"fds {row['fds']}  QObjects {row['qobjects']}  latency {row['latency_median_ms'] or 0:.2f} ms  "
+        f"underruns {row['underruns']}"))
+    reports = []
+    soak.finished.connect(reports.append)
+    soak.finished.connect(app.quit)
+    # Ctrl+C testi erken bitirir; rapor yine de yazılır
+    signal.signal(signal.SIGINT, lambda *args: soak.stop())
+    soak.start()
+    app.exec_()
+    output.close()
+    report = reports[0]
+    print(f"{report['triggers']} triggers, {report['samples']} samples written to {report['csv']}")
+    for problem in report["problems"]:
+        print(f"REGRESSION: {problem}")
+    return 1 if report["problems"] else 0
+# --- Stres Ve Dayanıklılık Testi Sonu ---
+
+
+# --- Gösteri kontrolü: saatler ve işaret zamanlayıcısı ---
+SCHEDULE_LEAD_SECONDS = 0.15
+SCHEDULE_MISSED_SECONDS = 0.5
+
+
+class ShowClock:
+    """Dahili gösteri saati; başlatıldığı andan itibaren sayar"""
+
+    def __init__(self):
+        self._origin = None
+        self._paused_at = 0.0
+
+    def start(self):
+        if self._origin is None:
+            self._origin = time.perf_counter() - self._paused_at
+
+    def stop(self):
+        if self._origin is not None:
+            self._paused_at = self.now()
+            self._origin = None
+
+    def reset(self):
+        self._origin = None
+        self._paused_at = 0.0
+
+    def now(self):
+        if self._origin is None:
+            return self._paused_at
+        return time.perf_counter() - self._origin
+
+    def to_perf(self, show_time):
+        """Gösteri zamanının perf_counter karşılığı; saat durmuşsa None"""
+        if self._origin is None:
+            return None
+        return self._origin + show_time
+
+
+class WallClock:
+    """Duvar saati; işaret zamanları gece yarısından beri geçen saniyedir"""
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def now(self):
+        t = time.time()
+        lt = time.localtime(t)
+        return lt.tm_hour * 3600 + lt.tm_min * 60 + lt.tm_sec + (t % 1.0)
+
+    def to_perf(self, show_time):
+        return time.perf_counter() + (show_time - self.now())
+
+
+class MTCClock:
+    """Gelen MIDI Time Code'u izleyen saat.
+
+    Kaynak bir ham MIDI aygıtı (örn. /dev/snd/midiC1D0) ya da test için bir
+    kayıt dosyasıdır. Kayıt dosyasının her satırı "<saniye> <onaltılık baytlar>"
+    biçimindedir ve satırlar bu zamanlamayla yeniden oynatılır. LTC okuyan
+    cihazların çoğu MTC de ürettiği için LTC bu yoldan alınır.
+    """
+    FRAME_RATES = (24.0, 25.0, 29.97, 30.0)
+    DROPOUT_SECONDS = 0.25
+
+    def __init__(self, source_path):
+        self.source_path = source_path
+        self._lock = threading.Lock()
+        self._anchor = None
+        self._pieces = [0] * 8
+        self._sysex = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._read, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _read(self):
+        try:
+            if os.path.isfile(self.source_path):
+                self._replay_file()
+            else:
+                with open(self.source_path, 'rb', buffering=0) as f:
+                    while not self._stop.is_set():
+                        data = f.read(64)
+                        if not data:
+                            break
+                        self.feed(data)
+        except OSError as e:
+            print(f"{self.source_path}: {e}")
+
+    def _replay_file(self):
+        origin = time.perf_counter()
+        with open(self.source_path, 'r') as f:
+            for line in f:
+                parts = line.split(None, 1)
+                if len(parts) != 2 or line.startswith('#'):
+                    continue
+                wait = origin + float(parts[0]) - time.perf_counter()
+                if wait > 0 and self._stop.wait(wait):
+                    return
+                self.feed(bytes.fromhex(parts[1]))
+
+    def feed(self, data, received=None):
+        """Ham MIDI baytlarını işle; çeyrek kare ve tam kare mesajlarını anlar"""
+        received = time.perf_counter() if received is None else received
+        i = 0
+        while i < len(data):
+            byte = data[i]
+            if self._sysex is not None:
+                self._sysex.append(byte)
+                if byte == 0xF7:
+                    self._on_sysex(self._sysex, received)
+                    self._sysex = None
+            elif byte == 0xF0:
+                self._sysex = [byte]
+            elif byte == 0xF1 and i + 1 < len(data):
+                i += 1
+                self._on_quarter_frame(data[i], received)
+            i += 1
+
+    def _on_quarter_frame(self, value, received):
+        piece = (value >> 4) & 0x07
+        self._pieces[piece] = value & 0x0F
+        if piece == 7:
+            p = self._pieces
+            frames = p[0] | ((p[1] & 0x01) << 4)
+            seconds = p[2] | ((p[3] & 0x03) << 4)
+            minutes = p[4] | ((p[5] & 0x03) << 4)
+            hours = p[6] | ((p[7] & 0x01) << 4)
+            fps = self.FRAME_RATES[(p[7] >> 1) & 0x03]
+            # Sekiz çeyrek kare iki kare sürer; zaman ilk parçaya aittir
+            self._set(hours, minutes, seconds, frames + 2, fps, received)
+
+    def _on_sysex(self, message, received):
+        if len(message) == 10 and message[1:5] == [0x7F, 0x7F, 0x01, 0x01]:
+            hr, mn, sc, fr = message[5:9]
+            self._set(hr & 0x1F, mn, sc, fr, self.FRAME_RATES[(hr >> 5) & 0x03], received)
+
+    def _set(self, hours, minutes, seconds, frames, fps, received):
+        show_time = hours * 3600 + minutes * 60 + seconds + frames / round(fps)
+        with self._lock:
+            self._anchor = (show_time, received)
+
+    def _current_anchor(self):
+        with self._lock:
+            anchor = self._anchor
+        if anchor is None or time.perf_counter() - anchor[1] > self.DROPOUT_SECONDS:
+            return None
+        return anchor
+
+    def now(self):
+        anchor = self._current_anchor()
+        if anchor is None:
+            return None
+        return anchor[0] + time.perf_counter() - anchor[1]
+
+    def to_perf(self, show_time):
+        anchor = self._current_anchor()
+        if anchor is None:
+            return None
+        return anchor[1] + show_time - anchor[0]
+
+
+def create_show_clock(settings):
+    source = settings["show_clock"]
+    if source == "wall":
+        return WallClock()
+    if source == "mtc":
+        return MTCClock(settings["mtc_source"])
+    return ShowClock()
+
+
+class CueScheduler(QObject):
+    """İşaretleri bir saate göre zamanlayıp karıştırıcıda örnek doğruluğunda başlatır.
+
+    İş parçacığı yalnızca işaretten `SCHEDULE_LEAD_SECONDS` önce uyanmak
+    zorundadır; asıl yerleştirme, karıştırıcının akış karesi üzerinden yapılır.
+    Zamanlanan ve gerçekleşen başlangıç arasındaki fark `cueFired` ile bildirilir.
+    """
+    cueFired = pyqtSignal(object, float)
+    cueMissed = pyqtSignal(object)
+    finished = pyqtSignal(object)
+
+    def __init__(self, engine, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self._stop = threading.Event()
+        self._thread = None
+        self._jitter = []
+
+    def start(self, cues, clock):
+        """`cues`: zamana göre sıralı, çalınmaya hazır işaret sözlükleri"""
+        self.stop()
+        self._stop.clear()
+        self._jitter = []
+        self._thread = threading.Thread(target=self._run, args=(list(cues), clock), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self, cues, clock):
+        index = 0
+        while index < len(cues) and not self._stop.is_set():
+            cue = cues[index]
+            target = clock.to_perf(cue["at"])
+            now = time.perf_counter()
+            if target is None:
+                # Saat durdu ya da zaman kodu kesildi
+                self._stop.wait(0.01)
+                continue
+            if target < now - SCHEDULE_MISSED_SECONDS:
+                self.cueMissed.emit(cue)
+                index += 1
+                continue
+            wake = target - SCHEDULE_LEAD_SECONDS
+            if now < wake:
+                # Saat atlayabileceği için kısa aralıklarla yeniden değerlendir
+                self._stop.wait(min(wake - now, 0.01))
+                continue
+            self.engine.play(cue["clip"], cue["gain"], tag=cue["tag"],
+                             start=cue["start"], end=cue["end"],
+                             loop_start=cue["loop_start"], length=cue["frames"],
+                             fade_in=cue["fade_in"], fade_out=cue["fade_out"],
+                             pan=cue["pan"], bus=cue["bus"],
+                             at_frame=self.engine.frame_at(target),
+                             on_start=lambda actual, wanted, cue=cue: self._on_start(cue, actual, wanted))
+            index += 1
+        if not self._stop.is_set():
+            self._stop.wait(SCHEDULE_LEAD_SECONDS * 2)
+            self.finished.emit(self.jitter_report())
+
+    def _on_start(self, cue, actual, wanted):
+        # Ses iş parçacığında çağrılır; yalnızca kaydedip sinyal gönderir
+        jitter_ms = (actual - wanted) * 1000.0 / self.engine.sample_rate
+        self._jitter.append(jitter_ms)
+        self.cueFired.emit(cue, jitter_ms)
+
+    def jitter_report(self):
+        if not self._jitter:
+            return {"count": 0}
+        values = np.abs(np.array(self._jitter))
+        return {"count": len(values), "mean_ms": float(values.mean()), "max_ms": float(values.max())}
+# --- Gösteri Kontrolü Sonu ---
+
+
+# --- Temalar: tek, uygulama genelinde stil sayfası ---
+THEMES_DIR = os.path.join(CONFIG_DIR, 'themes')
+
+# Buton satırlarının tema sınıfları (QPushButton[cartRow="..."])
+ROW_CLASSES = ["red", "green", "green", "green", "green", "green", "yellow"]
+
+
+def default_theme():
+    """Dahili tema; satır renkleri orijinal paletten türetilir"""
+    # Orijinal renkler
+    original_colors = [
+        "#ff5c5c", # Kırmızımsı
+        "#ff8c5c", # Turuncu
+        "#ffbc5c", # Sarımsı turuncu
+        "#ffff5c", # Sarı
+        "#bfff5c", # Hafif yeşilimsi sarı
+        "#8cff5c", # Daha yeşil
+        "#5cffbc", # Mavimsi yeşil
+    ]
+    
+    # Renklerin doygunluğunu azaltarak yeni bir palet oluştur
+    desaturated_colors = []
+    for hex_color in original_colors:
+        hsv_color = QColor(hex_color).toHsv()
+        hsv_color.setHsv(hsv_color.hue(), 150, hsv_color.value())
+        desaturated_colors.append(hsv_color.name())
+
+    row_colors = {
+        "red": desaturated_colors[0],     # 1. sıra (kırmızımsı)
+        "green": "#5fa686",               # 2.-6. sıralar (VU metre yeşili)
+        "yellow": desaturated_colors[2],  # 7. sıra (sarımsı turuncu)
+    }
+
+    rules = ["""
+QPushButton#stopButton {
+    background-color: #e03c3c;
+    color: #ffffff;
+    border: 1px solid #902c2c;
+    border-radius: 4px;
+}
+QPushButton#stopButton:hover {
+    background-color: #b82b2b;
+}
+QPushButton#stopButton:pressed {
+    background-color: #8c2020;
+}
+#vuMeter, #gainReductionMeter {
+    background-color: black;
+    border-radius: 5px;
+}"""]
+    for row_class, color in row_colors.items():
+        rules.append(f"""
+QPushButton[cartRow="{row_class}"] {{
+    background-color: {color};
+    color: #000000;
+    border: 1px solid {color};
+    border-radius: 4px;
+}}
+QPushButton[cartRow="{row_class}"]:hover {{
+    background-color: {QColor(color).darker(120).name()};
+}}
+QPushButton[cartRow="{row_class}"]:pressed {{
+    background-color: {QColor(color).darker(150).name()};
+}}""")
+    rules.append("""
+QPushButton[broken="true"] {
+    border: 2px dashed #b00000;
+    color: #700000;
+}
+QLabel#audioStatus {
+    color: #b00000;
+}
+QLabel#audioStatus[ready="true"] {
+    color: #3c8a5c;
+}""")
+    return "\n".join(rules)
+
+
+class ThemeManager:
+    """Tüm uygulamaya tek bir stil sayfası uygular.
+
+    Temalar THEMES_DIR altındaki "<ad>.qss" dosyalarıdır; butonlar
+    `cartRow` özelliği ve `#stopButton`, `#vuMeter`, `#gainReductionMeter` nesne
+    adlarıyla seçilir.
+    Okunan temalar önbellekte tutulur.
+    """
+
+    DEFAULT = "default"
+
+    def __init__(self, themes_dir=THEMES_DIR):
+        self.themes_dir = themes_dir
+        self._cache = {}
+
+    def available(self):
+        names = [self.DEFAULT]
+        try:
+            names += sorted(os.path.splitext(name)[0] for name in os.listdir(self.themes_dir)
+                            if name.endswith('.qss'))
+        except OSError:
+            pass
+        return names
+
+    def stylesheet(self, name):
+        if name not in self._cache:
+            if name == self.DEFAULT:
+                self._cache[name] = default_theme()
+            else:
+                with open(os.path.join(self.themes_dir, name + '.qss'), 'r') as f:
+                    self._cache[name] = f.read()
+        return self._cache[name]
+
+    def apply(self, name):
+        try:
+            stylesheet = self.stylesheet(name)
+        except OSError as e:
+            print(f"{name}: {e}")
+            name, stylesheet = self.DEFAULT, self.stylesheet(self.DEFAULT)
+        QApplication.instance().setStyleSheet(stylesheet)
+        return name
+
+
+def set_dynamic_property(widget, name, value):
+    """Stil sayfasında kullanılan bir özelliği değiştirip yalnızca o widget'ı yeniden biçimle"""
+    if widget.property(name) != value:
+        widget.setProperty(name, value)
+        widget.style().unpolish(widget)
+        widget.style().polish(widget)
+# --- Temalar Sonu ---
+
+
+# --- Palet sağlık denetimi ve yeniden bağlama ---
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.ogg', '.oga', '.flac', '.m4a', '.aac', '.opus')
+RELINK_INDEX_PATH = os.path.join(CACHE_DIR, 'relink_index.json')
+# Yalnızca adıyla eşleşen dosyalar için onay sorusunda listelenen en fazla satır
+RELINK_CONFIRM_LIST = 10
+# Başlıktaki süreden bu kadar kısa çözülen dosya kesik sayılır
+TRUNCATED_TOLERANCE_SECONDS = 0.1
+
+
+def check_audio_file(path):
+    """Dosya çalınabilir görünüyorsa None, değilse sorunun kısa açıklamasını döndür"""
+    if not os.path.exists(path):
+        return "missing"
+    if not os.path.isfile(path) or not os.access(path, os.R_OK):
+        return "unreadable"
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(12)
+    except OSError:
+        return "unreadable"
+    if not header:
+        return "empty"
+    # Kapsayıcı imzaları, ardından çözmeden okunan başlık bilgisi: WAV veri bloğu
+    # ve Ogg akış sonu eksikse kesik, başlıktaki süre sıfırsa boş sayılır. Asıl
+    # çözme denemesini içe aktarma hattı yapar (bkz. check_decoded_clip).
+    if ((header[:4] == b'RIFF' and header[8:12] == b'WAVE') or header[:4] in (b'OggS', b'fLaC')
+            or header[:3] == b'ID3' or header[4:8] == b'ftyp'):
+        info = probe_metadata(path)
+        if info.get("truncated"):
+            return "truncated"
+        if info.get("duration") == 0:
+            return "empty"
+        return None
+    if header[0] == 0xFF and header[1] & 0xE0 == 0xE0:
+        return None
+    return "unknown format"
+
+
+def check_decoded_clip(clip, meta):
+    """Çözülen klip, dosya başlığındaki süreyi karşılıyorsa None, kısa kalıyorsa "truncated" """
+    expected = (meta or {}).get("duration")
+    if expected and clip.duration < expected - TRUNCATED_TOLERANCE_SECONDS:
+        return "truncated"
+    return None
+
+
+class PaletteHealthChecker(QObject):
+    """Palet dosyalarını eşzamanlı denetler; her dosyanın sonucu ayrı bildirilir"""
+    fileChecked = pyqtSignal(str, object)
+    finished = pyqtSignal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def check(self, paths):
+        paths = sorted(set(paths))
+        if not paths:
+            self.finished.emit([])
+            return
+        self._executor.submit(self._check_all, paths)
+
+    def _check_all(self, paths):
+        broken = []
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = {pool.submit(check_audio_file, path): path for path in paths}
+            for future in as_completed(futures):
+                problem = future.result()
+                if problem is not None:
+                    broken.append(futures[future])
+                self.fileChecked.emit(futures[future], problem)
+        self.finished.emit(broken)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class RelinkIndex:
+    """Arama köklerindeki ses dosyalarının ada göre dizini.
+
+    Dizin bir kez taranıp diske yazılır; yeniden bağlama her seferinde dosya
+    sistemini gezmek yerine bu dizine bakar. `max_age` saniyeden eskiyse ya da
+    kökler değiştiyse yeniden oluşturulur. Çalışırken değişen klasörler
+    `rescan_dir` ile tek tek güncellenir.
+    """
+
+    def __init__(self, roots, path=RELINK_INDEX_PATH):
+        self.roots = [os.path.abspath(os.path.expanduser(root)) for root in roots]
+        self.path = path
+        self.files = {}
+        self.dirs = []
+        self.built = 0.0
+
+    def load_or_build(self, max_age):
+        try:
+            with open(self.path, 'r') as f:
+                stored = json.load(f)
+            if stored["roots"] == self.roots and time.time() - stored["built"] < max_age:
+                self.files = stored["files"]
+                self.dirs = stored["dirs"]
+                self.built = stored["built"]
+                return
+        except (OSError, ValueError, KeyError):
+            pass
+        self.build()
+
+    def _add_tree(self, top):
+        dirs = set(self.dirs)
+        for dir_path, _, names in os.walk(top):
+            if dir_path not in dirs:
+                self.dirs.append(dir_path)
+            for name in names:
+                if name.lower().endswith(AUDIO_EXTENSIONS):
+                    full_path = os.path.join(dir_path, name)
+                    try:
+                        size = os.path.getsize(full_path)
+                    except OSError:
+                        continue
+                    self.files.setdefault(name.lower(), []).append([full_path, size])
+
+    def _drop(self, keep):
+        """Yolu `keep(klasör)` yanlış dönen dosyaları dizinden çıkar"""
+        files = {}
+        for name, found in self.files.items():
+            found = [item for item in found if keep(os.path.dirname(item[0]))]
+            if found:
+                files[name] = found
+        self.files = files
+
+    def build(self):
+        # Kökler henüz yoksa da izlensin; oluşturulunca taranır
+        self.files, self.dirs = {}, list(self.roots)
+        for root in self.roots:
+            self._add_tree(root)
+        self.built = time.time()
+        self.save()
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_file_atomic(self.path, json.dumps({"roots": self.roots, "built": self.built,
+                                                     "dirs": self.dirs, "files": self.files}))
+        except OSError as e:
+            print(f"{self.path}: {e}")
+
+    def rescan_dir(self, dir_path):
+        """Tek bir klasörü yeniden tara: yeni alt klasörler gezilir, silinenler düşer.
+
+        `built` değişmez; uygulama kapalıyken olan değişiklikler yine `max_age` ile yakalanır.
+        """
+        below = dir_path.rstrip(os.sep) + os.sep
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError:
+            entries = None
+        if entries is None:
+            # Klasör kaldırıldı ya da erişilemiyor: altındaki her şey düşer
+            self.dirs = [path for path in self.dirs if path in self.roots
+                         or (path != dir_path and not path.startswith(below))]
+            self._drop(lambda parent: parent != dir_path and not parent.startswith(below))
+            self.save()
+            return
+        subdirs = {entry.path for entry in entries if entry.is_dir(follow_symlinks=False)}
+        gone = [path for path in self.dirs
+                if os.path.dirname(path) == dir_path and path not in subdirs]
+        for path in gone:
+            gone_below = path + os.sep
+            self.dirs = [d for d in self.dirs if d != path and not d.startswith(gone_below)]
+            self._drop(lambda parent: parent != path and not parent.startswith(gone_below))
+        self._drop(lambda parent: parent != dir_path)
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                try:
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+                self.files.setdefault(entry.name.lower(), []).append([entry.path, size])
+        known = set(self.dirs)
+        for path in sorted(subdirs - known):
+            self._add_tree(path)
+        self.save()
+
+    def candidates(self, missing_path, size=None):
+        found = self.files.get(os.path.basename(missing_path).lower(), [])
+        return [path for path, candidate_size in found
+                if (size is None or candidate_size == size) and os.path.exists(path)]
+
+
+def find_relink_target(index, missing_path, size=None, digest=None):
+    """Kayıp dosyanın yerine geçecek dosyayı ad, boyut ve içerik özetiyle bul.
+
+    (yol, doğrulandı) ya da None döner. Boyutu da bilinmeyen dosyada tek aynı
+    adlı aday doğrulanmamış olarak döner; operatörün onayına sunulur.
+    """
+    candidates = index.candidates(missing_path, size)
+    if digest is not None:
+        for path in candidates:
+            try:
+                if hash_file(path) == digest:
+                    return path, True
+            except OSError:
+                continue
+        return None
+    # Özet bilinmiyorsa yalnızca tek aday kabul edilir
+    if len(candidates) != 1:
+        return None
+    return candidates[0], size is not None
+
+
+class Relinker(QObject):
+    """Kayıp dosyaları arka planda dizinden eşleştirir.
+
+    Dizin yalnızca tek yardımcı iş parçacığında tutulur ve güncellenir.
+    """
+    # {kayıp yol: (yeni yol, doğrulandı)} ve isteği yapanın verdiği bağlam
+    finished = pyqtSignal(dict, object)
+    # Dizindeki klasörlerin güncel listesi; kütüphane izlemesi için
+    indexChanged = pyqtSignal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._index = None
+
+    def _load_index(self, roots, max_age):
+        """Dizin yoksa, eskidiyse ya da kökler değiştiyse yükle; yüklendiyse True"""
+        index = RelinkIndex(roots)
+        if (self._index is not None and self._index.roots == index.roots
+                and time.time() - self._index.built < max_age):
+            return False
+        index.load_or_build(max_age)
+        self._index = index
+        return True
+
+    def watch(self, roots, max_age):
+        """Dizini yükle (gerekirse oluştur) ve klasörlerini bildir"""
+        self._executor.submit(self._watch, roots, max_age)
+
+    def _watch(self, roots, max_age):
+        self._load_index(roots, max_age)
+        self.indexChanged.emit(list(self._index.dirs))
+
+    def rescan(self, dir_path):
+        """Değişen bir kütüphane klasörünü dizinde güncelle"""
+        self._executor.submit(self._rescan, dir_path)
+
+    def _rescan(self, dir_path):
+        if self._index is None:
+            return
+        self._index.rescan_dir(dir_path)
+        self.indexChanged.emit(list(self._index.dirs))
+
+    def relink(self, missing, roots, max_age, context=None):
+        """`missing`: kayıp yol -> (boyut, özet) sözlüğü; ikisi de bilinmiyorsa None olabilir.
+
+        `context` sonuçla birlikte `finished` sinyaliyle geri verilir.
+        """
+        self._executor.submit(self._relink, dict(missing), roots, max_age, context)
+
+    def _relink(self, missing, roots, max_age, context):
+        if self._load_index(roots, max_age):
+            self.indexChanged.emit(list(self._index.dirs))
+        index = self._index
+        found = {}
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = {path: pool.submit(find_relink_target, index, path, size, digest)
+                       for path, (size, digest) in missing.items()}
+            for path, future in futures.items():
+                try:
+                    target = future.result()
+                except OSError:
+                    target = None
+                if target:
+                    found[path] = target
+        self.finished.emit(found, context)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+# --- Palet Sağlık Denetimi Sonu ---
+
+
+# --- Dosya izleme ---
+# inotify ağ paylaşımlarında yalnızca bu makinedeki yazmaları görür; bu türler yoklanır
+POLLED_FILESYSTEMS = ('nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'ncpfs', 'afs', 'ceph',
+                      'glusterfs', '9p', 'davfs', 'fuse')
+# Değişiklik bildirilmeden önce yolun değişmeden kalması gereken süre (ms)
+WATCH_SETTLE_MS = 500
+
+
+def read_mounts():
+    """/proc/mounts'taki (bağlama noktası, dosya sistemi türü) çiftleri, en uzun yol önce"""
+    mounts = []
+    try:
+        with open('/proc/mounts', 'r') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3:
+                    # Boşluk gibi karakterler sekizlik kaçışla yazılır (\040)
+                    point = re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), fields[1])
+                    mounts.append((point, fields[2]))
+    except OSError:
+        pass
+    return sorted(mounts, key=lambda mount: len(mount[0]), reverse=True)
+
+
+def needs_polling(path, mounts):
+    """Yol, inotify'ın uzak değişiklikleri görmediği bir dosya sistemindeyse True"""
+    for point, fs_type in mounts:
+        if path == point or path.startswith(point.rstrip('/') + '/'):
+            return fs_type.split('.')[0] in POLLED_FILESYSTEMS
+    return False
+
+
+def _watch_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    # Üzerine taşınan dosya, boyutu ve zamanı korunsa da yeni bir inode alır
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+class FileWatcher(QObject):
+    """Dosya ve klasörleri izler; her değişiklik, yazma bitince bir kez bildirilir.
+
+    Yerel dosya sistemlerinde QFileSystemWatcher (Linux'ta inotify) kullanılır; ağ
+    paylaşımlarındaki ve izlenemeyen yollar `poll_interval_ms` aralıkla yoklanır.
+    Üzerine taşınarak yazılan dosyanın izlemesi düştüğü için klasörü de izlenir.
+    Bütün stat çağrıları yardımcı iş parçacığında yapılır; takılan bir paylaşım
+    arayüzü dondurmaz.
+    """
+    fileChanged = pyqtSignal(str)
+    fileRemoved = pyqtSignal(str)
+    directoryChanged = pyqtSignal(str)
+    # Yardımcı iş parçacığından: (amaç, yol -> durum)
+    _stated = pyqtSignal(str, dict)
+
+    _UNSEEN = object()
+
+    def __init__(self, poll_interval_ms, parent=None):
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._mark)
+        self._watcher.directoryChanged.connect(self._mark)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._files = set()
+        self._by_dir = {}
+        self._library = set()
+        self._known = {}
+        self._polled_paths = set()
+        self._dirty = {}
+        self._checking = False
+        self._polling = False
+        self._stated.connect(self._on_stated)
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(WATCH_SETTLE_MS)
+        self._settle_timer.timeout.connect(self._check_dirty)
+        self._poll_timer = QTimer(self)
+        self._poll_timer.timeout.connect(self._poll)
+        self._poll_timer.start(poll_interval_ms)
+
+    def set_files(self, paths):
+        """İzlenecek dosyalar; bulundukları klasörler de izlenir"""
+        self._files = {path for path in paths if path}
+        self._by_dir = {}
+        for path in self._files:
+            if os.path.dirname(path):
+                self._by_dir.setdefault(os.path.dirname(path), set()).add(path)
+        self._sync()
+
+    def set_directories(self, dirs):
+        """İzlenecek kütüphane klasörleri; değişen klasörün kendisi bildirilir"""
+        self._library = set(dirs)
+        self._sync()
+
+    def polled_paths(self):
+        return set(self._polled_paths)
+
+    def _sync(self):
+        wanted = self._files | set(self._by_dir) | self._library
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        if watched - wanted:
+            self._watcher.removePaths(list(watched - wanted))
+        mounts = read_mounts()
+        local = [path for path in wanted - watched if not needs_polling(path, mounts)]
+        if local:
+            self._watcher.addPaths(local)
+        # Eklenemeyenler (yok, izin yok, inotify sınırı dolu) ve ağ yolları yoklanır
+        self._polled_paths = wanted - set(self._watcher.files()) - set(self._watcher.directories())
+        self._known = {path: key for path, key in self._known.items() if path in wanted}
+        new = [path for path in wanted if path not in self._known]
+        if new:
+            self._submit("new", new)
+
+    def _submit(self, purpose, paths):
+        self._executor.submit(lambda: self._stated.emit(purpose, {path: _watch_key(path)
+                                                                  for path in paths}))
+
+    def _mark(self, path):
+        self._dirty[path] = self._UNSEEN
+        for file_path in self._by_dir.get(path, ()):
+            self._dirty[file_path] = self._UNSEEN
+        self._settle_timer.start()
+
+    def _poll(self):
+        if self._polling or not self._polled_paths:
+            return
+        self._polling = True
+        self._submit("poll", list(self._polled_paths))
+
+    def _check_dirty(self):
+        if self._checking or not self._dirty:
+            return
+        self._checking = True
+        self._submit("settle", list(self._dirty))
+
+    def _on_stated(self, purpose, keys):
+        if purpose == "new":
+            for path, key in keys.items():
+                self._known.setdefault(path, key)
+            return
+        if purpose == "poll":
+            self._polling = False
+            for path, key in keys.items():
+                # Yerleşmesi beklenen yol yeniden işaretlenmez; yoksa hiç yerleşmez
+                if path in self._known and self._known[path] != key and path not in self._dirty:
+                    self._mark(path)
+            return
+
+        self._checking = False
+        reported = False
+        for path, key in keys.items():
+            if path not in self._dirty:
+                continue
+            seen = self._dirty[path]
+            if seen is self._UNSEEN or seen != key:
+                # Hâlâ yazılıyor ya da kontrol sırasında yeni olay geldi
+                self._dirty[path] = key
+            else:
+                del self._dirty[path]
+                reported |= self._report(path, key)
+        if reported:
+            # Üzerine taşınan ya da yeniden beliren dosyaların izlemesini yenile
+            self._sync()
+        if self._dirty:
+            self._settle_timer.start()
+
+    def _report(self, path, key):
+        if path not in self._known:
+            self._known[path] = key
+            return False
+        if self._known[path] == key:
+            return False
+        self._known[path] = key
+        if path in self._files:
+            (self.fileRemoved if key is None else self.fileChanged).emit(path)
+        if path in self._library:
+            self.directoryChanged.emit(path)
+        return True
+
+    def shutdown(self):
+        self._poll_timer.stop()
+        self._settle_timer.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+# --- Dosya İzleme Sonu ---
+
+
+# --- Sürükle-bırak içe aktarma ve üst veri yoklama ---
+def expand_audio_paths(paths):
+    """Bırakılan dosya ve klasörleri sıralı ses dosyası listesine aç"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dir_path, dir_names, names in os.walk(path):
+                dir_names.sort()
+                files.extend(os.path.join(dir_path, name) for name in sorted(names)
+                             if name.lower().endswith(AUDIO_EXTENSIONS))
+        elif os.path.isfile(path) and path.lower().endswith(AUDIO_EXTENSIONS):
+            files.append(path)
+    return files
+
+
+def _decode_tag_text(data):
+    encoding = {0: 'latin-1', 1: 'utf-16', 2: 'utf-16-be', 3: 'utf-8'}.get(data[:1][0] if data else 0)
+    return data[1:].decode(encoding or 'latin-1', 'replace').strip('\x00').strip()
+
+
+def _read_id3v2(f):
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b'ID3':
+        return {}
+    version = header[3]
+    size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+    data = f.read(size)
+    tags = {}
+    names = {b'TIT2': 'title', b'TPE1': 'artist', b'TALB': 'album'}
+    pos = 0
+    while pos + 10 <= len(data) and data[pos:pos + 4].strip(b'\x00'):
+        frame_id = data[pos:pos + 4]
+        raw_size = data[pos + 4:pos + 8]
+        if version >= 4:
+            frame_size = (raw_size[0] << 21) | (raw_size[1] << 14) | (raw_size[2] << 7) | raw_size[3]
+        else:
+            frame_size = int.from_bytes(raw_size, 'big')
+        if frame_id in names:
+            tags[names[frame_id]] = _decode_tag_text(data[pos + 10:pos + 10 + frame_size])
+        pos += 10 + frame_size
+    return tags
+
+
+def _parse_vorbis_comments(data):
+    tags = {}
+    try:
+        vendor_length = int.from_bytes(data[0:4], 'little')
+        pos = 4 + vendor_length
+        count = int.from_bytes(data[pos:pos + 4], 'little')
+        pos += 4
+        for _ in range(count):
+            length = int.from_bytes(data[pos:pos + 4], 'little')
+            key, _, value = data[pos + 4:pos + 4 + length].decode('utf-8', 'replace').partition('=')
+            pos += 4 + length
+            if key.lower() in ('title', 'artist', 'album'):
+                tags[key.lower()] = value
+    except (IndexError, ValueError):
+        pass
+    return tags
+
+
+def _probe_flac(f, info):
+    f.seek(4)
+    last = False
+    while not last:
+        header = f.read(4)
+        if len(header) < 4:
+            break
+        last = bool(header[0] & 0x80)
+        block_type = header[0] & 0x7F
+        block = f.read(int.from_bytes(header[1:4], 'big'))
+        if block_type == 0 and len(block) >= 18:
+            bits = int.from_bytes(block[10:18], 'big')
+            rate = bits >> 44
+            channels = ((bits >> 41) & 0x07) + 1
+            total = bits & 0xFFFFFFFFF
+            info["format"] = f"FLAC {rate} Hz {channels} ch"
+            if rate and total:
+                info["duration"] = total / float(rate)
+        elif block_type == 4:
+            info.update(_parse_vorbis_comments(block))
+
+
+def _probe_ogg(f, info):
+    head = f.read(1 << 16)
+    rate = None
+    if b'\x01vorbis' in head:
+        pos = head.index(b'\x01vorbis')
+        rate = int.from_bytes(head[pos + 12:pos + 16], 'little')
+        info["format"] = f"Ogg Vorbis {rate} Hz"
+        comments = head.find(b'\x03vorbis')
+        if comments >= 0:
+            info.update(_parse_vorbis_comments(head[comments + 7:]))
+    elif b'OpusHead' in head:
+        rate = 48000
+        info["format"] = "Ogg Opus"
+        comments = head.find(b'OpusTags')
+        if comments >= 0:
+            info.update(_parse_vorbis_comments(head[comments + 8:]))
+    # Süre, son sayfanın granül konumundan
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(max(0, size - (1 << 16)))
+    tail = f.read()
+    last_page = tail.rfind(b'OggS')
+    if rate and last_page >= 0 and last_page + 14 <= len(tail):
+        granule = int.from_bytes(tail[last_page + 6:last_page + 14], 'little')
+        info["duration"] = granule / float(rate)
+        # Son sayfada akış sonu işareti yoksa dosya yarıda kesilmiştir
+        if not tail[last_page + 5] & 0x04:
+            info["truncated"] = True
+
+
+def _probe_wav(path, info):
+    with wave.open(path, 'rb') as wav:
+        info["format"] = f"WAV {wav.getframerate()} Hz {wav.getnchannels()} ch {wav.getsampwidth() * 8} bit"
+        info["duration"] = wav.getnframes() / float(wav.getframerate())
+    # RIFF LIST/INFO etiketleri
+    names = {b'INAM': 'title', b'IART': 'artist', b'IPRD': 'album'}
+    with open(path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        f.seek(12)
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            chunk_size = int.from_bytes(header[4:8], 'little')
+            if header[:4] == b'LIST':
+                data = f.read(chunk_size)
+                if data[:4] == b'INFO':
+                    pos = 4
+                    while pos + 8 <= len(data):
+                        sub_size = int.from_bytes(data[pos + 4:pos + 8], 'little')
+                        if data[pos:pos + 4] in names:
+                            info[names[data[pos:pos + 4]]] = data[pos + 8:pos + 8 + sub_size] \
+                                .split(b'\x00')[0].decode('latin-1')
+                        pos += 8 + sub_size + (sub_size & 1)
+            elif header[:4] == b'data':
+                # Akış halinde yazılan dosyalar boyutu 0xFFFFFFFF bırakır
+                if chunk_size != 0xFFFFFFFF and f.tell() + chunk_size > file_size:
+                    info["truncated"] = True
+                f.seek(chunk_size, os.SEEK_CUR)
+            else:
+                f.seek(chunk_size, os.SEEK_CUR)
+            if chunk_size & 1:
+                f.seek(1, os.SEEK_CUR)
+
+
+def probe_metadata(path):
+    """Dosyayı çözmeden biçim, süre ve etiket bilgilerini oku"""
+    info = {"format": os.path.splitext(path)[1].lstrip('.').upper()}
+    try:
+        with open(path, 'rb') as f:
+            magic = f.read(4)
+            f.seek(0)
+            if magic == b'fLaC':
+                _probe_flac(f, info)
+            elif magic == b'OggS':
+                _probe_ogg(f, info)
+            elif magic[:3] == b'ID3':
+                info["format"] = "MP3"
+                info.update(_read_id3v2(f))
+        if magic == b'RIFF':
+            _probe_wav(path, info)
+    except (OSError, EOFError, wave.Error, ValueError, IndexError) as e:
+        info["error"] = str(e)
+    return info
+
+
+class MetadataProber(QObject):
+    """Dosyaları iş parçacığı havuzunda yoklar; sonuçlar geldikçe tek tek bildirilir"""
+    probed = pyqtSignal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=8)
+
+    def probe(self, path):
+        future = self._executor.submit(probe_metadata, path)
+        future.add_done_callback(lambda fut, path=path: fut.cancelled() or self.probed.emit(path, fut.result()))
+
+    def expand(self, paths, callback):
+        """Klasör taramasını GUI dışında yap; `callback(files)` ana iş parçacığına kuyruklanır"""
+        relay = _ExpandRelay(self)
+        relay.expanded.connect(callback)
+        relay.expanded.connect(relay.deleteLater)
+        self._executor.submit(lambda: relay.expanded.emit(expand_audio_paths(paths)))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _ExpandRelay(QObject):
+    expanded = pyqtSignal(list)
+# --- Sürükle-Bırak Sonu ---
+
+
+# --- Bus faderleri ve buton seviyesi ---
+class BusFaderWindow(QWidget):
+    """Her bus için dikey fader; değer değiştikçe `levelChanged(bus, dB)` yayınlanır"""
+    levelChanged = pyqtSignal(str, float)
+    closed = pyqtSignal()
+
+    def __init__(self, levels, parent=None):
+        super().__init__(parent, Qt.Window)
+        layout = QHBoxLayout(self)
+        self._values = {}
+        for bus, level_db in levels.items():
+            column = QVBoxLayout()
+            value = QLabel()
+            value.setAlignment(Qt.AlignCenter)
+            slider = QSlider(Qt.Vertical)
+            slider.setRange(BUS_FADER_MIN_DB, BUS_FADER_MAX_DB)
+            slider.setValue(int(round(level_db)))
+            slider.valueChanged.connect(lambda level_db, bus=bus: self._on_moved(bus, level_db))
+            name = QLabel(bus)
+            name.setAlignment(Qt.AlignCenter)
+            column.addWidget(value)
+            column.addWidget(slider, 1, Qt.AlignHCenter)
+            column.addWidget(name)
+            layout.addLayout(column)
+            self._values[bus] = value
+            self._show_value(bus, slider.value())
+
+    def _show_value(self, bus, level_db):
+        self._values[bus].setText("-\u221E" if level_db <= BUS_FADER_MIN_DB else f"{level_db:+d} dB")
+
+    def _on_moved(self, bus, level_db):
+        self._show_value(bus, level_db)
+        self.levelChanged.emit(bus, float(level_db))
+
+    def closeEvent(self, event):
+        self.closed.emit()
+        super().closeEvent(event)
+
+
+class ButtonMixDialog(QDialog):
+    """Butonun seviye, pan ve bus ayarları"""
+
+    def __init__(self, state, buses, labels, parent=None):
+        super().__init__(parent)
+        layout = QFormLayout(self)
+        self.gain = QDoubleSpinBox()
+        self.gain.setRange(-30.0, 12.0)
+        self.gain.setSingleStep(0.5)
+        self.gain.setSuffix(" dB")
+        self.gain.setValue(state["gain_db"])
+        self.pan = QDoubleSpinBox()
+        self.pan.setRange(-1.0, 1.0)
+        self.pan.setSingleStep(0.1)
+        self.pan.setValue(state["pan"])
+        self.bus = QComboBox()
+        self.bus.addItems(buses)
+        if state["bus"] not in buses:
+            self.bus.addItem(state["bus"])
+        self.bus.setCurrentText(state["bus"])
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(labels['mix_gain'], self.gain)
+        layout.addRow(labels['mix_pan'], self.pan)
+        layout.addRow(labels['mix_bus'], self.bus)
+        layout.addRow(buttons)
+
+    def values(self):
+        return dict(gain_db=self.gain.value(), pan=self.pan.value(), bus=self.bus.currentText())
+# --- Bus Faderleri Sonu ---
+
+
+# --- Dalga biçimi düzenleyici ---
+class WaveformView(QWidget):
+    """Tepe piramidinden çizilen, tekerlekle yakınlaşan ve sürüklenerek kaydırılan dalga biçimi.
+
+    Sütun başına PEAK_BASE_BLOCK kareden az düşünce önbellekteki PCM'den doğrudan
+    okunur; ses hiçbir yakınlaştırmada yeniden çözülmez.
+    """
+    cursorMoved = pyqtSignal(int)
+    previewRequested = pyqtSignal(int)
+
+    ZOOM_STEP = 1.25
+    MIN_FRAMES_PER_PIXEL = 1.0 / 16
+
+    def __init__(self, clip, parent=None):
+        super().__init__(parent)
+        self.clip = clip
+        self.pyramid = None
+        self.start = 0.0
+        self.frames_per_pixel = None
+        self.cursor = 0
+        self.markers = [None, None]
+        self._drag_x = None
+        self._dragged = False
+        self.setMinimumSize(400, 160)
+        self.setFocusPolicy(Qt.StrongFocus)
+
+    def _fit(self):
+        return max(self.clip.frames / max(self.width(), 1), self.MIN_FRAMES_PER_PIXEL)
+
+    def _clamp(self):
+        self.frames_per_pixel = min(max(self.frames_per_pixel, self.MIN_FRAMES_PER_PIXEL), self._fit())
+        visible = self.frames_per_pixel * self.width()
+        self.start = min(max(self.start, 0.0), max(self.clip.frames - visible, 0.0))
+
+    def frame_at(self, x):
+        return int(min(max(self.start + x * self.frames_per_pixel, 0), self.clip.frames))
+
+    def x_of(self, frame):
+        return (frame - self.start) / self.frames_per_pixel
+
+    def resizeEvent(self, event):
+        if self.frames_per_pixel is None:
+            self.frames_per_pixel = self._fit()
+        self._clamp()
+        super().resizeEvent(event)
+
+    def _columns(self, width):
+        """Görünen her piksel sütunu için (min, maks)"""
+        if self.frames_per_pixel >= PEAK_BASE_BLOCK:
+            return self.pyramid.columns(self.start, self.frames_per_pixel, width)
+        first = int(self.start)
+        last = min(int(self.start + self.frames_per_pixel * width) + 1, self.clip.frames)
+        samples = self.clip.data[first:last].astype(np.float32)
+        if self.clip.offset:
+            samples -= self.clip.offset
+        samples *= self.clip.scale
+        low, high = samples[:, 0].copy(), samples[:, 0].copy()
+        for channel in range(1, samples.shape[1]):
+            np.minimum(low, samples[:, channel], out=low)
+            np.maximum(high, samples[:, channel], out=high)
+        if not len(low):
+            return low, high
+        starts = np.clip((np.arange(width) * self.frames_per_pixel).astype(np.int64), 0, len(low) - 1)
+        return np.minimum.reduceat(low, starts), np.maximum.reduceat(high, starts)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#101418"))
+        middle = self.height() / 2.0
+        if self.pyramid is None and self.frames_per_pixel >= PEAK_BASE_BLOCK:
+            painter.setPen(QColor("#808890"))
+            painter.drawText(self.rect(), Qt.AlignCenter, "\u2026")
+            return
+
+        painter.setPen(QColor("#5fa686"))
+        if self.frames_per_pixel < 1:
+            # Örnek düzeyi: tek tek örnekleri birleştir
+            first = int(self.start)
+            count = min(int(self.width() * self.frames_per_pixel) + 2, self.clip.frames - first)
+            samples = self.clip.data[first:first + count].astype(np.float32).mean(axis=1)
+            samples = (samples - self.clip.offset) * self.clip.scale
+            painter.drawPolyline(QPolygonF([QPointF(self.x_of(first + i), middle - value * middle)
+                                            for i, value in enumerate(samples)]))
+        else:
+            low, high = self._columns(self.width())
+            painter.drawLines([QLineF(x, middle - high[x] * middle, x, middle - low[x] * middle)
+                               for x in range(len(low))])
+
+        for frame, color in zip(self.markers, ("#3c9cff", "#ff9c3c")):
+            if frame is not None:
+                painter.setPen(QColor(color))
+                x = self.x_of(frame)
+                painter.drawLine(QLineF(x, 0, x, self.height()))
+        painter.setPen(QColor("#ffffff"))
+        x = self.x_of(self.cursor)
+        painter.drawLine(QLineF(x, 0, x, self.height()))
+
+    def wheelEvent(self, event):
+        x = event.pos().x()
+        anchor = self.start + x * self.frames_per_pixel
+        factor = self.ZOOM_STEP ** (-event.angleDelta().y() / 120.0)
+        self.frames_per_pixel *= factor
+        self.start = anchor - x * self.frames_per_pixel
+        self._clamp()
+        self.update()
+
+    def mousePressEvent(self, event):
+        self._drag_x = event.pos().x()
+        self._dragged = False
+
+    def mouseMoveEvent(self, event):
+        if self._drag_x is None:
+            return
+        dx = event.pos().x() - self._drag_x
+        if dx:
+            self._dragged = True
+            self._drag_x = event.pos().x()
+            self.start -= dx * self.frames_per_pixel
+            self._clamp()
+            self.update()
+
+    def mouseReleaseEvent(self, event):
+        if not self._dragged:
+            self.cursor = self.frame_at(event.pos().x())
+            self.cursorMoved.emit(self.cursor)
+            self.update()
+        self._drag_x = None
+
+    def mouseDoubleClickEvent(self, event):
+        self.previewRequested.emit(self.frame_at(event.pos().x()))
+
+
+class WaveformEditor(QWidget):
+    """Bir butonun dosyasını gösterip başlangıç/bitiş işaretlerini ayarlatan pencere"""
+    markersChanged = pyqtSignal(object, object)
+    previewRequested = pyqtSignal(int)
+    pyramidReady = pyqtSignal(object)
+
+    def __init__(self, clip, start, end, labels, parent=None):
+        super().__init__(parent, Qt.Window)
+        self.clip = clip
+        self.labels = labels
+        self.resize(900, 260)
+        self.view = WaveformView(clip)
+        rate = clip.spec[0]
+        self.view.markers = [None if start is None else int(start * rate),
+                             None if end is None else int(end * rate)]
+        self.view.cursorMoved.connect(lambda frame: self._show_position())
+        self.view.previewRequested.connect(self.previewRequested)
+        self.position = QLabel()
+        set_start = QPushButton(labels['waveform_set_start'])
+        set_start.clicked.connect(lambda: self._set_marker(0))
+        set_end = QPushButton(labels['waveform_set_end'])
+        set_end.clicked.connect(lambda: self._set_marker(1))
+        clear = QPushButton(labels['waveform_clear'])
+        clear.clicked.connect(self._clear_markers)
+        preview = QPushButton(labels['waveform_preview'])
+        preview.clicked.connect(lambda: self.previewRequested.emit(self.view.cursor))
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.position, 1)
+        for button in (set_start, set_end, clear, preview):
+            controls.addWidget(button)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.view, 1)
+        layout.addLayout(controls)
+        self._show_position()
+
+        # Eski önbellek kayıtlarında tepe dosyası yoksa arka planda bir kez üretilir
+        self.pyramidReady.connect(self._on_pyramid_ready)
+        path = peaks_path(clip.meta)
+        if os.path.exists(path):
+            self._on_pyramid_ready(path)
+        else:
+            threading.Thread(target=self._build, args=(path,), daemon=True).start()
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+    def _build(self, path):
+        try:
+            build_peak_pyramid(self.clip.data, path, self.clip.scale, self.clip.offset)
+        except OSError:
+            return
+        self.pyramidReady.emit(path)
 
-        rect = self.rect()
-        bar_height = int(rect.height() * self._level)
-        
-        painter.setBrush(QColor(self.bar_color))
-        painter.setPen(Qt.NoPen)
-        painter.drawRect(rect.left(), rect.bottom() - bar_height, rect.width(), bar_height)
+    def _on_pyramid_ready(self, path):
+        self.view.pyramid = PeakPyramid(path, self.clip.frames)
+        self.view.update()
 
-        if self._peak_hold_level > 0.0:
-            peak_pixel_height = 2
-            peak_y_pos = int(rect.height() * (1 - self._peak_hold_level))
-            
-            painter.setBrush(QColor(255, 255, 0, 200))
-            painter.drawRect(rect.left(), peak_y_pos, rect.width(), peak_pixel_height)
+    def _seconds(self, frame):
+        return None if frame is None else frame / float(self.clip.spec[0])
 
-        super().paintEvent(event)
-# --- VU Meter Sınıfı Sonu ---
+    def _show_position(self):
+        parts = [f"{self.labels['waveform_cursor']}: {self._seconds(self.view.cursor):.3f} s"]
+        for name, frame in zip(("waveform_start", "waveform_end"), self.view.markers):
+            if frame is not None:
+                parts.append(f"{self.labels[name]}: {self._seconds(frame):.3f} s")
+        self.position.setText("   ".join(parts))
+
+    def _set_marker(self, index):
+        self.view.markers[index] = self.view.cursor
+        self._markers_changed()
+
+    def _clear_markers(self):
+        self.view.markers = [None, None]
+        self._markers_changed()
+
+    def _markers_changed(self):
+        self.view.update()
+        self._show_position()
+        self.markersChanged.emit(*(self._seconds(frame) for frame in self.view.markers))
+# --- Dalga Biçimi Düzenleyici Sonu ---
 
 # Ana pencereyi oluşturacak QMainWindow sınıfı
 class JingleBox(QMainWindow):
@@ -74,12 +4194,18 @@ class JingleBox(QMainWindow):
         super().__init__()
         self.button_states = {}
         self.button_map = {}
+        self.button_positions = {}
+        # Açık paletler sekme sırasıyla; button_states ve palette_journal geçerli paletinkilerdir
+        self.palettes = []
+        self.palette = None
+        self.palette_journal = None
+        self.clip_cache = ClipCache()
         self.last_clicked_button = None
-        self.media_player = QMediaPlayer()
         self.active_button = None
+        self.active_palette = None
         self.icon_path = None
-        self.left_vu_meter = None
-        self.right_vu_meter = None
+        self.vu_meter = None
+        self.settings = load_settings()
         
         # Dil ayarları ve sözlük
         self.current_lang = 'tr'
@@ -88,8 +4214,13 @@ class JingleBox(QMainWindow):
                 'menu_file': 'Dosya',
                 'menu_open': 'Aç',
                 'menu_save': 'Kaydet',
+                'menu_new_palette': 'Yeni Palet',
+                'menu_close_palette': 'Paleti Kapat',
                 'menu_help': 'Yardım',
                 'menu_about': 'Hakkında',
+                'audio_ready': '\u25CF Ses hazır',
+                'message_stall': 'Arayüz takıldı',
+                'audio_not_ready': '\u25CB Ses aygıtı hazırlanıyor',
                 'button_empty': 'Boş',
                 'button_stop': 'DUR',
                 'button_save_palette': 'Bu Paleti Kaydet',
@@ -97,7 +4228,7 @@ class JingleBox(QMainWindow):
                 'context_assign': 'Ses Ata',
                 'context_delete': 'Sil',
                 'dialog_select_file': 'Ses Dosyası Seç',
-                'dialog_file_filter_audio': 'Ses Dosyaları (*.mp3 *.wav *.ogg);;Tüm Dosyalar (*)',
+                'dialog_file_filter_audio': 'Ses Dosyaları (*.mp3 *.wav *.ogg *.oga *.flac *.m4a *.aac *.opus);;Tüm Dosyalar (*)',
                 'dialog_save_palette': 'Paleti Kaydet',
                 'dialog_load_palette': 'Palet Yükle',
                 'message_no_sound': 'Bu butona atanmış bir ses dosyası yok.',
@@ -110,6 +4241,97 @@ class JingleBox(QMainWindow):
                 'message_loaded_success': 'Palet başarıyla yüklendi.',
                 'message_load_error': 'Palet yüklenirken bir hata oluştu.',
                 'message_invalid_data': 'Hatalı veri',
+                'message_not_ready': 'Ses dosyası henüz hazırlanıyor',
+                'message_import_error': 'Ses dosyası içe aktarılamadı',
+                'context_skip_silence': 'Baştaki sessizliği atla',
+                'tooltip_trimmed': 'Baştaki sessizlik atlanıyor',
+                'context_mix': 'Seviye, pan ve bus...',
+                'context_waveform': 'Dalga biçimi ve işaretler...',
+                'waveform_set_start': 'Başlangıcı buraya koy',
+                'waveform_set_end': 'Bitişi buraya koy',
+                'waveform_clear': 'İşaretleri temizle',
+                'waveform_preview': 'Buradan dinle',
+                'waveform_cursor': 'İmleç',
+                'waveform_start': 'Başlangıç',
+                'waveform_end': 'Bitiş',
+                'tooltip_markers': 'İşaretler',
+                'mix_gain': 'Seviye',
+                'mix_pan': 'Pan',
+                'mix_bus': 'Bus',
+                'menu_bus_faders': 'Bus Faderleri',
+                'context_loop': 'Döngü',
+                'loop_off': 'Kapalı',
+                'loop_file': 'Tüm dosya',
+                'loop_markers': 'Sıfır geçişli işaretler',
+                'tooltip_loop': 'Döngü',
+                'message_loop_release': 'Döngü bu turun sonunda duracak',
+                'context_retrigger': 'Yeniden basınca',
+                'retrigger_restart': 'Baştan başlat',
+                'retrigger_toggle': 'Çalıyorsa durdur',
+                'retrigger_overlap': 'Üst üste çal',
+                'retrigger_ignore': 'Çalıyorsa yok say',
+                'message_session_restored': 'Son oturum geri yüklendi',
+                'menu_show': 'Gösteri',
+                'menu_load_cues': 'İşaret Listesi Aç',
+                'menu_start_show': 'Gösteriyi Başlat',
+                'menu_stop_show': 'Gösteriyi Durdur',
+                'menu_aircheck': 'Yayın Kaydı',
+                'menu_asrun': 'Yayın Geçmişi',
+                'menu_soak': 'Stres Testi',
+                'menu_limiter': 'Sınırlayıcı',
+                'menu_cue_output': 'Ön Dinleme Çıkışı',
+                'cue_null_output': 'Boş çıkış (sessiz)',
+                'context_prelisten': 'Ön dinle',
+                'message_cue_output': 'Ön dinleme çıkışı',
+                'message_prelisten': 'Ön dinleniyor',
+                'message_prelisten_stopped': 'Ön dinleme durdu',
+                'menu_limiter_ceiling': 'Sınırlayıcı Tavanı',
+                'message_limiter_on': 'Ana bus sınırlayıcısı açık',
+                'message_limiter_off': 'Ana bus sınırlayıcısı kapalı',
+                'message_limiter_ceiling': 'Sınırlayıcı tavanı',
+                'message_soak_started': 'Stres testi başladı (tetikleme/sn, saat)',
+                'message_soak_sample': 'Stres testi',
+                'message_soak_finished': 'Stres testi bitti, tetikleme sayısı',
+                'message_soak_problem': 'Gerileme',
+                'asrun_file_filter': 'Dosya adında ara',
+                'asrun_refresh': 'Yenile',
+                'asrun_export': 'CSV Olarak Dışa Aktar',
+                'asrun_started': 'Başlangıç',
+                'asrun_duration': 'Süre',
+                'asrun_file_path': 'Dosya',
+                'asrun_button': 'Buton',
+                'asrun_source': 'Kaynak',
+                'asrun_stopped_early': 'Erken durduruldu',
+                'message_asrun_failed': 'Yayın geçmişi yazılamadı',
+                'message_asrun_exported': 'Yayın geçmişi dışa aktarıldı',
+                'message_aircheck_started': 'Yayın kaydı başladı',
+                'message_aircheck_stopped': 'Yayın kaydı durdu',
+                'message_aircheck_file': 'Yayın kaydı dosyası tamamlandı',
+                'message_aircheck_failed': 'Yayın kaydı yazılamadı',
+                'message_aircheck_dropped': 'Disk yetişemediği için kayda girmeyen süre',
+                'dialog_load_cues': 'İşaret Listesi Aç',
+                'message_no_cues': 'Yüklü bir işaret listesi yok.',
+                'message_cues_loaded': 'İşaret listesi yüklendi',
+                'message_cue_skipped': 'İşaret atlandı, buton hazır değil',
+                'message_cue_fired': 'İşaret başladı',
+                'message_cue_missed': 'İşaret kaçırıldı',
+                'message_show_started': 'Gösteri başladı',
+                'message_show_finished': 'Gösteri bitti',
+                'message_jitter': 'sapma',
+                'menu_view': 'Görünüm',
+                'menu_spectrum': 'Spektrum Analizörü',
+                'menu_theme': 'Tema',
+                'menu_relink': 'Kayıp Dosyaları Yeniden Bağla',
+                'tooltip_problem': 'Sorun',
+                'tooltip_duration': 'Süre',
+                'message_broken_files': 'Sorunlu ses dosyası sayısı',
+                'message_relink_question': 'Paletteki bazı ses dosyaları bulunamadı. Arama klasörlerinde otomatik olarak aransın mı?',
+                'message_relinked': 'Yeniden bağlanan dosya sayısı',
+                'message_relink_confirm': 'Şu dosyalar yalnızca adlarıyla eşleşti (boyut ve içerik bilinmiyor). Yeniden bağlansın mı?',
+                'message_file_changed': 'Dosya değişti, yeniden analiz ediliyor',
+                'message_file_removed': 'Dosya kaldırıldı',
+                'message_dropped': 'Bırakılan dosyalardan atanan sayısı',
+                'message_no_free_slots': 'Boş buton kalmadığı için eklenemeyen dosya sayısı',
                 'about_title': 'Jingle Box Hakkında',
                 'about_version': 'Versiyon',
                 'about_license': 'Lisans',
@@ -123,8 +4345,13 @@ class JingleBox(QMainWindow):
                 'menu_file': 'File',
                 'menu_open': 'Open',
                 'menu_save': 'Save',
+                'menu_new_palette': 'New Palette',
+                'menu_close_palette': 'Close Palette',
                 'menu_help': 'Help',
                 'menu_about': 'About',
+                'audio_ready': '\u25CF Audio ready',
+                'message_stall': 'User interface stalled',
+                'audio_not_ready': '\u25CB Preparing audio device',
                 'button_empty': 'Empty',
                 'button_stop': 'STOP',
                 'button_save_palette': 'Save This Palette',
@@ -132,7 +4359,7 @@ class JingleBox(QMainWindow):
                 'context_assign': 'Assign Sound',
                 'context_delete': 'Delete',
                 'dialog_select_file': 'Select Sound File',
-                'dialog_file_filter_audio': 'Audio Files (*.mp3 *.wav *.ogg);;All Files (*)',
+                'dialog_file_filter_audio': 'Audio Files (*.mp3 *.wav *.ogg *.oga *.flac *.m4a *.aac *.opus);;All Files (*)',
                 'dialog_save_palette': 'Save Palette',
                 'dialog_load_palette': 'Load Palette',
                 'message_no_sound': 'No sound file is assigned to this button.',
@@ -145,6 +4372,97 @@ class JingleBox(QMainWindow):
                 'message_loaded_success': 'Palette successfully loaded.',
                 'message_load_error': 'An error occurred while loading the palette.',
                 'message_invalid_data': 'Invalid data',
+                'message_not_ready': 'Sound file is still being prepared',
+                'message_import_error': 'Sound file could not be imported',
+                'context_skip_silence': 'Skip leading silence',
+                'tooltip_trimmed': 'Leading silence is skipped',
+                'context_mix': 'Level, pan and bus...',
+                'context_waveform': 'Waveform and markers...',
+                'waveform_set_start': 'Set start here',
+                'waveform_set_end': 'Set end here',
+                'waveform_clear': 'Clear markers',
+                'waveform_preview': 'Preview from here',
+                'waveform_cursor': 'Cursor',
+                'waveform_start': 'Start',
+                'waveform_end': 'End',
+                'tooltip_markers': 'Markers',
+                'mix_gain': 'Level',
+                'mix_pan': 'Pan',
+                'mix_bus': 'Bus',
+                'menu_bus_faders': 'Bus Faders',
+                'context_loop': 'Loop',
+                'loop_off': 'Off',
+                'loop_file': 'Whole file',
+                'loop_markers': 'Zero-crossing markers',
+                'tooltip_loop': 'Loop',
+                'message_loop_release': 'Loop will stop at the end of this pass',
+                'context_retrigger': 'On retrigger',
+                'retrigger_restart': 'Restart',
+                'retrigger_toggle': 'Stop if playing',
+                'retrigger_overlap': 'Overlap',
+                'retrigger_ignore': 'Ignore while playing',
+                'message_session_restored': 'Last session restored',
+                'menu_show': 'Show',
+                'menu_load_cues': 'Open Cue List',
+                'menu_start_show': 'Start Show',
+                'menu_stop_show': 'Stop Show',
+                'menu_aircheck': 'Air-check Recording',
+                'menu_asrun': 'As-run History',
+                'menu_soak': 'Stress Test',
+                'menu_limiter': 'Limiter',
+                'menu_cue_output': 'Pre-listen Output',
+                'cue_null_output': 'Null output (silent)',
+                'context_prelisten': 'Pre-listen',
+                'message_cue_output': 'Pre-listen output',
+                'message_prelisten': 'Pre-listening',
+                'message_prelisten_stopped': 'Pre-listen stopped',
+                'menu_limiter_ceiling': 'Limiter Ceiling',
+                'message_limiter_on': 'Master bus limiter on',
+                'message_limiter_off': 'Master bus limiter off',
+                'message_limiter_ceiling': 'Limiter ceiling',
+                'message_soak_started': 'Stress test started (triggers/s, hours)',
+                'message_soak_sample': 'Stress test',
+                'message_soak_finished': 'Stress test finished, triggers',
+                'message_soak_problem': 'Regression',
+                'asrun_file_filter': 'Search file names',
+                'asrun_refresh': 'Refresh',
+                'asrun_export': 'Export as CSV',
+                'asrun_started': 'Started',
+                'asrun_duration': 'Duration',
+                'asrun_file_path': 'File',
+                'asrun_button': 'Button',
+                'asrun_source': 'Source',
+                'asrun_stopped_early': 'Stopped early',
+                'message_asrun_failed': 'As-run history could not be written',
+                'message_asrun_exported': 'As-run history exported',
+                'message_aircheck_started': 'Air-check recording started',
+                'message_aircheck_stopped': 'Air-check recording stopped',
+                'message_aircheck_file': 'Air-check file completed',
+                'message_aircheck_failed': 'Air-check recording could not be written',
+                'message_aircheck_dropped': 'Time missing from the recording because the disk fell behind',
+                'dialog_load_cues': 'Open Cue List',
+                'message_no_cues': 'No cue list is loaded.',
+                'message_cues_loaded': 'Cue list loaded',
+                'message_cue_skipped': 'Cue skipped, button not ready',
+                'message_cue_fired': 'Cue started',
+                'message_cue_missed': 'Cue missed',
+                'message_show_started': 'Show started',
+                'message_show_finished': 'Show finished',
+                'message_jitter': 'jitter',
+                'menu_view': 'View',
+                'menu_spectrum': 'Spectrum Analyzer',
+                'menu_theme': 'Theme',
+                'menu_relink': 'Relink Missing Files',
+                'tooltip_problem': 'Problem',
+                'tooltip_duration': 'Duration',
+                'message_broken_files': 'Number of broken sound files',
+                'message_relink_question': 'Some sound files in the palette could not be found. Search the configured folders automatically?',
+                'message_relinked': 'Number of relinked files',
+                'message_relink_confirm': 'These files matched by name only (size and content unknown). Relink them?',
+                'message_file_changed': 'File changed on disk, re-analysing',
+                'message_file_removed': 'File removed',
+                'message_dropped': 'Number of dropped files assigned',
+                'message_no_free_slots': 'Files not added because no empty buttons were left',
                 'about_title': 'About Jingle Box',
                 'about_version': 'Version',
                 'about_license': 'License',
@@ -156,17 +4474,115 @@ class JingleBox(QMainWindow):
             }
         }
         
-        # VU Metre için QAudioProbe
-        self.audio_probe = QAudioProbe(self)
-        self.audio_probe.setSource(self.media_player)
-        self.audio_probe.audioBufferProbed.connect(self._process_audio_buffer)
+        # Ses motoru: cihazın yerel biçiminde karıştırır, VU metreyi de besler
+        device_info, output_format = output_device_format()
+        self.engine = MixEngine(output_format.sampleRate(), output_format.channelCount())
+        # Ana bus sınırlayıcısı her zaman zincirde durur; kapatmak gecikmeyi değiştirmez
+        self.limiter = TruePeakLimiter(output_format.sampleRate(), output_format.channelCount(),
+                                       self.settings["limiter_ceiling_db"], self.settings["limiter"])
+        self.engine.master_chain = (self.limiter,)
+        # Üst üste çalmada CPU ve bellek sınırlı kalsın
+        self.engine.max_voices = self.settings["max_voices"]
+        self.engine.steal_policy = self.settings["voice_stealing"]
+        self.audio_output = AudioOutput(self.engine, device_info, output_format)
+        self.audio_output.blockRendered.connect(self._process_audio_buffer)
+        self.audio_output.voicesFinished.connect(self._on_voices_finished)
+        self.audio_output.readyChanged.connect(self._on_audio_ready)
+        self.audio_ready = False
+        self.audio_output.start()
+        # Ön dinleme ayrı bir karıştırıcı ve akışta çalışır; programa yük ya da kesinti getirmez
+        self.cue_engine = MixEngine(output_format.sampleRate(), output_format.channelCount())
+        self.cue_output = None
+        self.cued_button = None
+        self._pending_cue = None
+        self.open_cue_output()
+        self.spectrum_window = SpectrumWindow(output_format.sampleRate(), self.settings["spectrum_fps"])
+
+        # Bus faderleri karıştırıcıya doğrudan gider; ayar dosyasına kısa bir gecikmeyle yazılır
+        for bus, level_db in self.settings["buses"].items():
+            self.engine.set_bus_level(bus, bus_fader_gain(level_db))
+        self.bus_fader_window = BusFaderWindow(self.settings["buses"])
+        self.bus_fader_window.levelChanged.connect(self._on_bus_level_changed)
+        self.bus_save_timer = QTimer(self)
+        self.bus_save_timer.setSingleShot(True)
+        self.bus_save_timer.setInterval(500)
+        self.bus_save_timer.timeout.connect(self.save_buses)
+
+        # Tüm butonlar tek bir uygulama stil sayfasıyla boyanır
+        self.theme_manager = ThemeManager()
+        self.settings["theme"] = self.theme_manager.apply(self.settings["theme"])
+
+        # Atanan dosyalar içe aktarılırken bir kez dönüştürülür
+        self.import_pipeline = ImportPipeline(self.audio_output.spec,
+                                              threshold_db=self.settings["silence_threshold_db"],
+                                              parent=self)
+        self.import_pipeline.clipReady.connect(self._on_clip_ready)
+        self.import_pipeline.clipFailed.connect(self._on_clip_failed)
+
+        # Sürükle-bırakla gelen dosyaların üst verileri arka planda yoklanır
+        self.metadata_prober = MetadataProber(parent=self)
+        self.metadata_prober.probed.connect(self._on_metadata_probed)
+        self.setAcceptDrops(True)
+
+        # Palet dosyalarının denetimi ve kayıp dosyaların yeniden bağlanması
+        self._offer_relink = False
+        self.health_checker = PaletteHealthChecker(parent=self)
+        self.health_checker.fileChecked.connect(self._on_file_checked)
+        self.health_checker.finished.connect(self._on_health_checked)
+        self.relinker = Relinker(parent=self)
+        self.relinker.finished.connect(self._on_relinked)
+
+        # Palet dosyaları ve kütüphane klasörleri değişince yalnızca etkilenen kayıtlar yenilenir
+        self.file_watcher = FileWatcher(self.settings["watch_poll_interval_ms"], parent=self)
+        self.file_watcher.fileChanged.connect(self._on_watched_file_changed)
+        self.file_watcher.fileRemoved.connect(self._on_watched_file_removed)
+        self.file_watcher.directoryChanged.connect(self.relinker.rescan)
+        self.relinker.indexChanged.connect(self.file_watcher.set_directories)
+        self.relinker.watch(self.settings["search_roots"], self.settings["relink_index_max_age"])
+
+        # Zaman koduna bağlı gösteri kontrolü
+        self.cue_list = []
+        self.show_clock = None
+        self.cue_scheduler = CueScheduler(self.engine, parent=self)
+        self.cue_scheduler.cueFired.connect(self._on_cue_fired)
+        self.cue_scheduler.cueMissed.connect(self._on_cue_missed)
+        self.cue_scheduler.finished.connect(self._on_show_finished)
+
+        # Yayına çıkan sesin isteğe bağlı kaydı
+        self.aircheck = AirCheckRecorder(self.engine, self.settings["aircheck_dir"] or AIRCHECK_DIR,
+                                         self.settings["aircheck_format"],
+                                         self.settings["aircheck_rotate_minutes"], parent=self)
+        self.aircheck.fileFinished.connect(self._on_aircheck_file)
+        self.aircheck.failed.connect(self._on_aircheck_failed)
+
+        # Her tetikleme bitince yayın akışı günlüğüne eklenir; üst üste çalan bir buton
+        # ya da çalarken yeniden gelen gösteri işareti için başlama sırasıyla birden çok kayıt
+        self._on_air = {}
+        # "overlap" kipinde başlatılıp diğer basışlarda kesilmeyen butonlar
+        self._layered = set()
+
+        # Çalan butonların süre göstergesi; ses sürdükçe tek zamanlayıcı hepsini günceller
+        self.progress_overlays = {}
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(CART_PROGRESS_INTERVAL_MS)
+        self.progress_timer.timeout.connect(self._update_cart_progress)
+        self.asrun_log = AsRunLog(parent=self)
+        self.asrun_log.failed.connect(self._on_asrun_failed)
+        self.asrun_window = AsRunHistoryWindow(self.asrun_log)
+        self.waveform_editor = None
+
+        # Canlı yayındaki buton yüklenmesini taklit eden stres testi
+        self.soak_test = SoakTest(self._soak_trigger, self.engine, self.audio_output,
+                                  self.settings["soak_rate"], self.settings["soak_hours"], parent=self)
+        self.soak_test.sampled.connect(self._on_soak_sampled)
+        self.soak_test.finished.connect(self._on_soak_finished)
 
         self.initUI()
         
     def initUI(self):
         # Program adı ve diğer başlık olayları işte
         self.setWindowTitle("Jingle Box")
-        self.setFixedSize(800, 600)
+        self.setFixedSize(800, 640)
 
         self.find_and_set_icon()
 
@@ -178,6 +4594,17 @@ class JingleBox(QMainWindow):
         main_vbox.setContentsMargins(10, 10, 10, 10)
         main_vbox.setSpacing(10)
 
+        # Açık paletler; sekmeler arası geçiş disk okumadan yalnızca butonları yeniden yazar
+        self.palette_tabs = QTabBar()
+        self.palette_tabs.setTabsClosable(True)
+        self.palette_tabs.setExpanding(False)
+        self.palette_tabs.setDocumentMode(True)
+        self.palette_tabs.currentChanged.connect(self.switch_palette)
+        self.palette_tabs.tabCloseRequested.connect(self.close_palette)
+        for number in range(1, 10):
+            QShortcut(QKeySequence(f"Ctrl+{number}"), self,
+                      activated=lambda index=number - 1: self.switch_palette(index))
+
         top_hbox = QHBoxLayout()
         top_hbox.setSpacing(10)
 
@@ -190,11 +4617,28 @@ class JingleBox(QMainWindow):
 
         settings_hbox = self.create_settings_buttons()
 
+        main_vbox.addWidget(self.palette_tabs)
         main_vbox.addLayout(top_hbox)
         main_vbox.addWidget(separator)
         main_vbox.addLayout(settings_hbox)
         
         self.update_language()
+
+        # Son oturumu palet ve günlüğünden geri yükle
+        self.restore_last_session()
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.timeout.connect(self.compact_journal)
+        self.autosave_timer.start(self.settings["autosave_interval_ms"])
+
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.timeout.connect(self._prefetch_clips)
+        self.prefetch_timer.start(self.settings["prefetch_interval_ms"])
+
+        # Ana iş parçacığındaki takılmalar, o anki yığınla birlikte kaydedilir
+        self.stall_watchdog = StallWatchdog(self.settings["stall_threshold_ms"], parent=self)
+        self.stall_watchdog.stalled.connect(self._on_stall)
+        # Açılış işleri takılma sayılmasın diye olay döngüsü dönmeye başlayınca başlar
+        QTimer.singleShot(0, self.stall_watchdog.start)
         
         self.show()
 
@@ -205,6 +4649,26 @@ class JingleBox(QMainWindow):
         self.file_menu.setTitle(lang['menu_file'])
         self.open_action.setText(lang['menu_open'])
         self.save_action.setText(lang['menu_save'])
+        self.new_palette_action.setText(lang['menu_new_palette'])
+        self.close_palette_action.setText(lang['menu_close_palette'])
+        self.relink_action.setText(lang['menu_relink'])
+        self.view_menu.setTitle(lang['menu_view'])
+        self.spectrum_action.setText(lang['menu_spectrum'])
+        self.theme_menu.setTitle(lang['menu_theme'])
+        self.spectrum_window.setWindowTitle(lang['menu_spectrum'])
+        self.bus_faders_action.setText(lang['menu_bus_faders'])
+        self.bus_fader_window.setWindowTitle(lang['menu_bus_faders'])
+        self.show_menu.setTitle(lang['menu_show'])
+        self.load_cues_action.setText(lang['menu_load_cues'])
+        self.start_show_action.setText(lang['menu_start_show'])
+        self.stop_show_action.setText(lang['menu_stop_show'])
+        self.aircheck_action.setText(lang['menu_aircheck'])
+        self.asrun_action.setText(lang['menu_asrun'])
+        self.soak_action.setText(lang['menu_soak'])
+        self.limiter_action.setText(lang['menu_limiter'])
+        self.cue_output_menu.setTitle(lang['menu_cue_output'])
+        self.limiter_ceiling_menu.setTitle(lang['menu_limiter_ceiling'])
+        self.asrun_window.set_labels(lang)
         self.help_menu.setTitle(lang['menu_help'])
         self.about_action.setText(lang['menu_about'])
 
@@ -212,12 +4676,15 @@ class JingleBox(QMainWindow):
         self.save_button.setText(lang['button_save_palette'])
         self.open_button.setText(lang['button_open_palette'])
         self.about_button.setText(lang['menu_about'])
+        self.audio_status.setText(lang['audio_ready'] if self.audio_ready else lang['audio_not_ready'])
 
         # Jingle butonlarının metinlerini güncelle
         for button in self.button_states:
             if self.button_states[button]["file_path"] is None:
                 if button.text() != 'DUR' and button.text() != 'STOP':
                     button.setText(lang['button_empty'])
+            else:
+                self.refresh_button_label(button)
             
     def toggle_language(self):
         self.current_lang = 'en' if self.current_lang == 'tr' else 'tr'
@@ -254,6 +4721,11 @@ class JingleBox(QMainWindow):
         menubar = self.menuBar()
         
         self.file_menu = menubar.addMenu("Dosya")
+
+        self.new_palette_action = QAction("Yeni Palet", self)
+        self.new_palette_action.setShortcut(QKeySequence.AddTab)
+        self.new_palette_action.triggered.connect(self.new_palette)
+        self.file_menu.addAction(self.new_palette_action)
         
         self.open_action = QAction("Aç", self)
         self.open_action.triggered.connect(self.load_palette)
@@ -262,113 +4734,160 @@ class JingleBox(QMainWindow):
         self.save_action = QAction("Kaydet", self)
         self.save_action.triggered.connect(self.save_palette)
         self.file_menu.addAction(self.save_action)
+
+        self.close_palette_action = QAction("Paleti Kapat", self)
+        self.close_palette_action.triggered.connect(
+            lambda: self.close_palette(self.palette_tabs.currentIndex()))
+        self.file_menu.addAction(self.close_palette_action)
+
+        self.relink_action = QAction("Kayıp Dosyaları Yeniden Bağla", self)
+        self.relink_action.triggered.connect(self.relink_missing_files)
+        self.file_menu.addAction(self.relink_action)
+        
+        self.show_menu = menubar.addMenu("Gösteri")
+
+        self.load_cues_action = QAction("İşaret Listesi Aç", self)
+        self.load_cues_action.triggered.connect(self.load_cue_list)
+        self.show_menu.addAction(self.load_cues_action)
+
+        self.start_show_action = QAction("Gösteriyi Başlat", self)
+        self.start_show_action.triggered.connect(self.start_show)
+        self.show_menu.addAction(self.start_show_action)
+
+        self.stop_show_action = QAction("Gösteriyi Durdur", self)
+        self.stop_show_action.triggered.connect(self.stop_show)
+        self.show_menu.addAction(self.stop_show_action)
+
+        self.show_menu.addSeparator()
+        self.aircheck_action = QAction("Yayın Kaydı", self)
+        self.aircheck_action.setCheckable(True)
+        self.aircheck_action.toggled.connect(self.set_aircheck)
+        self.show_menu.addAction(self.aircheck_action)
+        self.aircheck_action.setChecked(self.settings["aircheck"])
+
+        self.asrun_action = QAction("Yayın Geçmişi", self)
+        self.asrun_action.triggered.connect(self.show_asrun_history)
+        self.show_menu.addAction(self.asrun_action)
+
+        self.soak_action = QAction("Stres Testi", self)
+        self.soak_action.setCheckable(True)
+        self.soak_action.toggled.connect(self.set_soak_test)
+        self.show_menu.addAction(self.soak_action)
+
+        self.cue_output_menu = self.show_menu.addMenu("Ön Dinleme Çıkışı")
+        self.cue_output_menu.aboutToShow.connect(self._populate_cue_output_menu)
+
+        self.show_menu.addSeparator()
+        self.limiter_action = QAction("Sınırlayıcı", self)
+        self.limiter_action.setCheckable(True)
+        self.limiter_action.setChecked(self.settings["limiter"])
+        self.limiter_action.toggled.connect(self.set_limiter)
+        self.show_menu.addAction(self.limiter_action)
+
+        self.limiter_ceiling_menu = self.show_menu.addMenu("Sınırlayıcı Tavanı")
+        self.limiter_ceiling_menu.aboutToShow.connect(self._populate_limiter_ceiling_menu)
         
+        self.view_menu = menubar.addMenu("Görünüm")
+        self.spectrum_action = QAction("Spektrum Analizörü", self)
+        self.spectrum_action.setCheckable(True)
+        self.spectrum_action.toggled.connect(self.spectrum_window.setVisible)
+        self.spectrum_window.closed.connect(lambda: self.spectrum_action.setChecked(False))
+        self.view_menu.addAction(self.spectrum_action)
+
+        self.bus_faders_action = QAction("Bus Faderleri", self)
+        self.bus_faders_action.setCheckable(True)
+        self.bus_faders_action.toggled.connect(self.bus_fader_window.setVisible)
+        self.bus_fader_window.closed.connect(lambda: self.bus_faders_action.setChecked(False))
+        self.view_menu.addAction(self.bus_faders_action)
+
+        self.theme_menu = self.view_menu.addMenu("Tema")
+        self.theme_menu.aboutToShow.connect(self._populate_theme_menu)
+
         self.help_menu = menubar.addMenu("Yardım")
         self.about_action = QAction("Hakkında", self)
         self.about_action.triggered.connect(self.show_about_dialog)
         self.help_menu.addAction(self.about_action)
 
+    def _populate_theme_menu(self):
+        # Tema klasörü çalışırken değişebileceği için menü her açılışta doldurulur
+        self.theme_menu.clear()
+        for name in self.theme_manager.available():
+            action = self.theme_menu.addAction(name)
+            action.setCheckable(True)
+            action.setChecked(name == self.settings["theme"])
+            action.triggered.connect(lambda checked, name=name: self.set_theme(name))
+
+    def _populate_limiter_ceiling_menu(self):
+        self.limiter_ceiling_menu.clear()
+        for ceiling_db in LIMITER_CEILINGS_DB:
+            action = self.limiter_ceiling_menu.addAction(f"{ceiling_db:g} dBTP")
+            action.setCheckable(True)
+            action.setChecked(ceiling_db == self.limiter.ceiling_db)
+            action.triggered.connect(lambda checked, c=ceiling_db: self.set_limiter_ceiling(c))
+
+    def set_limiter(self, enabled):
+        lang = self.translations[self.current_lang]
+        self.limiter.enabled = enabled
+        self.settings["limiter"] = enabled
+        print(lang['message_limiter_on'] if enabled else lang['message_limiter_off'])
+        try:
+            save_setting("limiter", enabled)
+        except OSError as e:
+            print(f"{SETTINGS_PATH}: {e}")
+
+    def set_limiter_ceiling(self, ceiling_db):
+        lang = self.translations[self.current_lang]
+        self.limiter.ceiling_db = ceiling_db
+        self.settings["limiter_ceiling_db"] = ceiling_db
+        print(f"{lang['message_limiter_ceiling']}: {ceiling_db:g} dBTP")
+        try:
+            save_setting("limiter_ceiling_db", ceiling_db)
+        except OSError as e:
+            print(f"{SETTINGS_PATH}: {e}")
+
+    def set_theme(self, name):
+        self.settings["theme"] = self.theme_manager.apply(name)
+        try:
+            save_setting("theme", self.settings["theme"])
+        except OSError as e:
+            print(f"{SETTINGS_PATH}: {e}")
+
     def create_button_grid(self, parent_layout):
         grid = QGridLayout()
         grid.setSpacing(10)
 
-        # Orijinal renkler
-        original_colors = [
-            "#ff5c5c", # Kırmızımsı
-            "#ff8c5c", # Turuncu
-            "#ffbc5c", # Sarımsı turuncu
-            "#ffff5c", # Sarı
-            "#bfff5c", # Hafif yeşilimsi sarı
-            "#8cff5c", # Daha yeşil
-            "#5cffbc", # Mavimsi yeşil
-        ]
-        
-        # Renklerin doygunluğunu azaltarak yeni bir palet oluştur
-        desaturated_colors = []
-        for hex_color in original_colors:
-            q_color = QColor(hex_color)
-            hsv_color = q_color.toHsv()
-            hsv_color.setHsv(hsv_color.hue(), 150, hsv_color.value())
-            desaturated_colors.append(hsv_color.name())
-
-        # Kullanıcının yeni taleplerine göre renk paletini düzenle
-        vu_meter_color = "#5fa686"
-        
-        button_colors = [
-            desaturated_colors[0], # 1. sıra (kırmızımsı)
-            vu_meter_color,        # 2. sıra (yeni yeşil renk)
-            vu_meter_color,        # 3. sıra (yeni yeşil renk)
-            vu_meter_color,        # 4. sıra (yeni yeşil renk)
-            vu_meter_color,        # 5. sıra (yeni yeşil renk)
-            vu_meter_color,        # 6. sıra (yeni yeşil renk)
-            desaturated_colors[2], # 7. sıra (sarımsı turuncu)
-        ]
-
         for i in range(7):
             for j in range(5):
                 button = QPushButton("Boş")
                 button.setFixedSize(120, 60)
                 
-                self.button_states[button] = {"file_path": None}
+                self.button_states[button] = self._new_button_state()
                 self.button_map[(i, j)] = button
+                self.button_positions[button] = f"{i},{j}"
                 
+                # Renkler butona değil, uygulama temasına aittir
                 if i == 6 and j == 4:
                     button.setText("DUR")
+                    button.setObjectName("stopButton")
                     button.clicked.connect(self.stop_playback)
-                    button.setStyleSheet("""
-                        QPushButton {
-                            background-color: #e03c3c;
-                            color: #ffffff;
-                            border: 1px solid #902c2c;
-                            border-radius: 4px;
-                        }
-                        QPushButton:hover {
-                            background-color: #b82b2b;
-                        }
-                        QPushButton:pressed {
-                            background-color: #8c2020;
-                        }
-                    """)
                 else:
-                    color = button_colors[i]
-                    button.setStyleSheet(f"""
-                        QPushButton {{
-                            background-color: {color};
-                            color: #000000;
-                            border: 1px solid {color};
-                            border-radius: 4px;
-                        }}
-                        QPushButton:hover {{
-                            background-color: {QColor(color).darker(120).name()};
-                        }}
-                        QPushButton:pressed {{
-                            background-color: {QColor(color).darker(150).name()};
-                        }}
-                    """)
+                    button.setProperty("cartRow", ROW_CLASSES[i])
+                    button.setAcceptDrops(True)
+                    button.installEventFilter(self)
                     button.clicked.connect(self.play_sound)
                     button.setContextMenuPolicy(Qt.CustomContextMenu)
                     button.customContextMenuRequested.connect(self.show_context_menu)
+                    self.progress_overlays[button] = CartProgressOverlay(button)
                 
                 grid.addWidget(button, i, j)
         
         parent_layout.addLayout(grid)
 
     def create_vu_meter_area(self, parent_layout):
-        vu_meter_container = QWidget()
-        vu_meter_container.setFixedSize(60, 480)
-        vu_meter_container.setStyleSheet("background-color: black; border-radius: 5px;")
-        
-        vu_layout = QHBoxLayout(vu_meter_container)
-        vu_layout.setContentsMargins(5, 5, 5, 5)
-        vu_layout.setSpacing(5)
-
-        self.left_vu_meter = VUMeterBar()
-        self.right_vu_meter = VUMeterBar()
-
-        vu_layout.addWidget(self.left_vu_meter)
-        vu_layout.addWidget(self.right_vu_meter)
-
-        parent_layout.addWidget(vu_meter_container)
+        self.vu_meter = MultiChannelMeter(self.engine.channels)
+        parent_layout.addWidget(self.vu_meter)
+        self.gain_reduction_meter = GainReductionMeter()
+        parent_layout.addWidget(self.gain_reduction_meter)
     
     def create_settings_buttons(self):
         settings_hbox = QHBoxLayout()
@@ -390,6 +4909,11 @@ class JingleBox(QMainWindow):
         settings_hbox.addWidget(self.open_button)
         settings_hbox.addWidget(self.lang_button)
         settings_hbox.addWidget(self.about_button)
+
+        # Ses aygıtının hazır olup olmadığı
+        self.audio_status = QLabel()
+        self.audio_status.setObjectName("audioStatus")
+        settings_hbox.addWidget(self.audio_status)
         
         return settings_hbox
 
@@ -400,6 +4924,33 @@ class JingleBox(QMainWindow):
         delete_action = menu.addAction(lang['context_delete'])
         
         self.last_clicked_button = self.sender()
+        state = self.button_states[self.last_clicked_button]
+
+        menu.addSeparator()
+        prelisten_action = menu.addAction(lang['context_prelisten'])
+        prelisten_action.setEnabled(state["file_path"] is not None)
+        mix_action = menu.addAction(lang['context_mix'])
+        waveform_action = menu.addAction(lang['context_waveform'])
+        waveform_action.setEnabled(state["clip"] is not None)
+        skip_silence_action = menu.addAction(lang['context_skip_silence'])
+        skip_silence_action.setCheckable(True)
+        skip_silence_action.setChecked(state["skip_silence"])
+        loop_menu = menu.addMenu(lang['context_loop'])
+        loop_group = QActionGroup(loop_menu)
+        for mode in LOOP_MODES:
+            loop_action = loop_menu.addAction(lang['loop_' + mode])
+            loop_action.setCheckable(True)
+            loop_action.setChecked(state["loop"] == mode)
+            loop_action.setData(mode)
+            loop_group.addAction(loop_action)
+        retrigger_menu = menu.addMenu(lang['context_retrigger'])
+        retrigger_group = QActionGroup(retrigger_menu)
+        for mode in RETRIGGER_MODES:
+            retrigger_action = retrigger_menu.addAction(lang['retrigger_' + mode])
+            retrigger_action.setCheckable(True)
+            retrigger_action.setChecked(state["retrigger"] == mode)
+            retrigger_action.setData(mode)
+            retrigger_group.addAction(retrigger_action)
 
         action = menu.exec_(self.last_clicked_button.mapToGlobal(pos))
         
@@ -407,34 +4958,212 @@ class JingleBox(QMainWindow):
             self.on_assign_sound_clicked()
         elif action == delete_action:
             self.on_delete_sound_clicked()
+        elif action == prelisten_action:
+            self.prelisten(self.last_clicked_button)
+        elif action == mix_action:
+            self.edit_button_mix(self.last_clicked_button)
+        elif action == waveform_action:
+            self.open_waveform_editor(self.last_clicked_button)
+        elif action == skip_silence_action:
+            state["skip_silence"] = skip_silence_action.isChecked()
+            self.refresh_button_label(self.last_clicked_button)
+            self.journal_button(self.last_clicked_button)
+        elif action is not None and action.actionGroup() is loop_group:
+            state["loop"] = action.data()
+            self.refresh_button_label(self.last_clicked_button)
+            self.journal_button(self.last_clicked_button)
+        elif action is not None and action.actionGroup() is retrigger_group:
+            state["retrigger"] = action.data()
+            self.refresh_button_label(self.last_clicked_button)
+            self.journal_button(self.last_clicked_button)
+
+    def edit_button_mix(self, button):
+        lang = self.translations[self.current_lang]
+        state = self.button_states[button]
+        dialog = ButtonMixDialog(state, list(self.settings["buses"]), lang, self)
+        dialog.setWindowTitle(lang['context_mix'].rstrip('.'))
+        if dialog.exec_() == QDialog.Accepted:
+            # Yeni değerler butonun bir sonraki çalışında geçerli olur
+            state.update(dialog.values())
+            self.refresh_button_label(button)
+            self.journal_button(button)
+
+    def open_waveform_editor(self, button):
+        lang = self.translations[self.current_lang]
+        state = self.button_states[button]
+        if self.waveform_editor is not None:
+            self.waveform_editor.close()
+        self.waveform_editor = WaveformEditor(state["clip"], state["start"], state["end"], lang)
+        self.waveform_editor.setWindowTitle(f"{lang['context_waveform'].rstrip('.')}: "
+                                            f"{os.path.basename(state['file_path'])}")
+        self.waveform_editor.markersChanged.connect(
+            lambda start, end: self._on_markers_changed(button, start, end))
+        self.waveform_editor.previewRequested.connect(
+            lambda frame: self._preview_from(button, frame))
+        self.waveform_editor.show()
+
+    def _on_markers_changed(self, button, start, end):
+        state = self.button_states[button]
+        state["start"], state["end"] = start, end
+        self.refresh_button_label(button)
+        self.journal_button(button)
+
+    def _preview_from(self, button, frame):
+        # İşaretler ön dinleme çıkışında denenir; yayındaki ses kesilmez
+        state = self.button_states[button]
+        if state["clip"] is None:
+            return
+        self.cue_engine.stop()
+        self.cued_button = button
+        self.cue_engine.play(state["clip"], DEFAULT_GAIN * 10.0 ** (state["gain_db"] / 20.0),
+                             tag=button, start=frame, pan=state["pan"])
+
+    def _on_bus_level_changed(self, bus, level_db):
+        self.engine.set_bus_level(bus, bus_fader_gain(level_db))
+        self.settings["buses"] = dict(self.settings["buses"], **{bus: level_db})
+        self.bus_save_timer.start()
+
+    def _new_button_state(self):
+        return dict(PALETTE_ENTRY_DEFAULTS, file_path=None, clip=None, problem=None, meta=None)
+
+    @staticmethod
+    def _display_name(file_path):
+        file_name = os.path.basename(file_path)
+        file_name_without_extension = os.path.splitext(file_name)[0]
+        if len(file_name_without_extension) > 14:
+            return file_name_without_extension[:11] + "..."
+        return file_name_without_extension
+
+    def _play_range(self, state):
+        """Butonun ayarına göre çalınacak (başlangıç, bitiş) kare aralığı"""
+        return entry_play_range(state["clip"], state)
+
+    def refresh_button_label(self, button):
+        lang = self.translations[self.current_lang]
+        state = self.button_states[button]
+        set_dynamic_property(button, "broken", state["problem"] is not None)
+        if state["file_path"] is None:
+            button.setText(lang['button_empty'])
+            button.setToolTip("")
+            return
+
+        text = self._display_name(state["file_path"])
+        tooltip = state["file_path"]
+        clip = state["clip"]
+        meta = state["meta"] or {}
+        if meta.get("title"):
+            tooltip += "\n" + " - ".join(meta[key] for key in ("artist", "title") if meta.get(key))
+        if meta.get("format"):
+            tooltip += f"\n{meta['format']}"
+        if state["problem"] is not None:
+            tooltip += f"\n{lang['tooltip_problem']}: {state['problem']}"
+        if clip is not None:
+            tooltip += f"\n{lang['tooltip_duration']}: {clip.duration:.1f} s"
+            start, _ = self._play_range(state)
+            if start > 0 and state["start"] is None:
+                # Başlangıcı kırpılan butonları işaretle
+                text = "\u25B8 " + text
+                tooltip += f"\n{lang['tooltip_trimmed']}: {start * 1000 // clip.spec[0]} ms"
+        if state["start"] is not None or state["end"] is not None:
+            markers = ["-" if value is None else f"{value:.2f} s" for value in (state["start"], state["end"])]
+            tooltip += f"\n{lang['tooltip_markers']}: {markers[0]} \u2013 {markers[1]}"
+        if state["gain_db"] or state["pan"] or state["bus"] != PALETTE_ENTRY_DEFAULTS["bus"]:
+            tooltip += (f"\n{lang['mix_gain']}: {state['gain_db']:+.1f} dB, "
+                        f"{lang['mix_pan']}: {state['pan']:+.1f}, {lang['mix_bus']}: {state['bus']}")
+        if state["loop"] != "off":
+            # Döngüdeki butonları işaretle
+            text = "\u21BB " + text
+            tooltip += f"\n{lang['tooltip_loop']}: {lang['loop_' + state['loop']]}"
+        if state["retrigger"] != PALETTE_ENTRY_DEFAULTS["retrigger"]:
+            tooltip += f"\n{lang['context_retrigger']}: {lang['retrigger_' + state['retrigger']]}"
+        button.setText(text)
+        button.setToolTip(tooltip)
 
     def play_sound(self):
         lang = self.translations[self.current_lang]
         button = self.sender()
         
-        file_path = self.button_states[button]["file_path"]
+        state = self.button_states[button]
+        file_path = state["file_path"]
+        clip = state["clip"]
         
-        if file_path:
-            self.media_player.stop()
-            
-            media_content = QMediaContent(QUrl.fromLocalFile(file_path))
-            self.media_player.setMedia(media_content)
-            
-            self.media_player.setVolume(25) 
-            
-            self.media_player.play()
-            
+        if file_path and clip is None:
+            print(f"{lang['message_not_ready']}: {file_path}")
+        elif file_path:
+            # Butonlar paletler arasında ortak olduğu için çalan sesin bu palete ait olduğu da bakılır
+            playing = self.palette is self.active_palette and self.engine.is_playing(button)
+            action, stopped = trigger_entry(self.engine, button, clip, state, self._layered, playing)
+            self._asrun_end(stopped, stopped_early=True)
+            if action == "stopped":
+                print(lang['message_stopped'])
+                return
+            if action == "released":
+                print(lang['message_loop_release'])
+                return
+            if action == "ignored":
+                return
+            self._asrun_start(button, "manual")
+
             self.active_button = button
+            self.active_palette = self.palette
             print(f"{lang['message_playing']}: {file_path}")
         else:
             print(lang['message_no_sound'])
 
+    def _on_voices_finished(self, tags):
+        # Üst üste çalan butonun kaydı son sesi bitince kapanır
+        ended = [tag for tag in tags if not self.engine.is_playing(tag)]
+        for tag in tags:
+            if tag not in ended:
+                # Katmanlardan biri bitti; aynı klip çaldığı için ilk başlayan ilk biter
+                self._asrun_end([tag], stopped_early=False, oldest_only=True)
+        self._asrun_end(ended, stopped_early=False)
+        self._layered.difference_update(ended)
+        if self.active_button in tags and not self.engine.is_active():
+            self.active_button = None
+
+    def _on_audio_ready(self, ready):
+        self.audio_ready = ready
+        lang = self.translations[self.current_lang]
+        self.audio_status.setText(lang['audio_ready'] if ready else lang['audio_not_ready'])
+        set_dynamic_property(self.audio_status, "ready", ready)
+
+    def _on_stall(self, record):
+        lang = self.translations[self.current_lang]
+        where = record["samples"][0]["where"] if record["samples"] else "?"
+        print(f"{lang['message_stall']}: {record['duration_ms']:.0f} ms, {where}")
+
+    def _update_cart_progress(self):
+        now = time.perf_counter()
+        # Butonlar paletler arasında ortak; başka paletin sesi bu butonlarda gösterilmez
+        positions = self.engine.playing_positions(now) if self.palette is self.active_palette else {}
+        rate = float(self.engine.sample_rate)
+        flash_on = int(now * CART_FLASH_HZ * 2) % 2 == 0
+        for button, overlay in self.progress_overlays.items():
+            position = positions.get(button)
+            if position is None:
+                overlay.clear()
+                continue
+            elapsed, remaining, total = position
+            warning = remaining is not None and remaining < CART_WARNING_SECONDS * rate and flash_on
+            overlay.set_progress(elapsed / rate, None if remaining is None else remaining / rate,
+                                 elapsed / total if total else 1.0, warning)
+        if not self.engine.is_active():
+            self.progress_timer.stop()
+
+    def _prefetch_clips(self):
+        # Uzun boşlukta sayfa önbelleğinden düşen başlangıçları yeniden belleğe al; tüm açık
+        # paletlerin klipleri ortak önbellekte bir kez bulunur
+        for clip in self.clip_cache.clips():
+            clip.prefetch()
+
     def stop_playback(self):
         lang = self.translations[self.current_lang]
-        self.media_player.stop()
+        self._asrun_end(list(self._on_air), stopped_early=True)
+        self.engine.stop()
+        self._layered.clear()
         self.active_button = None
-        self.left_vu_meter.set_level(0.0)
-        self.right_vu_meter.set_level(0.0)
+        self.vu_meter.reset()
         print(lang['message_stopped'])
 
     def on_assign_sound_clicked(self):
@@ -447,27 +5176,94 @@ class JingleBox(QMainWindow):
         )
         
         if file_path:
-            self.button_states[self.last_clicked_button]["file_path"] = file_path
-            
-            file_name = os.path.basename(file_path)
-            file_name_without_extension = os.path.splitext(file_name)[0]
-
-            if len(file_name_without_extension) > 14:
-                display_name = file_name_without_extension[:11] + "..."
-            else:
-                display_name = file_name_without_extension
-            
-            self.last_clicked_button.setText(display_name)
+            self.assign_file(self.last_clicked_button, file_path)
             print(f"{lang['message_assigned']}: {file_path}")
 
+    def assign_file(self, button, file_path):
+        self._set_button_file(button, file_path)
+        self.journal_button(button)
+        self._watch_palette_files()
+
+    def _set_button_file(self, button, file_path):
+        state = self.button_states[button]
+        state["file_path"] = file_path
+        state["clip"] = None
+        state["problem"] = None
+        state["meta"] = None
+        self._request_clip(state)
+        self.refresh_button_label(button)
+        self.metadata_prober.probe(file_path)
+
+    # --- Sürükle-bırak ---
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        self.import_dropped(event.mimeData().urls(), None)
+        event.acceptProposedAction()
+
+    def eventFilter(self, obj, event):
+        # Tek bir butona bırakılan dosyalar o butondan başlayarak yerleşir
+        if obj in self.button_states and obj.objectName() != "stopButton":
+            if event.type() in (QEvent.DragEnter, QEvent.DragMove) and event.mimeData().hasUrls():
+                event.acceptProposedAction()
+                return True
+            if event.type() == QEvent.Drop and event.mimeData().hasUrls():
+                self.import_dropped(event.mimeData().urls(), obj)
+                event.acceptProposedAction()
+                return True
+        return super().eventFilter(obj, event)
+
+    def import_dropped(self, urls, anchor):
+        paths = [url.toLocalFile() for url in urls if url.isLocalFile()]
+        if paths:
+            # Klasör taraması uzun sürebilir; pencere donmasın diye arka planda yapılır
+            self.metadata_prober.expand(paths, lambda files: self._assign_dropped(files, anchor))
+
+    def _assign_dropped(self, files, anchor):
+        lang = self.translations[self.current_lang]
+        slots = [button for pos, button in sorted(self.button_map.items()) if pos != (6, 4)]
+        if anchor is not None:
+            slots = slots[slots.index(anchor):]
+            targets = [anchor] + [b for b in slots[1:] if self.button_states[b]["file_path"] is None]
+        else:
+            targets = [b for b in slots if self.button_states[b]["file_path"] is None]
+
+        # Toplu bırakmada günlük tek fsync ile, izleme listesi bir kez güncellenir
+        assigned = list(zip(targets, files))
+        for button, file_path in assigned:
+            self._set_button_file(button, file_path)
+        if assigned:
+            self.journal_button(*(button for button, _ in assigned))
+            self._watch_palette_files()
+        assigned = len(assigned)
+        print(f"{lang['message_dropped']}: {assigned}")
+        if len(files) > assigned:
+            print(f"{lang['message_no_free_slots']}: {len(files) - assigned}")
+
+    def _on_metadata_probed(self, file_path, info):
+        for palette, button, state in self._states_for(file_path):
+            state["meta"] = info
+            if state["clip"] is not None and state["problem"] in (None, "truncated"):
+                state["problem"] = check_decoded_clip(state["clip"], info)
+            elif info.get("truncated") and state["problem"] is None:
+                # Başlık yoklaması veri bloğunun eksik olduğunu gösterdi
+                state["problem"] = "truncated"
+            if palette is self.palette:
+                self.refresh_button_label(button)
+    # --- Sürükle-Bırak Sonu ---
+
     def on_delete_sound_clicked(self):
         lang = self.translations[self.current_lang]
         if self.last_clicked_button:
-            if self.last_clicked_button == self.active_button:
+            if self.last_clicked_button == self.active_button and self.palette is self.active_palette:
                 self.stop_playback()
 
-            self.button_states[self.last_clicked_button]["file_path"] = None
-            self.last_clicked_button.setText(lang['button_empty'])
+            self.button_states[self.last_clicked_button] = self._new_button_state()
+            self.refresh_button_label(self.last_clicked_button)
+            self.journal_button(self.last_clicked_button)
+            self._watch_palette_files()
             print(lang['message_deleted'])
 
     def save_palette(self):
@@ -483,14 +5279,11 @@ class JingleBox(QMainWindow):
             if not file_path.endswith('.json'):
                 file_path += '.json'
 
-            palette_data = {}
-            for pos, button in self.button_map.items():
-                if button in self.button_states and self.button_states[button]["file_path"]:
-                    palette_data[f"{pos[0]},{pos[1]}"] = self.button_states[button]["file_path"]
+            palette_data = self.collect_palette_data()
 
             try:
-                with open(file_path, 'w') as f:
-                    json.dump(palette_data, f, indent=4)
+                write_file_atomic(file_path, json.dumps(palette_data, indent=4))
+                self.set_current_palette(file_path)
                 print(f"{lang['message_saved_success']}: {file_path}")
             except Exception as e:
                 print(f"{lang['message_save_error']}: {e}")
@@ -505,37 +5298,608 @@ class JingleBox(QMainWindow):
         )
 
         if file_path:
+            for index, palette in enumerate(self.palettes):
+                if os.path.abspath(palette.file_path) == os.path.abspath(file_path):
+                    # Zaten açık: yeniden okumadan sekmesine geç
+                    self.switch_palette(index)
+                    return
             try:
-                with open(file_path, 'r') as f:
-                    palette_data = json.load(f)
-                
-                for pos, button in self.button_map.items():
-                    if pos != (6, 4):
-                        self.button_states[button]["file_path"] = None
-                        button.setText(lang['button_empty'])
-                
-                self.stop_playback()
-
-                for pos_str, file_path in palette_data.items():
-                    try:
-                        row, col = map(int, pos_str.split(','))
-                        button = self.button_map.get((row, col))
-                        if button:
-                            self.button_states[button]["file_path"] = file_path
-                            file_name = os.path.basename(file_path)
-                            file_name_without_extension = os.path.splitext(file_name)[0]
-                            if len(file_name_without_extension) > 14:
-                                display_name = file_name_without_extension[:11] + "..."
-                            else:
-                                display_name = file_name_without_extension
-                            button.setText(display_name)
-                    except (ValueError, IndexError):
-                        print(f"{lang['message_invalid_data']}: {pos_str}")
-                
+                journal = PaletteJournal(file_path)
+                palette_data = journal.load()
+                self._offer_relink = True
+                self.open_palette_tab(journal, palette_data)
+                self._remember_open_palettes()
                 print(f"{lang['message_loaded_success']}: {file_path}")
             except Exception as e:
                 print(f"{lang['message_load_error']}: {e}")
 
+    def apply_palette_data(self, palette_data):
+        lang = self.translations[self.current_lang]
+        for pos, button in self.button_map.items():
+            if pos != (6, 4):
+                self.button_states[button] = self._new_button_state()
+                button.setText(lang['button_empty'])
+                button.setToolTip("")
+
+        for pos_str, entry in palette_data.items():
+            try:
+                row, col = map(int, pos_str.split(','))
+                button = self.button_map.get((row, col))
+                if button and (row, col) != (6, 4):
+                    self._apply_palette_entry(self.button_states[button], entry)
+                    self._request_clip(self.button_states[button])
+                    self.refresh_button_label(button)
+            except (ValueError, IndexError, KeyError, TypeError):
+                print(f"{lang['message_invalid_data']}: {pos_str}")
+
+        self.health_checker.check(state["file_path"] for state in self.button_states.values()
+                                  if state["file_path"])
+        self._watch_palette_files()
+
+    def collect_palette_data(self, states=None):
+        states = self.button_states if states is None else states
+        palette_data = {}
+        for pos, button in self.button_map.items():
+            if button in states and states[button]["file_path"]:
+                palette_data[f"{pos[0]},{pos[1]}"] = self._palette_entry(states[button])
+        return palette_data
+
+    # --- Açık paletler ---
+    def open_palette_tab(self, journal, palette_data):
+        """Paleti yeni bir sekmede açıp ona geç"""
+        palette = OpenPalette(journal, {button: self._new_button_state()
+                                        for button in self.button_positions})
+        self.palettes.append(palette)
+        self.palette_tabs.blockSignals(True)
+        index = self.palette_tabs.addTab(palette.title)
+        self.palette_tabs.setTabToolTip(index, palette.file_path)
+        self.palette_tabs.blockSignals(False)
+        self.switch_palette(index)
+        self.apply_palette_data(palette_data)
+
+    def switch_palette(self, index):
+        """Başka bir açık palete geç; yalnızca buton yazıları değişir, çalan ses sürer"""
+        if not 0 <= index < len(self.palettes) or self.palettes[index] is self.palette:
+            return
+        if self.waveform_editor is not None:
+            # Düzenleyici önceki paletin butonuna bağlı
+            self.waveform_editor.close()
+            self.waveform_editor = None
+        self.palette = self.palettes[index]
+        self.button_states = self.palette.states
+        self.palette_journal = self.palette.journal
+        self.palette_tabs.blockSignals(True)
+        self.palette_tabs.setCurrentIndex(index)
+        self.palette_tabs.blockSignals(False)
+        for pos, button in self.button_map.items():
+            if pos != (6, 4):
+                self.refresh_button_label(button)
+
+    def new_palette(self):
+        path = os.path.join(DATA_DIR, f"palette-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        self.open_palette_tab(PaletteJournal(path), {})
+        self._remember_open_palettes()
+
+    def close_palette(self, index):
+        # Son açık palet kapatılmaz; butonların her zaman bir paleti olmalı
+        if len(self.palettes) < 2 or not 0 <= index < len(self.palettes):
+            return
+        palette = self.palettes[index]
+        try:
+            palette.journal.close(self.collect_palette_data(palette.states))
+        except OSError as e:
+            print(f"{palette.journal.journal_path}: {e}")
+        if palette is self.palette:
+            self.switch_palette(index + 1 if index + 1 < len(self.palettes) else index - 1)
+        if palette is self.active_palette:
+            # Çalan ses kendi klibini tutar; kapanan paletin durumları bırakılabilsin
+            self.active_palette = None
+        self.palette_tabs.blockSignals(True)
+        self.palette_tabs.removeTab(index)
+        del self.palettes[index]
+        self.palette_tabs.setCurrentIndex(self.palettes.index(self.palette))
+        self.palette_tabs.blockSignals(False)
+        # Yalnızca bu palette kullanılan klipler ortak önbellekten kendiliğinden düşer
+        self._watch_palette_files()
+        self._remember_open_palettes()
+
+    def _remember_open_palettes(self):
+        try:
+            os.makedirs(DATA_DIR, exist_ok=True)
+            write_file_atomic(OPEN_PALETTES_PATH, json.dumps({
+                "paths": [palette.file_path for palette in self.palettes],
+                "current": self.palettes.index(self.palette),
+            }))
+        except OSError as e:
+            print(f"{OPEN_PALETTES_PATH}: {e}")
+
+    def _states_for(self, file_path):
+        """Dosyayı kullanan bütün açık paletlerdeki (palet, buton, durum) üçlüleri"""
+        return [(palette, button, state) for palette in self.palettes
+                for button, state in palette.states.items() if state["file_path"] == file_path]
+
+    def _request_clip(self, state):
+        """Dosya başka bir butonda yüklüyse klibini paylaş; değilse içe aktarmaya gönder"""
+        for _, _, other in self._states_for(state["file_path"]):
+            if other["clip"] is not None:
+                state["clip"] = other["clip"]
+                size, digest = self.import_pipeline.known_source(state["file_path"])
+                if digest is not None:
+                    state["size"], state["digest"] = size, digest
+                return
+        self.import_pipeline.submit(state["file_path"])
+    # --- Açık Paletler Sonu ---
+
+    # --- Otomatik kayıt: önce günlük, sonra arka planda sıkıştırma ---
+    def set_current_palette(self, file_path, journal=None):
+        """Geçerli paletin değişikliklerinin günlükleneceği dosyayı değiştir"""
+        self.palette_journal.close(self.collect_palette_data())
+        self.palette_journal = self.palette.journal = journal or PaletteJournal(file_path)
+        if self.palette_journal.pending:
+            self.palette_journal.compact(self.collect_palette_data())
+        index = self.palettes.index(self.palette)
+        self.palette_tabs.setTabText(index, self.palette.title)
+        self.palette_tabs.setTabToolTip(index, self.palette.file_path)
+        self._remember_open_palettes()
+
+    def restore_last_session(self):
+        lang = self.translations[self.current_lang]
+        file_paths, current = [], 0
+        try:
+            with open(OPEN_PALETTES_PATH, 'r') as f:
+                stored = json.load(f)
+            file_paths, current = stored["paths"], stored["current"]
+        except (OSError, ValueError, KeyError, TypeError):
+            try:
+                with open(LAST_PALETTE_PATH, 'r') as f:
+                    file_paths = [f.read().strip()]
+            except OSError:
+                pass
+
+        for file_path in [path for path in file_paths if path] or [SESSION_PALETTE_PATH]:
+            journal = PaletteJournal(file_path)
+            try:
+                palette_data = journal.load()
+            except (OSError, ValueError) as e:
+                print(f"{lang['message_load_error']}: {e}")
+                continue
+            self.open_palette_tab(journal, palette_data)
+            if palette_data:
+                print(f"{lang['message_session_restored']}: {file_path}")
+        if not self.palettes:
+            self.open_palette_tab(PaletteJournal(SESSION_PALETTE_PATH), {})
+        self.switch_palette(min(max(current, 0), len(self.palettes) - 1))
+
+    def journal_button(self, *buttons, palette=None):
+        """Butonların kayıtlarını paletin (verilmezse geçerli paletin) günlüğüne yaz"""
+        palette = palette or self.palette
+        records = []
+        for button in buttons:
+            state = palette.states[button]
+            entry = self._palette_entry(state) if state["file_path"] else None
+            records.append((self.button_positions[button], entry))
+        try:
+            palette.journal.record_many(records)
+        except OSError as e:
+            print(f"{palette.journal.journal_path}: {e}")
+            return
+        if palette.journal.pending >= self.settings["journal_compact_entries"]:
+            self.compact_journal()
+
+    def compact_journal(self):
+        for palette in self.palettes:
+            if palette.journal.pending:
+                try:
+                    palette.journal.compact(self.collect_palette_data(palette.states))
+                except OSError as e:
+                    print(f"{palette.journal.journal_path}: {e}")
+    # --- Otomatik Kayıt Sonu ---
+
+    def _palette_entry(self, state):
+        return format_palette_entry(state)
+
+    def _apply_palette_entry(self, state, entry):
+        state.update(parse_palette_entry(entry))
+        state["clip"] = None
+        state["problem"] = None
+        state["meta"] = None
+
+    def _on_clip_ready(self, file_path, meta):
+        # Aynı içerik bütün açık paletlerde tek bir bellek eşlemesiyle paylaşılır
+        clip = self.clip_cache.get(meta)
+        size, digest = self.import_pipeline.known_source(file_path)
+        identified = {}
+        for palette, button, state in self._states_for(file_path):
+            state["clip"] = clip
+            # Başlığı sağlam ama sonu kesik dosyalar ancak çözülünce anlaşılır
+            state["problem"] = check_decoded_clip(clip, state["meta"])
+            if digest is not None and (state["size"], state["digest"]) != (size, digest):
+                # Yeniden bağlama için palet kaydına yazılır
+                state["size"], state["digest"] = size, digest
+                identified.setdefault(palette, []).append(button)
+            if palette is self.palette:
+                self.refresh_button_label(button)
+            if state is self._pending_cue:
+                self._start_prelisten(button, state)
+        for palette, buttons in identified.items():
+            self.journal_button(*buttons, palette=palette)
+
+    def _on_clip_failed(self, file_path, error):
+        lang = self.translations[self.current_lang]
+        print(f"{lang['message_import_error']}: {file_path}: {error}")
+        self._set_file_problem(file_path, error)
+
+    # --- Palet sağlık denetimi ---
+    def _set_file_problem(self, file_path, problem):
+        for palette, button, state in self._states_for(file_path):
+            if state["problem"] != problem:
+                state["problem"] = problem
+                if palette is self.palette:
+                    self.refresh_button_label(button)
+
+    def _on_file_checked(self, file_path, problem):
+        # Çözme hatası içe aktarmadan gelir; burada yalnızca dosya düzeyindeki sorunlar güncellenir
+        if problem is not None:
+            self._set_file_problem(file_path, problem)
+
+    def _on_health_checked(self, broken):
+        lang = self.translations[self.current_lang]
+        offer, self._offer_relink = self._offer_relink, False
+        if not broken:
+            return
+        print(f"{lang['message_broken_files']}: {len(broken)}")
+        if offer and QMessageBox.question(self, lang['menu_relink'],
+                                          lang['message_relink_question']) == QMessageBox.Yes:
+            self.relink_missing_files()
+
+    def relink_missing_files(self):
+        missing = {state["file_path"]: ((state["size"], state["digest"]) if state["digest"]
+                                        else self.import_pipeline.known_source(state["file_path"]))
+                   for state in self.button_states.values()
+                   if state["file_path"] and state["problem"] is not None}
+        if missing:
+            # Arama sürerken sekme değişebilir; sonuç istendiği palete uygulanır
+            self.relinker.relink(missing, self.settings["search_roots"],
+                                 self.settings["relink_index_max_age"], self.palette)
+
+    def _on_relinked(self, found, palette):
+        lang = self.translations[self.current_lang]
+        if palette not in self.palettes:
+            # Palet bu arada kapatıldı
+            return
+        targets = {path: target for path, (target, verified) in found.items() if verified}
+        guessed = {path: target for path, (target, verified) in found.items() if not verified}
+        if guessed:
+            # Yalnızca adı tutan eşleşmeler operatör onaylarsa uygulanır
+            listing = "\n".join(f"{os.path.basename(path)} \u2192 {target}"
+                                for path, target in sorted(guessed.items())[:RELINK_CONFIRM_LIST])
+            if len(guessed) > RELINK_CONFIRM_LIST:
+                listing += f"\n\u2026 (+{len(guessed) - RELINK_CONFIRM_LIST})"
+            if QMessageBox.question(self, lang['menu_relink'],
+                                    f"{lang['message_relink_confirm']}\n\n{listing}") == QMessageBox.Yes:
+                targets.update(guessed)
+        relinked = []
+        for button, state in palette.states.items():
+            new_path = targets.get(state["file_path"])
+            if new_path:
+                state["file_path"] = new_path
+                state["clip"] = None
+                state["problem"] = None
+                if palette is self.palette:
+                    self.refresh_button_label(button)
+                relinked.append(button)
+                self.import_pipeline.submit(new_path)
+        if relinked:
+            self.journal_button(*relinked, palette=palette)
+        self._watch_palette_files()
+        print(f"{lang['message_relinked']}: {len(relinked)}")
+    # --- Palet Sağlık Denetimi Sonu ---
+
+    # --- Dosya izleme ---
+    def _watch_palette_files(self):
+        self.file_watcher.set_files(state["file_path"] for palette in self.palettes
+                                    for state in palette.states.values() if state["file_path"])
+
+    def _on_watched_file_changed(self, file_path):
+        # Çalan ses eski klibi tutar; yeni analiz hazır olunca sonraki tetiklemeler onu çalar
+        lang = self.translations[self.current_lang]
+        print(f"{lang['message_file_changed']}: {file_path}")
+        self.import_pipeline.invalidate(file_path)
+
+    def _on_watched_file_removed(self, file_path):
+        lang = self.translations[self.current_lang]
+        print(f"{lang['message_file_removed']}: {file_path}")
+        self._set_file_problem(file_path, "missing")
+    # --- Dosya İzleme Sonu ---
+
+    # --- Gösteri kontrolü ---
+    def load_cue_list(self):
+        lang = self.translations[self.current_lang]
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            lang['dialog_load_cues'],
+            "",
+            "JSON Dosyaları (*.json);;Tüm Dosyalar (*)"
+        )
+        if file_path:
+            try:
+                self.cue_list = load_cue_list(file_path)
+                print(f"{lang['message_cues_loaded']}: {file_path} ({len(self.cue_list)})")
+            except Exception as e:
+                print(f"{lang['message_invalid_data']}: {e}")
+
+    def start_show(self):
+        lang = self.translations[self.current_lang]
+        if not self.cue_list:
+            print(lang['message_no_cues'])
+            return
+        self.stop_show()
+
+        rate = self.engine.sample_rate
+        cues = []
+        for cue in self.cue_list:
+            row, col = map(int, cue["button"].split(','))
+            button = self.button_map.get((row, col))
+            state = self.button_states.get(button)
+            if state is None or state["clip"] is None:
+                print(f"{lang['message_cue_skipped']}: {cue['button']}")
+                continue
+            # Döngülü buton, uzunluk verilmemişse durdurulana kadar döner
+            start, end, loop_start = entry_loop_range(state["clip"], state)
+            frames = int(cue["length"] * rate) if cue["length"] is not None else None
+            cues.append(dict(cue, clip=state["clip"], tag=button, start=start, end=end,
+                             loop_start=loop_start, frames=frames,
+                             gain=cue_gain(cue, state),
+                             pan=state["pan"], bus=state["bus"],
+                             fade_in=int(cue["fade_in"] * rate),
+                             fade_out=int(cue["fade_out"] * rate)))
+
+        self.show_clock = create_show_clock(self.settings)
+        self.show_clock.start()
+        self.cue_scheduler.start(cues, self.show_clock)
+        print(lang['message_show_started'])
+
+    def stop_show(self):
+        self.cue_scheduler.stop()
+        if self.show_clock is not None:
+            self.show_clock.stop()
+            self.show_clock = None
+
+    def _on_cue_fired(self, cue, jitter_ms):
+        lang = self.translations[self.current_lang]
+        self.active_button = cue["tag"]
+        self.active_palette = self.palette
+        self._asrun_start(cue["tag"], "show")
+        print(f"{lang['message_cue_fired']}: {cue['button']} @ {cue['at']:.3f} s, "
+              f"{lang['message_jitter']} {jitter_ms:+.3f} ms")
+
+    def _on_cue_missed(self, cue):
+        lang = self.translations[self.current_lang]
+        print(f"{lang['message_cue_missed']}: {cue['button']} @ {cue['at']:.3f} s")
+
+    def _on_show_finished(self, report):
+        lang = self.translations[self.current_lang]
+        if report["count"]:
+            print(f"{lang['message_show_finished']}: {report['count']}, {lang['message_jitter']} "
+                  f"{report['mean_ms']:.3f} / {report['max_ms']:.3f} ms")
+        else:
+            print(lang['message_show_finished'])
+    # --- Gösteri Kontrolü Sonu ---
+
+    # --- Yayın kaydı ---
+    def set_aircheck(self, enabled):
+        lang = self.translations[self.current_lang]
+        if enabled:
+            try:
+                self.aircheck.start()
+            except OSError as e:
+                print(f"{lang['message_aircheck_failed']}: {e}")
+                self.aircheck_action.setChecked(False)
+                return
+            print(f"{lang['message_aircheck_started']}: {self.aircheck.directory}")
+        else:
+            dropped = self.aircheck.dropped_frames
+            self.aircheck.stop()
+            if dropped:
+                print(f"{lang['message_aircheck_dropped']}: {dropped / self.engine.sample_rate:.1f} s")
+            print(lang['message_aircheck_stopped'])
+        self.settings["aircheck"] = enabled
+        try:
+            save_setting("aircheck", enabled)
+        except OSError as e:
+            print(f"{SETTINGS_PATH}: {e}")
+
+    def _on_aircheck_file(self, path):
+        lang = self.translations[self.current_lang]
+        print(f"{lang['message_aircheck_file']}: {path}")
+
+    def _on_aircheck_failed(self, error):
+        lang = self.translations[self.current_lang]
+        print(f"{lang['message_aircheck_failed']}: {error}")
+        # Ayar açık kalır; uygulama yeniden başlayınca kayıt tekrar denenir
+        self.aircheck.stop()
+        self.aircheck_action.blockSignals(True)
+        self.aircheck_action.setChecked(False)
+        self.aircheck_action.blockSignals(False)
+    # --- Yayın Kaydı Sonu ---
+
+    # --- Ön dinleme ---
+    def open_cue_output(self):
+        """Ön dinleme akışını ayardaki aygıta (yeniden) aç; program biçiminde çalışır"""
+        lang = self.translations[self.current_lang]
+        if self.cue_output is not None:
+            self.cue_engine.stop()
+            self.cue_output.close()
+        name = self.settings["cue_device"]
+        fmt = self.audio_output.format
+        if name and name.startswith(CUE_FILE_PREFIX):
+            path = os.path.expanduser(name[len(CUE_FILE_PREFIX):])
+            self.cue_output = PacedOutput(self.cue_engine, fmt, path)
+            description = path
+        else:
+            device = cue_output_device(name, self.audio_output.device_info, fmt)
+            if device is None:
+                self.cue_output = PacedOutput(self.cue_engine, fmt)
+                description = lang['cue_null_output']
+            else:
+                self.cue_output = AudioOutput(self.cue_engine, device, fmt)
+                description = device.deviceName()
+        self.cue_output.voicesFinished.connect(self._on_cue_finished)
+        self.cue_output.start()
+        print(f"{lang['message_cue_output']}: {description}")
+
+    def _populate_cue_output_menu(self):
+        lang = self.translations[self.current_lang]
+        self.cue_output_menu.clear()
+        names = [device.deviceName() for device in QAudioDeviceInfo.availableDevices(QAudio.AudioOutput)]
+        for name in dict.fromkeys(names + [CUE_NULL_DEVICE]):
+            action = self.cue_output_menu.addAction(lang['cue_null_output'] if name == CUE_NULL_DEVICE else name)
+            action.setCheckable(True)
+            action.setChecked(name == self.settings["cue_device"])
+            action.triggered.connect(lambda checked, name=name: self.set_cue_device(name))
+
+    def save_buses(self):
+        """Bus seviyelerini ayarlara yazar; salt okunur yapılandırma çökertmez."""
+        try:
+            save_setting("buses", self.settings["buses"])
+        except OSError as e:
+            print(f"{SETTINGS_PATH}: {e}")
+
+    def set_cue_device(self, name):
+        self.settings["cue_device"] = name
+        self.open_cue_output()
+        try:
+            save_setting("cue_device", name)
+        except OSError as e:
+            print(f"{SETTINGS_PATH}: {e}")
+
+    def prelisten(self, button):
+        """Butonu yayına dokunmadan ön dinleme çıkışında çal; çalarken tekrar seçilirse durdur"""
+        lang = self.translations[self.current_lang]
+        state = self.button_states[button]
+        if button is self.cued_button and (self.cue_engine.is_active() or self._pending_cue is state):
+            self.stop_prelisten()
+            return
+        self.cue_engine.stop()
+        self.cued_button = button
+        if state["clip"] is None:
+            # İçe aktarma bitince çalar; klip yayın için de aynı önbellekten hazırlanmış olur
+            self._pending_cue = state
+            print(f"{lang['message_not_ready']}: {state['file_path']}")
+            return
+        self._start_prelisten(button, state)
+
+    def _start_prelisten(self, button, state):
+        lang = self.translations[self.current_lang]
+        self._pending_cue = None
+        start, end = self._play_range(state)
+        # Yayınla aynı bellek eşlemi okunur; ön dinlenen kısım sayfa önbelleğine girer
+        self.cue_engine.play(state["clip"], DEFAULT_GAIN * 10.0 ** (state["gain_db"] / 20.0), tag=button,
+                             start=start, end=end, pan=state["pan"])
+        print(f"{lang['message_prelisten']}: {state['file_path']}")
+
+    def stop_prelisten(self):
+        lang = self.translations[self.current_lang]
+        self.cue_engine.stop()
+        self.cued_button = self._pending_cue = None
+        print(lang['message_prelisten_stopped'])
+
+    def _on_cue_finished(self, tags):
+        if self.cued_button in tags and not self.cue_engine.is_active():
+            self.cued_button = None
+    # --- Ön Dinleme Sonu ---
+
+    # --- Yayın akışı günlüğü ---
+    def _asrun_start(self, button, source):
+        file_path = self.button_states[button]["file_path"]
+        self._on_air.setdefault(button, []).append((time.time(), time.perf_counter(), file_path, source))
+
+    def _asrun_end(self, buttons, stopped_early, oldest_only=False):
+        for button in buttons:
+            entries = self._on_air.get(button)
+            if not entries:
+                continue
+            if not oldest_only:
+                ending = self._on_air.pop(button)
+            elif len(entries) > 1:
+                ending = [entries.pop(0)]
+            else:
+                # Son kayıt hâlâ çalan sese ait
+                continue
+            for started, perf_started, file_path, source in ending:
+                self.asrun_log.record(started, time.perf_counter() - perf_started, file_path,
+                                      self.button_positions[button], source, stopped_early)
+
+    def show_asrun_history(self):
+        self.asrun_window.show()
+        self.asrun_window.raise_()
+        self.asrun_window.refresh()
+
+    def _on_asrun_failed(self, error):
+        lang = self.translations[self.current_lang]
+        print(f"{lang['message_asrun_failed']}: {error}")
+    # --- Yayın Akışı Günlüğü Sonu ---
+
+    # --- Stres testi ---
+    def set_soak_test(self, enabled):
+        lang = self.translations[self.current_lang]
+        if enabled and not self.soak_test.is_running():
+            self.soak_test.start()
+            print(f"{lang['message_soak_started']}: {self.soak_test.rate}, {self.soak_test.duration / 3600.0}")
+        elif not enabled:
+            self.soak_test.stop()
+
+    def _soak_trigger(self):
+        ready = [button for button, state in self.button_states.items() if state["clip"] is not None]
+        if ready:
+            # Gerçek basışla aynı yol: clicked -> play_sound
+            random.choice(ready).click()
+
+    def _on_soak_sampled(self, row):
+        lang = self.translations[self.current_lang]
+        print(f"{lang['message_soak_sample']}: {row['elapsed_h'] * 60:.1f} min, {row['triggers']}, "
+              f"RSS {row['rss_mb'] or 0:.1f} MB, fds {row['fds']}, QObjects {row['qobjects']}, "
+              f"{row['latency_median_ms'] or 0:.2f} ms, underruns {row['underruns']}")
+
+    def _on_soak_finished(self, report):
+        lang = self.translations[self.current_lang]
+        self.soak_action.blockSignals(True)
+        self.soak_action.setChecked(False)
+        self.soak_action.blockSignals(False)
+        print(f"{lang['message_soak_finished']}: {report['triggers']}, {report['csv']}")
+        for problem in report["problems"]:
+            print(f"{lang['message_soak_problem']}: {problem}")
+    # --- Stres Testi Sonu ---
+
+    def closeEvent(self, event):
+        self.health_checker.shutdown()
+        self.metadata_prober.shutdown()
+        self.relinker.shutdown()
+        self.file_watcher.shutdown()
+        self.spectrum_window.close()
+        self.bus_fader_window.close()
+        if self.bus_save_timer.isActive():
+            self.bus_save_timer.stop()
+            self.save_buses()
+        self.stop_show()
+        self.autosave_timer.stop()
+        self.prefetch_timer.stop()
+        self.stall_watchdog.stop()
+        self.soak_test.stop()
+        self._remember_open_palettes()
+        for palette in self.palettes:
+            palette.journal.close(self.collect_palette_data(palette.states))
+        self.import_pipeline.shutdown()
+        self.audio_output.close()
+        self.cue_output.close()
+        self.aircheck.stop()
+        self.asrun_window.close()
+        if self.waveform_editor is not None:
+            self.waveform_editor.close()
+        self._asrun_end(list(self._on_air), stopped_early=True)
+        self.asrun_log.close()
+        super().closeEvent(event)
+
     def show_about_dialog(self):
         lang = self.translations[self.current_lang]
         about_text = f"""
@@ -567,117 +5931,63 @@ Github: <a href="http://www.github.com/shampuan">www.github.com/shampuan</a><br>
     # --- VU Metre için ses verilerini işleme metodu (linamp.py'den alınmıştır) ---
     def _process_audio_buffer(self, buffer: QAudioBuffer):
         """VU metre için ses verilerini işle"""
-        if self.media_player.state() != QMediaPlayer.PlayingState:
-            self.left_vu_meter.set_level(0.0)
-            self.right_vu_meter.set_level(0.0)
-            return
-
         fmt = buffer.format()
-        
-        # Desteklenen formatları kontrol et
-        if fmt.sampleType() == QAudioFormat.Float:
-            data = buffer.constData().asarray(buffer.byteCount())
-            num_samples = len(data) // (fmt.sampleSize() // 8)
-            max_amplitude = 1.0
-            
-            try:
-                if fmt.sampleSize() == 32:
-                    samples = struct.unpack(f'<{num_samples}f', data)
-                else:  # 64-bit float
-                    samples = struct.unpack(f'<{num_samples}d', data)
-            except struct.error:
-                return
-            
-        elif fmt.sampleType() == QAudioFormat.SignedInt:
-            data = buffer.constData().asarray(buffer.byteCount())
-            bytes_per_sample = fmt.sampleSize() // 8
-            num_samples = len(data) // bytes_per_sample
-            
-            if fmt.sampleSize() == 8:
-                fmt_str = 'b'
-                max_amplitude = 127
-            elif fmt.sampleSize() == 16:
-                fmt_str = 'h'
-                max_amplitude = 32767
-            elif fmt.sampleSize() == 32:
-                fmt_str = 'i'
-                max_amplitude = 2147483647
-            else:
-                return
-            
-            try:
-                samples = struct.unpack(f'<{num_samples}{fmt_str}', data)
-            except struct.error:
-                return
-            
-        elif fmt.sampleType() == QAudioFormat.UnSignedInt:
-            data = buffer.constData().asarray(buffer.byteCount())
-            bytes_per_sample = fmt.sampleSize() // 8
-            num_samples = len(data) // bytes_per_sample
-            
-            if fmt.sampleSize() == 8:
-                fmt_str = 'B'
-                max_amplitude = 255
-            elif fmt.sampleSize() == 16:
-                fmt_str = 'H'
-                max_amplitude = 65535
-            elif fmt.sampleSize() == 32:
-                fmt_str = 'I'
-                max_amplitude = 4294967295
-            else:
-                return
-            
-            try:
-                samples = struct.unpack(f'<{num_samples}{fmt_str}', data)
-            except struct.error:
-                return
-        else:
+        if fmt.sampleType() not in (QAudioFormat.Float, QAudioFormat.SignedInt, QAudioFormat.UnSignedInt) \
+                or fmt.sampleSize() not in (8, 16, 32, 64) or fmt.channelCount() <= 0:
             return
 
-        # Kanal sayısına göre örnekleri işle
-        num_channels = fmt.channelCount()
-        
-        if num_channels >= 2:
-            left_peak = 0
-            right_peak = 0
-            for i in range(0, num_samples, num_channels):
-                # Sol kanal
-                left_sample = samples[i]
-                # Sağ kanal
-                right_sample = samples[i+1]
-                
-                if fmt.sampleType() == QAudioFormat.UnSignedInt:
-                    left_value = left_sample - (max_amplitude // 2)
-                    right_value = right_sample - (max_amplitude // 2)
-                    left_peak = max(left_peak, abs(left_value))
-                    right_peak = max(right_peak, abs(right_value))
-                else:
-                    left_peak = max(left_peak, abs(left_sample))
-                    right_peak = max(right_peak, abs(right_sample))
-            
-            norm_left_peak = left_peak / (max_amplitude if fmt.sampleType() != QAudioFormat.Float else 1.0)
-            norm_right_peak = right_peak / (max_amplitude if fmt.sampleType() != QAudioFormat.Float else 1.0)
-            
-            self.left_vu_meter.set_level(norm_left_peak)
-            self.right_vu_meter.set_level(norm_right_peak)
-
-        else: # Mono veya bilinmeyen kanal sayısı
-            peak = 0
-            for sample in samples:
-                if fmt.sampleType() == QAudioFormat.UnSignedInt:
-                    value = sample - (max_amplitude // 2)
-                    peak = max(peak, abs(value))
-                else:
-                    peak = max(peak, abs(sample))
+        # Serpiştirilmiş tamponu tek geçişte (kare, kanal) dizisine çevir
+        block = pcm_to_float(buffer.constData().asstring(buffer.byteCount()), audio_format_spec(fmt))
 
-            norm_peak = peak / (max_amplitude if fmt.sampleType() != QAudioFormat.Float else 1.0)
-            
-            self.left_vu_meter.set_level(norm_peak)
-            self.right_vu_meter.set_level(norm_peak)
+        if self.spectrum_window.isVisible():
+            self.spectrum_window.push(block.mean(axis=1))
+
+        if self.engine.is_active() and not self.progress_timer.isActive():
+            self.progress_timer.start()
+
+        if not self.engine.is_active() or not len(block):
+            self.vu_meter.reset(fmt.channelCount())
+            self.gain_reduction_meter.reset()
+            self.limiter.take_reduction()
+            return
+
+        # Her kanalın tepe seviyesi, kanal sayısıyla doğrusal maliyet
+        self.vu_meter.set_levels(np.abs(block).max(axis=0))
+        self.gain_reduction_meter.set_reduction(self.limiter.take_reduction())
     # --- Metot Sonu ---
 
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(prog="jinglebox")
+    parser.add_argument("--render", nargs=2, metavar=("PALETTE", "CUES"),
+                        help="render a palette and a timed cue list without the GUI")
+    parser.add_argument("-o", "--output", default="mixdown.wav", help="output .wav or .flac file")
+    parser.add_argument("--rate", type=int, default=48000)
+    parser.add_argument("--channels", type=int, default=2)
+    parser.add_argument("--bits", type=int, choices=(16, 24), default=16)
+    parser.add_argument("--benchmark-latency", metavar="FILE",
+                        help="measure trigger-to-output latency on the default device")
+    parser.add_argument("--triggers", type=int, default=20)
+    parser.add_argument("--soak", metavar="PALETTE",
+                        help="fire random buttons of a palette without the GUI and watch for leaks")
+    parser.add_argument("--soak-gui", action="store_true",
+                        help="start the GUI and stress-test the current palette")
+    parser.add_argument("--soak-rate", type=float, default=5.0, help="triggers per second")
+    parser.add_argument("--soak-hours", type=float, default=1.0)
+    args, qt_args = parser.parse_known_args()
+
+    if args.render:
+        sys.exit(render_mixdown(args.render[0], args.render[1], args.output,
+                                args.rate, args.channels, args.bits))
+    if args.benchmark_latency:
+        sys.exit(benchmark_trigger_latency(args.benchmark_latency, args.triggers))
+    if args.soak:
+        sys.exit(run_soak_headless(args.soak, args.soak_rate, args.soak_hours))
+
+    app = QApplication(sys.argv[:1] + qt_args)
     ex = JingleBox()
+    if args.soak_gui:
+        ex.soak_test.rate = args.soak_rate
+        ex.soak_test.duration = args.soak_hours * 3600.0
+        ex.soak_action.setChecked(True)
     sys.exit(app.exec_())
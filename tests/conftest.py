@@ -0,0 +1,71 @@
+"""Testler için ortak hazırlık: geçici XDG klasörleri ve yalnızca Qt'ye bağlı içe aktarmalar"""
+import os
+import sys
+import tempfile
+import types
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PyQt5.QtCore")
+
+# Önbellek, ayar ve veri klasörleri t.py yüklenirken belirlenir; kullanıcınınkilere dokunulmasın
+_HOME = tempfile.mkdtemp(prefix="jinglebox-test-")
+for _name in ("XDG_CACHE_HOME", "XDG_CONFIG_HOME", "XDG_DATA_HOME"):
+    os.environ[_name] = os.path.join(_HOME, _name.lower())
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import PyQt5.QtMultimedia  # noqa: F401
+except ImportError:
+    # Ses kitaplıkları (ör. libpulse) eksikse QtMultimedia yüklenemez. Testlerin
+    # kullandığı karıştırıcı, sınırlayıcı ve dönüştürücüler yalnızca numpy ile
+    # çalışır; adlar içe aktarılabilsin diye boş yer tutucular konur.
+    _stub = types.ModuleType("PyQt5.QtMultimedia")
+    for _name in ("QAudio", "QAudioBuffer", "QAudioFormat", "QAudioDecoder", "QAudioOutput",
+                  "QAudioDeviceInfo"):
+        setattr(_stub, _name, type(_name, (), {}))
+    sys.modules["PyQt5.QtMultimedia"] = _stub
+
+RATE = 48000
+
+
+@pytest.fixture
+def make_clip(tmp_path):
+    """Float örneklerden (kare ya da kare x kanal) float32 bir PCMClip oluşturan yardımcı"""
+    import t as jinglebox
+
+    def make(samples, name="clip"):
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim == 1:
+            samples = samples[:, None]
+        path = str(tmp_path / f"{name}.pcm")
+        samples.tofile(path)
+        return jinglebox.PCMClip({"spec": (RATE, samples.shape[1], 'f', 32), "pcm": path})
+    return make
+
+
+def write_wav(path, samples, rate=RATE):
+    """Tek kanallı 16 bit WAV yaz"""
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((np.asarray(samples) * 32767).astype('<i2').tobytes())
+
+
+@pytest.fixture
+def inline_transcode(monkeypatch):
+    """Mixdown dönüştürmesini işlem havuzu yerine bu süreçte yap.
+
+    Havuzun 'spawn' alt süreçleri t.py'yi baştan yükler ve buradaki yer
+    tutucuları görmez; dönüştürme kodu aynıdır.
+    """
+    import t as jinglebox
+
+    def load_clips(files, spec, threshold_db):
+        return {path: jinglebox.PCMClip(jinglebox.transcode_to_cache(path, jinglebox.PCM_CACHE_DIR,
+                                                                      spec, threshold_db))
+                for path in files}
+    monkeypatch.setattr(jinglebox, "load_clips", load_clips)
@@ -0,0 +1,88 @@
+"""Çalan butonlarda geçen/kalan süre göstergesi (user-050)"""
+import os
+
+import numpy as np
+import pytest
+
+import t as jinglebox
+from conftest import RATE
+
+
+def positions_at(engine, seconds_after_block):
+    """Son blok başından `seconds_after_block` sonra duyulan konumlar"""
+    block_time = engine._anchor[0]
+    return engine.playing_positions(block_time + seconds_after_block)
+
+
+def test_positions_subtract_output_latency(make_clip):
+    clip = make_clip(np.full(RATE, 0.1))
+    engine = jinglebox.MixEngine(RATE, 1)
+    engine.output_latency = 480
+    engine.play(clip, tag="cart")
+    engine.render(4800)
+    engine.render(4800)
+    # Blok 4800. karede başladı; 2400 kare sonra hoparlörden 4800 - 480 + 2400. kare çıkar
+    elapsed, remaining, total = positions_at(engine, 2400 / RATE)["cart"]
+    assert elapsed == pytest.approx(6720, abs=1)
+    assert remaining == pytest.approx(RATE - 6720, abs=1)
+    assert total == RATE
+
+
+def test_positions_before_first_sample_is_heard(make_clip):
+    clip = make_clip(np.full(RATE, 0.1))
+    engine = jinglebox.MixEngine(RATE, 1)
+    engine.output_latency = 4800
+    engine.play(clip, tag="cart")
+    engine.render(1024)
+    elapsed, remaining, total = positions_at(engine, 0.0)["cart"]
+    assert (elapsed, remaining, total) == (0, RATE, RATE)
+
+
+def test_positions_wrap_into_previous_loop_pass(make_clip):
+    clip = make_clip(np.full(1000, 0.1))
+    engine = jinglebox.MixEngine(RATE, 1)
+    engine.output_latency = 300
+    engine.play(clip, tag="bed", loop_start=0)
+    engine.render(1000)
+    engine.render(100)
+    # Karıştırıcı yeni turun 100. karesinde; blok başında duyulan ise 1000 - 300 = 700.
+    # kare, yani önceki turun 700. karesi
+    elapsed, remaining, total = positions_at(engine, 0.0)["bed"]
+    assert elapsed == pytest.approx(700, abs=1)
+    assert remaining is None
+    assert total == 1000
+
+
+def test_positions_count_down_cue_length_of_loop(make_clip):
+    clip = make_clip(np.full(1000, 0.1))
+    engine = jinglebox.MixEngine(RATE, 1)
+    engine.output_latency = 300
+    engine.play(clip, tag="bed", loop_start=0, length=2500)
+    engine.render(1000)
+    engine.render(100)
+    elapsed, remaining, total = positions_at(engine, 0.0)["bed"]
+    # 1100 kare karıştırıldı, 700'ü duyuldu
+    assert remaining == pytest.approx(2500 - 700, abs=1)
+
+
+@pytest.fixture
+def qapp():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def test_overlay_repaints_only_on_visible_change(qapp):
+    from PyQt5.QtWidgets import QPushButton
+    button = QPushButton()
+    button.resize(100, 40)
+    overlay = jinglebox.CartProgressOverlay(button)
+    overlay.set_progress(1.2, 8.8, 0.12, False)
+    state = overlay._state
+    assert state == (1, 9, 12, False)
+    overlay.set_progress(1.7, 8.3, 0.125, False)
+    assert overlay._state is state
+    overlay.set_progress(1.7, None, 0.13, True)
+    assert overlay._state == (1, None, 13, True)
+    overlay.clear()
+    assert overlay._state is None and overlay.isHidden()
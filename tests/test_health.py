@@ -0,0 +1,48 @@
+"""Palet sağlık denetimi: başlık yoklaması ve çözülen klip (user-035)"""
+import numpy as np
+
+import t as jinglebox
+from conftest import RATE, write_wav
+
+
+def test_check_accepts_complete_wav(tmp_path):
+    write_wav(tmp_path / "ok.wav", np.zeros(RATE // 10))
+    assert jinglebox.check_audio_file(str(tmp_path / "ok.wav")) is None
+
+
+def test_check_flags_truncated_wav(tmp_path):
+    path = tmp_path / "cut.wav"
+    write_wav(path, np.zeros(RATE // 10))
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) // 2])
+    assert jinglebox.check_audio_file(str(path)) == "truncated"
+
+
+def test_check_flags_empty_and_unknown_files(tmp_path):
+    write_wav(tmp_path / "silent.wav", np.zeros(0))
+    (tmp_path / "zero.wav").write_bytes(b"")
+    (tmp_path / "notes.wav").write_bytes(b"just some text")
+    assert jinglebox.check_audio_file(str(tmp_path / "silent.wav")) == "empty"
+    assert jinglebox.check_audio_file(str(tmp_path / "zero.wav")) == "empty"
+    assert jinglebox.check_audio_file(str(tmp_path / "notes.wav")) == "unknown format"
+    assert jinglebox.check_audio_file(str(tmp_path / "gone.wav")) == "missing"
+
+
+def test_check_flags_ogg_without_end_of_stream(tmp_path):
+    # Vorbis kimlik başlığı ve granül konumu taşıyan iki sayfa; ikincisinde akış sonu işareti
+    ident = b'\x01vorbis' + b'\x00' * 4 + b'\x01' + RATE.to_bytes(4, 'little') + b'\x00' * 16
+
+    def page(flags, granule, body):
+        return b'OggS\x00' + bytes([flags]) + granule.to_bytes(8, 'little') + b'\x00' * 12 + body
+
+    (tmp_path / "ok.ogg").write_bytes(page(0x02, 0, ident) + page(0x04, RATE, b'audio'))
+    (tmp_path / "cut.ogg").write_bytes(page(0x02, 0, ident) + page(0x00, RATE // 2, b'aud'))
+    assert jinglebox.check_audio_file(str(tmp_path / "ok.ogg")) is None
+    assert jinglebox.check_audio_file(str(tmp_path / "cut.ogg")) == "truncated"
+
+
+def test_decoded_clip_shorter_than_header_is_truncated(make_clip):
+    clip = make_clip(np.zeros(RATE))
+    assert jinglebox.check_decoded_clip(clip, {"duration": 1.0}) is None
+    assert jinglebox.check_decoded_clip(clip, {"duration": 2.0}) == "truncated"
+    assert jinglebox.check_decoded_clip(clip, None) is None
@@ -0,0 +1,30 @@
+"""Palet günlüğü ve çökme sonrası yeniden oynatma (user-028)"""
+import t as jinglebox
+
+
+def test_journal_replay_skips_torn_last_line(tmp_path):
+    palette_path = str(tmp_path / "palette.json")
+    journal = jinglebox.PaletteJournal(palette_path)
+    journal.record_many([("0,0", {"file_path": "/a.wav"}), ("0,1", {"file_path": "/b.wav"})])
+    journal.record("0,0", None)
+    journal._file.close()
+    with open(journal.journal_path, 'a') as f:
+        # Yazılırken çökülmüş son satır
+        f.write('{"pos": "0,2", "entry": {"file_pa')
+
+    replayed = jinglebox.PaletteJournal(palette_path)
+    assert replayed.load() == {"0,1": {"file_path": "/b.wav"}}
+    assert replayed.pending == 3
+
+
+def test_journal_compaction_keeps_state(tmp_path):
+    palette_path = str(tmp_path / "palette.json")
+    journal = jinglebox.PaletteJournal(palette_path)
+    journal.record("0,0", {"file_path": "/a.wav"})
+    journal.compact({"0,0": {"file_path": "/a.wav"}})
+    journal.record("0,1", {"file_path": "/b.wav"})
+    journal.close({"0,0": {"file_path": "/a.wav"}, "0,1": {"file_path": "/b.wav"}})
+
+    replayed = jinglebox.PaletteJournal(palette_path)
+    assert replayed.load() == {"0,0": {"file_path": "/a.wav"}, "0,1": {"file_path": "/b.wav"}}
+    assert replayed.pending == 0
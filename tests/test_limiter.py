@@ -0,0 +1,40 @@
+"""Ana bus gerçek tepe sınırlayıcısı (user-047)"""
+import numpy as np
+import pytest
+
+import t as jinglebox
+from conftest import RATE
+
+
+def test_limiter_holds_ceiling():
+    limiter = jinglebox.TruePeakLimiter(RATE, 2, ceiling_db=-1.0)
+    rng = np.random.default_rng(1)
+    ceiling = 10.0 ** (-1.0 / 20.0)
+    peak = 0.0
+    for _ in range(20):
+        block = (rng.standard_normal((512, 2)) * 0.8).astype(np.float32)
+        limiter.process(block)
+        peak = max(peak, float(np.abs(block).max()))
+    assert peak <= ceiling + 1e-4
+    assert limiter.take_reduction() > 0.0
+
+
+def test_limiter_bypass_only_delays():
+    limiter = jinglebox.TruePeakLimiter(RATE, 1, ceiling_db=-1.0, enabled=False)
+    block = np.zeros((512, 1), dtype=np.float32)
+    block[0] = 1.5
+    limiter.process(block)
+    assert np.flatnonzero(block[:, 0]).tolist() == [limiter.latency]
+    assert block[limiter.latency, 0] == pytest.approx(1.5)
+
+
+def test_engine_applies_master_chain_before_clipping(make_clip):
+    clip = make_clip(np.full(2000, 0.9))
+    engine = jinglebox.MixEngine(RATE, 1)
+    limiter = jinglebox.TruePeakLimiter(RATE, 1, ceiling_db=-6.0)
+    engine.master_chain = (limiter,)
+    assert engine.master_latency == limiter.latency
+    for _ in range(3):
+        engine.play(clip)
+    out = engine.render(2048)
+    assert np.abs(out).max() <= 10.0 ** (-6.0 / 20.0) + 1e-4
@@ -0,0 +1,74 @@
+"""Karıştırıcı: döngüler (user-037), ses sınırı ve durdurma (user-049)"""
+import numpy as np
+
+import t as jinglebox
+from conftest import RATE
+
+
+def test_engine_loop_runs_until_length(make_clip):
+    clip = make_clip(np.full(100, 0.5))
+    engine = jinglebox.MixEngine(RATE, 1)
+    engine.play(clip, tag="bed", loop_start=0, length=250)
+    out = engine.render(512).copy()
+    assert np.count_nonzero(out) == 250 and out[:250].all()
+    assert not engine.is_playing("bed")
+    assert engine.pop_finished() == ["bed"]
+
+
+def test_engine_loop_release_ends_at_pass(make_clip):
+    clip = make_clip(np.full(100, 0.5))
+    engine = jinglebox.MixEngine(RATE, 1)
+    engine.play(clip, tag="bed", loop_start=0)
+    assert engine.render(1000).all()
+    engine.release("bed")
+    out = engine.render(1000).copy()
+    # 1000. karede tur tam bittiği için bir sonraki turun tamamı çalar
+    assert np.count_nonzero(out) == 100
+    assert engine.pop_finished() == ["bed"]
+
+
+def test_engine_loop_length_fades_out(make_clip):
+    clip = make_clip(np.full(100, 0.5))
+    engine = jinglebox.MixEngine(RATE, 1)
+    engine.play(clip, tag="bed", loop_start=0, length=250, fade_out=50)
+    out = engine.render(512)[:, 0].copy()
+    # Uzunluk döngünün ortasında bitse de fade sonuna oturur
+    assert out[199] == 0.5 and 0.0 < out[220] < 0.5 and out[249] < out[220]
+    assert not out[250:].any()
+
+
+def test_engine_steals_oldest_voice(make_clip):
+    clip = make_clip(np.full(4800, 0.1))
+    engine = jinglebox.MixEngine(RATE, 1)
+    engine.max_voices = 2
+    engine.steal_policy = "oldest"
+    for tag in ("a", "b"):
+        engine.play(clip, tag=tag)
+        engine.render(64)
+    engine.play(clip, tag="c")
+    assert [engine.is_playing(tag) for tag in ("a", "b", "c")] == [False, True, True]
+    assert engine.voices_stolen == 1
+    engine.render(4800)
+    assert "a" in engine.pop_finished()
+
+
+def test_engine_stop_returns_stopped_tags(make_clip):
+    clip = make_clip(np.full(100, 0.5))
+    engine = jinglebox.MixEngine(RATE, 1)
+    for tag in ("a", "a", "b"):
+        engine.play(clip, tag=tag)
+    assert engine.stop(keep=("b",)) == ["a"]
+    assert engine.is_playing("b") and not engine.is_playing("a")
+
+
+def test_engine_steals_quietest_and_spares_beds(make_clip):
+    loud = make_clip(np.full(4800, 0.5), "loud")
+    quiet = make_clip(np.full(4800, 0.05), "quiet")
+    engine = jinglebox.MixEngine(RATE, 1)
+    engine.max_voices = 2
+    engine.steal_policy = "quietest"
+    engine.play(quiet, tag="bed", loop_start=0)
+    engine.play(quiet, tag="q")
+    engine.play(loud, tag="l")
+    # Döngüdeki yatak en sessiz olsa da, başka aday varken kesilmez
+    assert [engine.is_playing(tag) for tag in ("bed", "q", "l")] == [True, False, True]
@@ -0,0 +1,73 @@
+"""Çevrimdışı mixdown ve zamanlanmış sesler (user-029)"""
+import json
+import wave
+
+import numpy as np
+import pytest
+
+import t as jinglebox
+from conftest import RATE, write_wav
+
+
+def test_engine_delay_is_sample_exact(make_clip):
+    clip = make_clip(np.full(100, 0.5))
+    engine = jinglebox.MixEngine(RATE, 1)
+    engine.play(clip, tag="a", delay=10)
+    out = engine.render(128).copy()
+    assert not out[:10].any()
+    np.testing.assert_allclose(out[10:110, 0], 0.5)
+    assert not out[110:].any()
+    assert engine.pop_finished() == ["a"]
+
+
+def test_render_mixdown_places_cues_exactly(tmp_path, inline_transcode):
+    burst = np.zeros(RATE // 10)
+    burst[100:200] = 0.5
+    write_wav(tmp_path / "burst.wav", burst)
+    palette_path = tmp_path / "palette.json"
+    palette_path.write_text(json.dumps({"0,0": {"file_path": str(tmp_path / "burst.wav"),
+                                                "skip_silence": False}}))
+    cue_path = tmp_path / "cues.json"
+    cue_path.write_text(json.dumps([{"button": "0,0", "at": 0.25}, {"button": "0,0", "at": "0:00.5"}]))
+    output_path = tmp_path / "mix.wav"
+
+    assert jinglebox.render_mixdown(str(palette_path), str(cue_path), str(output_path)) == 0
+    with wave.open(str(output_path), 'rb') as wav:
+        assert (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) == (RATE, 2, 2)
+        frames = wav.getnframes()
+        data = np.frombuffer(wav.readframes(frames), '<i2').reshape(-1, 2)
+    assert frames == RATE // 2 + len(burst)
+    hits = np.flatnonzero(data[:, 0])
+    assert hits[0] == RATE // 4 + 100
+    assert hits[-1] == RATE // 2 + 199
+    assert len(hits) == 200
+
+
+def test_render_mixdown_matches_live_gain(tmp_path, inline_transcode):
+    write_wav(tmp_path / "tone.wav", np.full(RATE // 10, 0.5))
+    palette_path = tmp_path / "palette.json"
+    palette_path.write_text(json.dumps({"0,0": {"file_path": str(tmp_path / "tone.wav"),
+                                                "skip_silence": False, "gain_db": 1.0}}))
+    cue_path = tmp_path / "cues.json"
+    cue_path.write_text(json.dumps([{"button": "0,0", "at": 0.0, "gain_db": -3.0}]))
+    output_path = tmp_path / "mix.wav"
+
+    assert jinglebox.render_mixdown(str(palette_path), str(cue_path), str(output_path)) == 0
+    with wave.open(str(output_path), 'rb') as wav:
+        data = np.frombuffer(wav.readframes(wav.getnframes()), '<i2')
+    # Canlı gösterideki kazançla aynı: DEFAULT_GAIN, işaret ve buton seviyesi
+    live = 0.5 * jinglebox.DEFAULT_GAIN * 10.0 ** (-2.0 / 20.0)
+    assert np.abs(data).max() / 32767.0 == pytest.approx(live, abs=2.0 / 32767)
+
+
+def test_engine_matches_equal_string_tags(make_clip):
+    # Mixdown işaretleri butonu "satır,sütun" metniyle etiketler; eşit metinler aynı nesne olmayabilir
+    clip = make_clip(np.full(1000, 0.5))
+    engine = jinglebox.MixEngine(RATE, 1)
+    engine.play(clip, tag="".join(["0", ",", "1"]), loop_start=0)
+    engine.play(clip, tag="".join(["0", ",", "1"]))
+    assert engine.is_playing("0,1")
+    engine.release("0,1")
+    assert all(v.loop_start is None for v in engine._voices)
+    assert engine.stop("0,1") == ["0,1"]
+    assert not engine.is_active()
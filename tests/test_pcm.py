@@ -0,0 +1,64 @@
+"""PCM biçim dönüşümleri (user-026)"""
+import numpy as np
+import pytest
+
+import t as jinglebox
+
+RATE = 48000
+
+
+@pytest.mark.parametrize("kind, bits", [('s', 8), ('s', 16), ('s', 32), ('u', 8), ('u', 16), ('u', 32), ('f', 32)])
+def test_pcm_round_trip_full_scale(kind, bits):
+    spec = (RATE, 1, kind, bits)
+    samples = np.array([[-1.0], [-0.5], [0.0], [0.5], [1.0]], dtype=np.float32)
+    pcm = jinglebox.float_to_pcm(samples, spec)
+    assert pcm.dtype == jinglebox.spec_dtype(spec)
+    back = jinglebox.pcm_to_float(pcm.tobytes(), spec)
+    step = 0.0 if kind == 'f' else 1.0 / (1 << (bits - 1))
+    np.testing.assert_allclose(back, samples, atol=step)
+    # Tam ölçekli tepe taşıp ters işarete dönmemeli
+    assert back[-1, 0] > 0.99 and back[0, 0] == -1.0
+
+
+def test_pcm_clips_out_of_range():
+    spec = (RATE, 1, 's', 16)
+    pcm = jinglebox.float_to_pcm(np.array([[2.0], [-2.0]], dtype=np.float32), spec)
+    assert pcm.ravel().tolist() == [32767, -32768]
+
+
+def _tone_level_db(samples, rate, freq):
+    """Pencerelenmiş spektrumda freq'e en yakın kutunun tam ölçeğe göre seviyesi"""
+    x = samples[2000:-2000, 0].astype(np.float64)
+    window = np.hanning(len(x))
+    spectrum = np.abs(np.fft.rfft(x * window)) / (window.sum() / 2.0)
+    bin_ = int(round(freq * len(x) / float(rate)))
+    return 20.0 * np.log10(spectrum[bin_ - 2:bin_ + 3].max())
+
+
+def tone(freq, rate, seconds=1.0):
+    return np.sin(2 * np.pi * freq * np.arange(int(rate * seconds)) / rate).astype(np.float32)[:, None]
+
+
+def test_downsampling_does_not_alias():
+    # 23 kHz, 44.1 kHz'in Nyquist'inin üstünde; 21.1 kHz'e katlanmamalı
+    out = jinglebox.conform_audio(tone(23000, RATE), RATE, (44100, 1, 's', 16))
+    assert len(out) == 44100
+    assert _tone_level_db(out, 44100, 44100 - 23000) < -80.0
+
+
+@pytest.mark.parametrize("src, dst, freq", [(44100, RATE, 1000), (RATE, 44100, 1000), (44100, RATE, 18000)])
+def test_resampling_keeps_passband(src, dst, freq):
+    out = jinglebox.conform_audio(tone(freq, src), src, (dst, 1, 's', 16))
+    assert len(out) == dst
+    # Sinüsün RMS'i 1/sqrt(2); kenarlardaki süzgeç geçişi hariç
+    rms = np.sqrt(np.mean(out[2000:-2000, 0].astype(np.float64) ** 2))
+    assert abs(20.0 * np.log10(rms * np.sqrt(2.0))) < 0.2
+
+
+def test_resampling_keeps_dc_and_channels():
+    samples = np.full((4410, 2), 0.5, dtype=np.float32)
+    samples[:, 1] = -0.25
+    out = jinglebox.conform_audio(samples, 44100, (RATE, 2, 's', 16))
+    assert out.shape == (4800, 2) and out.dtype == np.float32
+    np.testing.assert_allclose(out[100:-100, 0], 0.5, atol=1e-5)
+    np.testing.assert_allclose(out[100:-100, 1], -0.25, atol=1e-5)
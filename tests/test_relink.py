@@ -0,0 +1,41 @@
+"""Kayıp palet dosyalarının yeniden bağlanması (user-035)"""
+import t as jinglebox
+
+
+def make_index(tmp_path, names):
+    root = tmp_path / "library"
+    for name, data in names.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    index = jinglebox.RelinkIndex([str(root)])
+    index.build()
+    return root, index
+
+
+def test_relink_by_digest_picks_matching_content(tmp_path):
+    root, index = make_index(tmp_path, {"a/jingle.wav": b"old take", "b/jingle.wav": b"new take"})
+    digest = jinglebox.hash_file(str(root / "b/jingle.wav"))
+    found = jinglebox.find_relink_target(index, "/gone/jingle.wav", 8, digest)
+    assert found == (str(root / "b/jingle.wav"), True)
+
+
+def test_relink_by_size_needs_single_candidate(tmp_path):
+    root, index = make_index(tmp_path, {"a/jingle.wav": b"12345", "b/jingle.wav": b"1234567"})
+    assert jinglebox.find_relink_target(index, "/gone/jingle.wav", 5) == (str(root / "a/jingle.wav"), True)
+    assert jinglebox.find_relink_target(index, "/gone/jingle.wav", 9) is None
+
+
+def test_relink_unknown_file_offers_unique_name_match(tmp_path):
+    # Başka makinede içe aktarılmış, bu makinenin hiç görmediği dosya
+    root, index = make_index(tmp_path, {"a/jingle.wav": b"x", "a/bed.wav": b"y", "b/bed.wav": b"z"})
+    assert jinglebox.find_relink_target(index, "/gone/jingle.wav") == (str(root / "a/jingle.wav"), False)
+    assert jinglebox.find_relink_target(index, "/gone/bed.wav") is None
+
+
+def test_palette_entry_keeps_file_identity():
+    options = jinglebox.parse_palette_entry({"file_path": "/a.wav", "size": 12, "digest": "ab"})
+    assert (options["size"], options["digest"]) == (12, "ab")
+    entry = jinglebox.format_palette_entry(options)
+    assert entry == {"file_path": "/a.wav", "size": 12, "digest": "ab"}
+    assert jinglebox.format_palette_entry(jinglebox.parse_palette_entry("/b.wav")) == "/b.wav"
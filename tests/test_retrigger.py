@@ -0,0 +1,60 @@
+"""Butona yeniden basma kipleri (user-049)"""
+import numpy as np
+
+import t as jinglebox
+from conftest import RATE
+
+
+def options(**changed):
+    return dict(jinglebox.parse_palette_entry({"file_path": "/x.wav", "skip_silence": False}), **changed)
+
+
+def press(engine, tag, clip, entry, layered):
+    return jinglebox.trigger_entry(engine, tag, clip, entry, layered)
+
+
+def test_jingle_press_keeps_bed_playing(make_clip):
+    clip = make_clip(np.full(RATE, 0.1))
+    engine = jinglebox.MixEngine(RATE, 1)
+    layered = set()
+    press(engine, "bed", clip, options(loop="file"), layered)
+    assert press(engine, "jingle", clip, options(), layered) == ("started", [])
+    assert press(engine, "sting", clip, options(), layered) == ("started", ["jingle"])
+    assert engine.is_playing("bed") and engine.is_playing("sting")
+    assert not engine.is_playing("jingle")
+
+
+def test_restart_releases_own_loop_and_spares_it_from_other_presses(make_clip):
+    clip = make_clip(np.full(1000, 0.1))
+    engine = jinglebox.MixEngine(RATE, 1)
+    layered = set()
+    press(engine, "bed", clip, options(loop="file"), layered)
+    assert press(engine, "bed", clip, options(loop="file"), layered) == ("released", [])
+    # Son turunu çalan yatak da başka butonla kesilmez
+    press(engine, "jingle", clip, options(), layered)
+    assert engine.is_playing("bed")
+    engine.render(1000)
+    assert not engine.is_playing("bed")
+
+
+def test_toggle_and_ignore(make_clip):
+    clip = make_clip(np.full(RATE, 0.1))
+    engine = jinglebox.MixEngine(RATE, 1)
+    layered = set()
+    assert press(engine, "a", clip, options(retrigger="toggle"), layered)[0] == "started"
+    assert press(engine, "a", clip, options(retrigger="toggle"), layered) == ("stopped", ["a"])
+    press(engine, "b", clip, options(retrigger="ignore"), layered)
+    engine.render(100)
+    assert press(engine, "b", clip, options(retrigger="ignore"), layered) == ("ignored", [])
+    assert len(engine._voices) == 1 and engine._voices[0].pos == 100
+
+
+def test_overlap_layers_survive_other_presses(make_clip):
+    clip = make_clip(np.full(RATE, 0.1))
+    engine = jinglebox.MixEngine(RATE, 1)
+    layered = set()
+    press(engine, "a", clip, options(retrigger="overlap"), layered)
+    press(engine, "a", clip, options(retrigger="overlap"), layered)
+    press(engine, "b", clip, options(), layered)
+    assert [v.tag for v in engine._voices] == ["a", "a", "b"]
+    assert layered == {"a"}